@@ -2,23 +2,34 @@
 from flask import Flask
 from flask_cors import CORS
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from routes.internship_routes import internship_blueprint
 from routes.auth import auth_blueprint
 from routes.resumeRoute import main_blueprint
 from routes.linkedin_routes import linkedin_bp
 from routes.internshala_routes import internshala_bp
+from routes.listings_routes import listings_bp
+from routes.scrape_jobs_routes import scrape_jobs_bp
 from routes.dashboard_routes import dashboard_blueprint
 from routes.homepage_routes import homepage_blueprint
 from routes.admin_routes import admin_blueprint
 from routes.automation_routes import automation_blueprint
 from views.api import internship_blueprint as api_internship_blueprint
+from database.db_connection import init_database
+from database.backfill import reconcile_statistics_rollups
+from services.scrape_demand import flush_demand
+from services.scrape_scheduler import SCRAPE_SCHEDULER_ENABLED, start_scheduler
+from utils.serialization import FastJSONProvider
 
 # Load environment variables
 load_dotenv()
 
 def create_app():
     app = Flask(__name__)
+    # jsonify() encodes ObjectId/datetime/Decimal itself, with orjson when installed
+    app.json = FastJSONProvider(app)
     app.config['UPLOAD_FOLDER'] = 'uploads/'
     app.config['ALLOWED_EXTENSIONS'] = {'pdf'}
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -30,7 +41,8 @@ def create_app():
          resources={r"/*": {
              "origins": allowed_origins,
              "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"],
-             "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"]
+             "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "If-None-Match"],
+             "expose_headers": ["ETag", "X-Cache"]
          }}, 
          supports_credentials=True)
 
@@ -43,11 +55,52 @@ def create_app():
     app.register_blueprint(admin_blueprint, url_prefix='/admin')
     app.register_blueprint(linkedin_bp)
     app.register_blueprint(internshala_bp)
+    app.register_blueprint(listings_bp)
+    app.register_blueprint(scrape_jobs_bp)
     app.register_blueprint(automation_blueprint, url_prefix='/api/v1/internships')
     app.register_blueprint(api_internship_blueprint, url_prefix='/api/v1/internships')
 
+    # Build missing indexes in the background so startup never waits on MongoDB
+    if os.environ.get('MONGO_ENSURE_INDEXES', 'true').lower() == 'true':
+        threading.Thread(target=_init_database_in_background, daemon=True).start()
+
+    # Periodically correct any drift in the statistics rollups
+    reconcile_interval = float(os.environ.get('STATS_RECONCILE_INTERVAL_SECONDS', '3600'))
+    if reconcile_interval > 0:
+        threading.Thread(target=_reconcile_rollups_periodically, args=(reconcile_interval,), daemon=True).start()
+
+    # Hand list-query counts to the scrape scheduler, here or in its own process
+    demand_interval = float(os.environ.get('SCRAPE_DEMAND_FLUSH_SECONDS', '30'))
+    if demand_interval > 0:
+        threading.Thread(target=_flush_demand_periodically, args=(demand_interval,), daemon=True).start()
+    if SCRAPE_SCHEDULER_ENABLED:
+        start_scheduler()
+
     return app
 
+def _init_database_in_background():
+    try:
+        init_database()
+    except Exception as e:
+        print(f"[WARNING] {str(e)}")
+
+def _reconcile_rollups_periodically(interval):
+    while True:
+        try:
+            report = reconcile_statistics_rollups()
+            print(f"[SUCCESS] Statistics rollups reconciled ({report})")
+        except Exception as e:
+            print(f"[WARNING] Statistics rollup reconciliation failed: {str(e)}")
+        time.sleep(interval)
+
+def _flush_demand_periodically(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush_demand()
+        except Exception as e:
+            print(f"[WARNING] Scrape demand flush failed: {str(e)}")
+
 if __name__ == '__main__':
     app = create_app()
     # Development settings for college project
@@ -0,0 +1,97 @@
+# benchmarks/bench_scrape_engines.py
+"""
+Pages per second for the Internshala HTTP engine versus the browser path,
+over the saved listing pages in benchmarks/fixtures.
+
+    python -m benchmarks.bench_scrape_engines [--pages 60] [--browser-pages 3]
+
+The fixtures are served from a local HTTP server, so the HTTP numbers
+include a real keep-alive GET plus the BeautifulSoup parse; 'parse only' is
+the parse alone. The browser path loads the same URLs through the pooled
+Chrome session and InternshalaScraper._browser_cards, and is skipped when
+Chrome can't be started here.
+"""
+import argparse
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from services.internshala_parser import HTML_PARSER, parse_internship_cards
+from services.scrape_engine import HttpEngine, HttpPageFetcher
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTING_PAGES = ['internshala_web-development.html', 'internshala_data-science.html', 'internshala_marketing.html']
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures():
+    """Start a local server for the fixtures; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=FIXTURES))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def report(name, pages, cards, elapsed):
+    print(f"{name:<22} {pages:5d} pages {cards:6d} cards {elapsed:8.2f} s {pages / elapsed:10.1f} pages/s")
+    return pages / elapsed
+
+
+def bench_parse(pages):
+    html = [open(os.path.join(FIXTURES, name), encoding='utf-8').read() for name in LISTING_PAGES]
+    cards, started = 0, time.perf_counter()
+    for i in range(pages):
+        cards += len(parse_internship_cards(html[i % len(html)], 'bench'))
+    return report('parse only', pages, cards, time.perf_counter() - started)
+
+
+def bench_http(base_url, pages):
+    engine = HttpEngine(parse_internship_cards, HttpPageFetcher())
+    cards, started = 0, time.perf_counter()
+    for i in range(pages):
+        cards += len(engine.fetch_cards(f"{base_url}/{LISTING_PAGES[i % len(LISTING_PAGES)]}", 'bench'))
+    return report('http engine', pages, cards, time.perf_counter() - started)
+
+
+def bench_browser(base_url, pages):
+    from services.internshala_scraper import InternshalaScraper
+    scraper = InternshalaScraper()
+    try:
+        # Start the session outside the timing, as a warm pool would have it
+        with scraper.pool.session():
+            pass
+    except Exception as e:
+        print(f"{'browser path':<22} skipped: could not start Chrome ({str(e).splitlines()[0]})")
+        return None
+    cards, started = 0, time.perf_counter()
+    for i in range(pages):
+        url = f"{base_url}/{LISTING_PAGES[i % len(LISTING_PAGES)]}"
+        with scraper.pool.session() as driver:
+            cards += len(scraper._browser_cards(driver, url, 'bench'))
+    return report('browser path', pages, cards, time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', type=int, default=60, help='pages for the parse and HTTP runs')
+    parser.add_argument('--browser-pages', type=int, default=3, help='pages for the browser run (0 skips it)')
+    args = parser.parse_args(argv)
+
+    server, base_url = serve_fixtures()
+    print(f"Fixtures from {FIXTURES} (parser: {HTML_PARSER})")
+    try:
+        bench_parse(args.pages)
+        http_rate = bench_http(base_url, args.pages)
+        browser_rate = bench_browser(base_url, args.browser_pages) if args.browser_pages else None
+        if browser_rate:
+            print(f"http engine is {http_rate / browser_rate:.0f}x the browser path")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
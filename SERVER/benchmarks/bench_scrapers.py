@@ -0,0 +1,180 @@
+# benchmarks/bench_scrapers.py
+"""
+End-to-end scraper throughput over replayed listing pages.
+
+    python -m benchmarks.bench_scrapers [--latency-ms 100] [--rounds 3] [--browser]
+
+InternshalaScraper and LinkedInScraper run against a ReplayServer
+(benchmarks/scrape_replay.py) serving benchmarks/fixtures, or --dir for a
+recording, with every response delayed by --latency-ms. Each round starts
+from empty collections in the in-memory engine (MONGO_URI=memory://, so a
+real database is never touched unless --mongo-uri says so), so every card
+goes through the full save path. Reported per engine:
+
+    cards/s       cards extracted per second of scrape wall time
+    launch        borrowing a browser session (starting Chrome when none is warm)
+    navigate      loading the page: the HTTP GET, or driver.get plus the waits
+    extract       parsing or the extraction script
+    persist       existence checks, inserts/upserts and scrape_state updates
+    writes/card   database write calls per card (docs/card: documents written)
+
+The browser runs need Chrome and are skipped when it can't start here.
+LinkedIn is browser-only.
+"""
+import argparse
+import os
+import threading
+import time
+from contextlib import contextmanager
+from benchmarks.scrape_replay import FIXTURES, ReplayServer
+from utils.stage_timer import StageTimer
+
+STAGES = ('launch', 'navigate', 'extract', 'persist')
+WRITE_METHODS = ('insert_one', 'insert_many', 'update_one', 'update_many', 'replace_one',
+                 'delete_one', 'delete_many', 'find_one_and_update', 'find_one_and_replace', 'bulk_write')
+
+
+class WriteCounter:
+    """Write calls and documents written through the patched collection classes"""
+
+    def __init__(self):
+        self.calls = 0
+        self.documents = 0
+        self._lock = threading.Lock()
+
+    def add(self, method, args):
+        documents = len(args[0]) if method in ('insert_many', 'bulk_write') and args else 1
+        with self._lock:
+            self.calls += 1
+            self.documents += documents
+
+
+@contextmanager
+def count_db_writes(counter):
+    """Count every write made through pymongo's or the in-memory engine's collections"""
+    from pymongo.collection import Collection
+    from database.memory_engine import MemoryCollection
+
+    originals = []
+    for cls in (Collection, MemoryCollection):
+        for method in WRITE_METHODS:
+            original = cls.__dict__.get(method)
+            if original is None:
+                continue
+
+            def counted(self, *args, _original=original, _method=method, **kwargs):
+                counter.add(_method, args)
+                return _original(self, *args, **kwargs)
+            originals.append((cls, method, original))
+            setattr(cls, method, counted)
+    try:
+        yield counter
+    finally:
+        for cls, method, original in originals:
+            setattr(cls, method, original)
+
+
+def report(name, cards, elapsed, timer, writes):
+    if not cards:
+        print(f"{name:<22} no cards extracted ({elapsed:.2f} s)")
+        return None
+    stages = ' '.join(f"{timer.seconds.get(stage, 0.0):8.3f}" for stage in STAGES)
+    print(f"{name:<22} {cards:6d} {elapsed:8.2f} {cards / elapsed:9.1f} {stages} "
+          f"{writes.calls / cards:11.3f} {writes.documents / cards:9.3f}")
+    return cards / elapsed
+
+
+def _reset(*models):
+    for model in models:
+        model.collection.delete_many({})
+
+
+def bench_internshala(base_url, mode, categories, rounds, max_pages):
+    from services.internshala_parser import parse_internship_cards
+    from services.internshala_scraper import InternshalaScraper
+    from services.scrape_engine import BrowserEngine, FallbackEngine, HttpEngine
+
+    scraper = InternshalaScraper(base_url=base_url)
+    scraper.max_pages = max_pages
+    if mode == 'http':
+        scraper.engine = FallbackEngine(HttpEngine(parse_internship_cards))
+    else:
+        scraper.engine = FallbackEngine(BrowserEngine(scraper.pool, scraper._browser_cards))
+
+    timer, writes, cards, elapsed = StageTimer(), WriteCounter(), 0, 0.0
+    for _ in range(rounds):
+        _reset(scraper.model, scraper.state)
+        for category in categories:
+            with StageTimer() as run, count_db_writes(writes):
+                started = time.perf_counter()
+                result = scraper.scrape_internships({'category': category})
+                elapsed += time.perf_counter() - started
+            timer.merge(run)
+            cards += result['seen']
+    return report(f"internshala {mode}", cards, elapsed, timer, writes)
+
+
+def bench_linkedin(base_url, categories, rounds):
+    from services.linkedin_scraper import LinkedInScraper
+
+    scraper = LinkedInScraper(base_url=base_url)
+    timer, writes, cards, elapsed = StageTimer(), WriteCounter(), 0, 0.0
+    for _ in range(rounds):
+        _reset(scraper.model)
+        for category in categories:
+            with StageTimer() as run, count_db_writes(writes):
+                started = time.perf_counter()
+                result = scraper.scrape_internships({'category': category})
+                elapsed += time.perf_counter() - started
+            timer.merge(run)
+            if result.get('success') is False:
+                print(f"{'linkedin browser':<22} failed: {result['message']}")
+                return None
+            cards += result['count'] + result.get('updated', 0) + result.get('unchanged', 0)
+    return report('linkedin browser', cards, elapsed, timer, writes)
+
+
+def _browser_available():
+    from services.internshala_scraper import InternshalaScraper
+    try:
+        # Start the session outside the timing, as a warm pool would have it
+        with InternshalaScraper().pool.session():
+            pass
+        return True
+    except Exception as e:
+        print(f"{'browser runs':<22} skipped: could not start Chrome ({str(e).splitlines()[0]})")
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--dir', default=FIXTURES, help='recorded pages to replay')
+    parser.add_argument('--categories', default='web-development,data-science,marketing')
+    parser.add_argument('--latency-ms', type=float, default=100, help='delay before every response')
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--max-pages', type=int, default=1, help='Internshala result pages per category')
+    parser.add_argument('--browser', action='store_true', help='also run the Chrome paths')
+    parser.add_argument('--mongo-uri', default='memory://')
+    args = parser.parse_args(argv)
+
+    # Before any model connects; an empty Atlas URI keeps .env from picking it
+    os.environ['MONGO_URI'] = args.mongo_uri
+    os.environ['MONGO_URI_ATLAS'] = ''
+    categories = [c.strip() for c in args.categories.split(',') if c.strip()]
+
+    with ReplayServer(args.dir, args.latency_ms, args.jitter_ms) as server:
+        print(f"Replaying {args.dir} at {server.base_url}, {args.latency_ms:g} ms latency, "
+              f"{args.rounds} rounds of {len(categories)} categories")
+        print(f"{'engine':<22} {'cards':>6} {'seconds':>8} {'cards/s':>9} "
+              + ' '.join(f"{stage:>8}" for stage in STAGES) + f" {'writes/card':>11} {'docs/card':>9}")
+        bench_internshala(server.base_url, 'http', categories, args.rounds, args.max_pages)
+        if args.browser and _browser_available():
+            bench_internshala(server.base_url, 'browser', categories, args.rounds, args.max_pages)
+            bench_linkedin(server.base_url, categories, args.rounds)
+        if server.missed:
+            print(f"[WARNING] {server.missed} requests were for pages not in {args.dir}")
+
+
+if __name__ == '__main__':
+    main()
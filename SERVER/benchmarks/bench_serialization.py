@@ -0,0 +1,110 @@
+# benchmarks/bench_serialization.py
+"""
+Serialization throughput for a 10k-listing payload, before and after the
+shared encoder in utils/serialization.py.
+
+    python -m benchmarks.bench_serialization [--docs 10000] [--repeat 5]
+
+'before' is what the routes used to do: rewrite every _id to a string,
+then bson.json_util.dumps (internship routes) or Flask's default jsonify
+encoder (listing routes). 'after' is utils.serialization.dumps on the raw
+documents, with orjson when it is installed and the stdlib fallback.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId, json_util
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import utils.serialization as serialization
+
+
+def make_listings(count, seed=7):
+    """Listing documents shaped like the list endpoints' projection"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    companies = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries']
+    categories = ['web-development', 'data-science', 'marketing', 'design']
+    listings = []
+    for i in range(count):
+        low = rng.randrange(0, 30) * 1000
+        listings.append({
+            '_id': ObjectId(),
+            'title': f"{rng.choice(['Python', 'React', 'Data', 'Marketing'])} Intern {i}",
+            'company': rng.choice(companies),
+            'location': rng.choice(['Remote', 'Bangalore', 'Delhi', 'Mumbai']),
+            'applicants': f"{rng.randrange(0, 500)} applicants",
+            'days_left': f"{rng.randrange(0, 30)} days left",
+            'skills': rng.sample(['Python', 'SQL', 'React', 'Figma', 'Excel', 'Node.js'], 3),
+            'category': rng.choice(categories),
+            'apply_link': f"https://internshala.com/internship/detail/{i}",
+            'stipend': f"₹ {low:,} - {low + 5000:,} /month",
+            'scraped_at': time.time() - rng.random() * 86400,
+            'stipend_min': low,
+            'stipend_max': low + 5000,
+            'applicants_count': rng.randrange(0, 500),
+            'deadline': now + timedelta(days=rng.randrange(0, 30)),
+            'duration_weeks': rng.choice([4, 8, 13, 26]),
+        })
+    return listings
+
+
+def _copy(listings):
+    return [dict(doc) for doc in listings]
+
+
+def before_json_util(listings):
+    for doc in listings:
+        doc['_id'] = str(doc['_id'])
+    return json_util.dumps({'success': True, 'count': len(listings), 'data': listings}).encode('utf-8')
+
+
+def before_jsonify(listings, provider):
+    for doc in listings:
+        doc['_id'] = str(doc['_id'])
+    return provider.dumps({'success': True, 'count': len(listings), 'data': listings}).encode('utf-8')
+
+
+def after(listings):
+    return serialization.dumps({'success': True, 'count': len(listings), 'data': listings})
+
+
+def _stdlib_dumps(obj):
+    # The fallback path, timed even when orjson is installed
+    encoder = json.JSONEncoder(default=serialization.json_default, separators=(',', ':'), ensure_ascii=False)
+    return encoder.encode(obj).encode('utf-8')
+
+
+def run(name, encode, listings, repeat):
+    best, size = None, 0
+    for _ in range(repeat):
+        payload = _copy(listings)
+        started = time.perf_counter()
+        size = len(encode(payload))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<28} {best * 1000:9.1f} ms {len(listings) / best:12,.0f} docs/s {size / best / 1e6:9.1f} MB/s")
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--docs', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    listings = make_listings(args.docs)
+    provider = DefaultJSONProvider(Flask(__name__))
+    print(f"{args.docs} documents, best of {args.repeat} (fast backend: {serialization.JSON_BACKEND})")
+    baseline = run('before: json_util.dumps', before_json_util, listings, args.repeat)
+    run('before: Flask jsonify', lambda docs: before_jsonify(docs, provider), listings, args.repeat)
+    run('after: stdlib fallback', lambda docs: _stdlib_dumps({'success': True, 'count': len(docs), 'data': docs}),
+        listings, args.repeat)
+    best = run(f'after: {serialization.JSON_BACKEND}', after, listings, args.repeat)
+    print(f"speed-up over json_util: {baseline / best:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# benchmarks/scrape_replay.py
+"""
+Record listing pages to disk and replay them from a local HTTP server, so
+the scrapers can be measured and regression-tested without internshala.com
+or linkedin.com.
+
+    python -m benchmarks.scrape_replay record internshala web-development python --pages 2
+    python -m benchmarks.scrape_replay record linkedin internship
+    python -m benchmarks.scrape_replay serve [--dir DIR] [--latency-ms 150] [--jitter-ms 50]
+
+A directory of pages has a replay.json manifest mapping request paths (with
+the query string, or without it to match any query) to files. `record`
+fetches the pages the scrapers would load and adds them to the manifest;
+`serve` answers every request after the given latency and prints the
+INTERNSHALA_BASE_URL / LINKEDIN_BASE_URL to point the scrapers (or the app)
+at. benchmarks/fixtures holds a small replayable set; recordings go to
+benchmarks/recordings by default.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from services.scrape_engine import HttpPageFetcher
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(BENCHMARKS, 'fixtures')
+RECORDINGS = os.path.join(BENCHMARKS, 'recordings')
+MANIFEST = 'replay.json'
+
+
+def load_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['pages']
+
+
+def save_manifest(directory, pages):
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump({'pages': dict(sorted(pages.items()))}, f, indent=2)
+        f.write('\n')
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    # Keep-alive, as the sites themselves allow
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, replay, *args, **kwargs):
+        self.replay = replay
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        body, status = self.replay.page(self.path), 200
+        if body is None:
+            body, status = b'Not recorded', 404
+        self.replay.wait()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """Serves a recorded directory on 127.0.0.1, each response after latency ± jitter"""
+
+    def __init__(self, directory=FIXTURES, latency_ms=0, jitter_ms=0, port=0):
+        self.directory = directory
+        self.pages = load_manifest(directory)
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.port = port
+        self.served = 0
+        self.missed = 0
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def page(self, path):
+        """Body recorded for `path` (exact, then without the query string), or None"""
+        name = self.pages.get(path) or self.pages.get(urlsplit(path).path)
+        with self._lock:
+            if name is None:
+                self.missed += 1
+                return None
+            self.served += 1
+            if name not in self._bodies:
+                with open(os.path.join(self.directory, name), 'rb') as f:
+                    self._bodies[name] = f.read()
+            return self._bodies[name]
+
+    def wait(self):
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        """Start serving in the background; returns the base URL"""
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), partial(_ReplayHandler, self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def _file_name(platform, category, page):
+    slug = re.sub(r'[^a-z0-9-]+', '-', category.lower()).strip('-')
+    return f"{platform}_{slug}.html" if page == 1 else f"{platform}_{slug}_page-{page}.html"
+
+
+def record(platform, categories, pages=1, directory=RECORDINGS, fetcher=None):
+    """Fetch the pages the scrapers would load and add them to the directory's manifest"""
+    from services.internshala_scraper import InternshalaScraper
+    from services.linkedin_scraper import LinkedInScraper
+
+    fetcher = fetcher or HttpPageFetcher()
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    if platform == 'internshala':
+        scraper = InternshalaScraper()
+        urls = [(category, page, scraper.page_url(category, page))
+                for category in categories for page in range(1, pages + 1)]
+    else:
+        # One search page per category; the scraper scrolls rather than pages
+        scraper = LinkedInScraper()
+        urls = [(category, 1, scraper.search_url({'category': category})) for category in categories]
+
+    recorded = 0
+    for category, page, url in urls:
+        try:
+            html = fetcher.get(url)
+        except Exception as e:
+            print(f"[WARNING] Could not record {url}: {str(e)}")
+            continue
+        name = _file_name(platform, category, page)
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(html)
+        parts = urlsplit(url)
+        manifest[parts.path + (f"?{parts.query}" if parts.query else '')] = name
+        recorded += 1
+        print(f"[SUCCESS] Recorded {url} -> {name} ({len(html)} bytes)")
+    save_manifest(directory, manifest)
+    return recorded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='save live listing pages for replay')
+    record_parser.add_argument('platform', choices=('internshala', 'linkedin'))
+    record_parser.add_argument('categories', nargs='+')
+    record_parser.add_argument('--pages', type=int, default=1, help='result pages per category (Internshala)')
+    record_parser.add_argument('--dir', default=RECORDINGS)
+
+    serve_parser = commands.add_parser('serve', help='replay recorded pages over HTTP')
+    serve_parser.add_argument('--dir', default=FIXTURES)
+    serve_parser.add_argument('--port', type=int, default=0)
+    serve_parser.add_argument('--latency-ms', type=float, default=0)
+    serve_parser.add_argument('--jitter-ms', type=float, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        return 0 if record(args.platform, args.categories, args.pages, args.dir) else 1
+
+    server = ReplayServer(args.dir, args.latency_ms, args.jitter_ms, args.port)
+    base_url = server.start()
+    print(f"Replaying {len(server.pages)} pages from {args.dir} at {base_url}; Ctrl+C to stop")
+    print(f"    INTERNSHALA_BASE_URL={base_url} LINKEDIN_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"Served {server.served} pages ({server.missed} not recorded)")
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
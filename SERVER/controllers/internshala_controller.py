@@ -1,38 +1,41 @@
-from services.internshala_scraper import InternshalaScraper
 from models.internshala_model import InternshalaInternshipModel
+from services.scrape_jobs import submit_scrape_job
+from utils.pagination import DEFAULT_PAGE_SIZE
 
 class InternshalaController:
     def __init__(self):
-        self.scraper = InternshalaScraper()
         self.model = InternshalaInternshipModel()
 
     def trigger_scrape_internships(self, filters):
-        try:
-            result = self.scraper.scrape_internships(filters)
-            count = result.get('count', 0)
-            
-            # Success if scraping completed without errors, even if 0 new internships
-            return {
-                'success': True,
-                'message': result.get('message', f'Scraped {count} internships'),
-                'count': count
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'Scraping error: {str(e)}',
-                'count': 0
-            }
+        """Queue a background scrape of filters['category']; returns (job, created)"""
+        return submit_scrape_job(['internshala'], [filters.get('category')], filters)
 
-    def get_all_internships(self, filters):
-        internships, total = self.model.find_internships(filters)
+    def get_all_internships(self, filters, per_page=DEFAULT_PAGE_SIZE, cursor=None, page=None, approximate=False,
+                            fields=None, profile=None):
+        projection = self.model.projection(fields, profile, default='list')
+        internships, total, next_cursor, estimated = self.model.find_internships(
+            filters, per_page=per_page, cursor=cursor, page=page, approximate=approximate, projection=projection
+        )
         return {
             "total": total,
-            "data": internships
+            "total_is_estimate": estimated,
+            "data": internships,
+            "per_page": per_page,
+            "page": page,
+            "next_cursor": next_cursor
         }
 
-    def get_internship_by_id(self, internship_id):
-        return self.model.find_by_id(internship_id)
+    def stream_internships(self, filters, full=False, limit=0, fields=None, profile=None):
+        """Cursor over every matching internship, for streaming responses"""
+        if fields or profile:
+            projection = self.model.projection(fields, profile)
+        else:
+            projection = None if full else self.model.LIST_PROJECTION
+        return self.model.iter_documents(filters, projection, limit=limit)
+
+    def get_internship_by_id(self, internship_id, fields=None, profile=None):
+        projection = self.model.projection(fields, profile, default='detail')
+        return self.model.find_by_id(internship_id, projection)
 
     def get_internship_statistics(self):
         return self.model.get_statistics()
@@ -1,19 +1,13 @@
-from services.internshala_scraper import InternshalaScraper
 from models.internshala_model import InternshalaInternshipModel
+from services.scrape_jobs import submit_scrape_job
 
 class InternshipController:
     def __init__(self):
-        self.internshala_scraper = InternshalaScraper()
         self.internshala_model = InternshalaInternshipModel()
     
     def scrape_internships(self, category):
-        """Controller method to scrape internships"""
-        try:
-            filters = {'category': category}
-            result = self.internshala_scraper.scrape_internships(filters)
-            return result
-        except Exception as e:
-            return {'count': 0, 'message': f'Scraping error: {str(e)}'}
+        """Controller method to queue a background Internshala scrape; returns (job, created)"""
+        return submit_scrape_job(['internshala'], [category])
     
     def get_internships(self, category):
         """Controller method to get internships from database"""
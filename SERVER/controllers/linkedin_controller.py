@@ -1,25 +1,36 @@
 from models.linkedinInternships import LinkedInInternshipModel
-from services.linkedin_scraper import LinkedInScraper
+from services.scrape_jobs import submit_scrape_job
+from utils.pagination import DEFAULT_PAGE_SIZE, InvalidCursor
 
 class LinkedInController:
     def __init__(self):
         self.model = LinkedInInternshipModel()
-        self.scraper = LinkedInScraper()
     
-    def get_all_internships(self, filters=None):
-        """Get all LinkedIn internships without pagination"""
+    def get_all_internships(self, filters=None, per_page=DEFAULT_PAGE_SIZE, cursor=None, page=None, approximate=False,
+                            fields=None, profile=None):
+        """Get one page of LinkedIn internships"""
         if filters is None:
             filters = {}
 
+        projection = self.model.projection(fields, profile, default='list')
         try:
-            internships, total_count = self.model.find_internships(filters)  # No pagination passed
+            internships, total_count, next_cursor, estimated = self.model.find_internships(
+                filters, per_page=per_page, cursor=cursor, page=page, approximate=approximate,
+                projection=projection
+            )
 
             return {
                 'success': True,
                 'count': total_count,
+                'count_is_estimate': estimated,
                 'data': internships,
-                'internships': internships  # Add this for backward compatibility
+                'internships': internships,  # Add this for backward compatibility
+                'per_page': per_page,
+                'page': page,
+                'next_cursor': next_cursor
             }
+        except InvalidCursor:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -29,11 +40,20 @@ class LinkedInController:
                 'count': 0
             }
 
-    
-    def get_internship_by_id(self, internship_id):
+
+    def stream_internships(self, filters=None, full=False, limit=0, fields=None, profile=None):
+        """Cursor over every matching LinkedIn internship, for streaming responses"""
+        if fields or profile:
+            projection = self.model.projection(fields, profile)
+        else:
+            projection = None if full else self.model.LIST_PROJECTION
+        return self.model.iter_documents(filters or {}, projection, limit=limit)
+
+    def get_internship_by_id(self, internship_id, fields=None, profile=None):
         """Get a specific LinkedIn internship by ID"""
+        projection = self.model.projection(fields, profile, default='detail')
         try:
-            internship = self.model.find_by_id(internship_id)
+            internship = self.model.find_by_id(internship_id, projection)
             
             if not internship:
                 return {
@@ -54,29 +74,8 @@ class LinkedInController:
             }
 
     def trigger_scrape_internships(self, filters):
-        """Trigger LinkedIn scraping process"""
-        try:
-            result = self.scraper.scrape_internships(filters)
-            count = result.get('count', 0)
-            
-            if count > 0:
-                return {
-                    'success': True,
-                    'message': result.get('message', f"Successfully scraped {count} LinkedIn internships"),
-                    'count': count
-                }
-            else:
-                return {
-                    'success': False,
-                    'message': result.get('message', 'No internships found'),
-                    'count': 0
-                }
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f"Scraping error: {str(e)}",
-                'count': 0
-            }
+        """Queue a background LinkedIn scrape of filters['category']; returns (job, created)"""
+        return submit_scrape_job(['linkedin'], [filters.get('category')], filters)
 
     def get_internship_statistics(self):
         """Get statistics about LinkedIn internships"""
@@ -0,0 +1,154 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from models.internshala_model import InternshalaInternshipModel
+from models.linkedinInternships import LinkedInInternshipModel
+from utils.fieldsets import InvalidFields, fieldset
+from utils.pagination import (
+    DEFAULT_PAGE_SIZE, SEARCH_MAX_DEPTH, InvalidCursor, PageTooDeep, decode_combined_cursor,
+    encode_combined_cursor, encode_cursor
+)
+
+# Platform collections merged by /api/v1/listings, in tie-break order
+PLATFORM_MODELS = {
+    'internshala': InternshalaInternshipModel,
+    'linkedin': LinkedInInternshipModel,
+}
+
+# Per-platform queries run on a shared pool so requests don't pay for
+# thread start-up
+LISTINGS_QUERY_WORKERS = int(os.getenv('LISTINGS_QUERY_WORKERS', '8'))
+_query_pool = ThreadPoolExecutor(max_workers=LISTINGS_QUERY_WORKERS, thread_name_prefix='listings-query')
+
+
+def _newest_first(doc):
+    # Same order as LISTING_SORT; listings without scraped_at sort last
+    scraped_at = doc.get('scraped_at')
+    return (scraped_at is not None, scraped_at or 0, doc['_id'])
+
+
+def _most_relevant_first(doc):
+    return (doc.get('score', 0),) + _newest_first(doc)
+
+
+class ListingsController:
+    """Listings from every platform collection as one newest-first (or most relevant) list"""
+
+    def __init__(self):
+        self.models = {name: model() for name, model in PLATFORM_MODELS.items()}
+
+    def _platforms(self, names=None):
+        if not names:
+            return dict(self.models)
+        return {name: model for name, model in self.models.items() if name in names}
+
+    def _projections(self, models, fields=None, profile=None):
+        # A field only one platform has is still valid; the others omit it
+        if fields:
+            allowed = {name for model in models.values() for name in model.FIELDS}
+            unknown = sorted(set(fields) - allowed - {'_id'})
+            if unknown:
+                raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(sorted(allowed))}")
+            return {name: fieldset(fields) for name in models}
+        return {name: model.projection(profile=profile) for name, model in models.items()}
+
+    def get_listings(self, filters, platforms=None, per_page=DEFAULT_PAGE_SIZE, cursor=None, page=None,
+                     fields=None, profile=None):
+        """
+        One merged page. Every platform is queried in parallel for at most
+        per_page + 1 listings after its own position in the cursor, and the
+        sorted results are k-way merged, so no platform returns more than the
+        page can use. A '$text' filter ranks by relevance and pages by `page`.
+        """
+        models = self._platforms(platforms)
+        projections = self._projections(models, fields, profile)
+        if '$text' in filters:
+            if cursor:
+                raise InvalidCursor("Search results are paged with ?page=, not a cursor")
+            return self._search_page(filters, models, projections, per_page, page or 1)
+
+        positions = decode_combined_cursor(cursor, models) if cursor else {name: '' for name in models}
+        futures = {
+            name: _query_pool.submit(
+                models[name].find_page, filters, projections[name],
+                per_page=per_page, cursor=position or None
+            )
+            for name, position in positions.items()
+        }
+        pages = {name: future.result() for name, future in futures.items()}
+
+        merged = heapq.merge(
+            *([(doc, name) for doc in documents] for name, (documents, _) in pages.items()),
+            key=lambda item: _newest_first(item[0]), reverse=True
+        )
+        listings, last_taken, taken = [], {}, dict.fromkeys(pages, 0)
+        for doc, name in merged:
+            if len(listings) == per_page:
+                break
+            listings.append({**doc, 'platform': name})
+            last_taken[name] = doc
+            taken[name] += 1
+
+        # A platform is done once its last page has been used up entirely
+        next_positions = {}
+        for name, (documents, more) in pages.items():
+            if more or taken[name] < len(documents):
+                next_positions[name] = encode_cursor(last_taken[name]) if name in last_taken else positions[name]
+
+        return {
+            'success': True,
+            'data': listings,
+            'platforms': list(models),
+            'per_page': per_page,
+            'next_cursor': encode_combined_cursor(next_positions) if next_positions else None
+        }
+
+    def _search_page(self, filters, models, projections, per_page, page):
+        # Relevance pages can't be seeked, so each platform returns its best
+        # page * per_page matches (and its total) and the merge skips ahead
+        wanted = page * per_page
+        if wanted > SEARCH_MAX_DEPTH:
+            raise PageTooDeep(f"Search results are available up to result {SEARCH_MAX_DEPTH}; "
+                              f"narrow the search or use a smaller ?page=")
+        futures = {
+            name: _query_pool.submit(
+                model.find_page_with_total, filters, projections[name], per_page=wanted
+            )
+            for name, model in models.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+        merged = heapq.merge(
+            *([(doc, name) for doc in result[0]] for name, result in results.items()),
+            key=lambda item: _most_relevant_first(item[0]), reverse=True
+        )
+        listings = [{**doc, 'platform': name} for doc, name in merged][wanted - per_page:wanted]
+        total = sum(result[1] for result in results.values())
+        return {
+            'success': True,
+            'data': listings,
+            'platforms': list(models),
+            'total': total,
+            'per_page': per_page,
+            'page': page,
+            'next_cursor': None
+        }
+
+    def stream_listings(self, filters, platforms=None, limit=0, fields=None, profile=None):
+        """Every match from every platform, lazily merged newest first, for streaming responses"""
+        models = self._platforms(platforms)
+        projections = self._projections(models, fields, profile)
+        cursors = [
+            self._tagged(model.iter_documents(filters, projections[name]), name)
+            for name, model in models.items()
+        ]
+        merged = heapq.merge(*cursors, key=_newest_first, reverse=True)
+        if limit:
+            return (doc for _, doc in zip(range(limit), merged))
+        return merged
+
+    @staticmethod
+    def _tagged(documents, platform):
+        for doc in documents:
+            doc['platform'] = platform
+            yield doc
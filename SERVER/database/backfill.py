@@ -0,0 +1,83 @@
+# database/backfill.py
+"""
+One-off data migrations for documents written before a field existed.
+
+    python -m database.backfill                   # run every backfill
+    python -m database.backfill listing-keys      # just the named ones
+                                                  # (listing-keys, normalized-fields, rollups)
+
+Each backfill only touches documents that still need it, so re-running is
+cheap. Run before `python -m database.indexes` when a new unique index
+depends on the backfilled field.
+"""
+import sys
+from pymongo import UpdateOne
+from models.internshala_model import InternshalaInternshipModel
+from models.linkedinInternships import LinkedInInternshipModel
+from services.listing_normalizer import normalize_listing
+from utils.response_cache import bump_version
+
+BATCH_SIZE = 500
+
+
+def backfill_linkedin_listing_keys():
+    """listing_key on LinkedIn listings (unique upsert key of the scraper)"""
+    return LinkedInInternshipModel().backfill_listing_keys()
+
+
+def backfill_normalized_fields():
+    """Typed stipend/applicants/deadline/duration fields on both listing collections"""
+    report = {}
+    source_fields = {'stipend': 1, 'applicants': 1, 'days_left': 1, 'duration': 1, 'scraped_at': 1}
+    for model in (InternshalaInternshipModel(), LinkedInInternshipModel()):
+        collection = model.collection
+        updated, operations = 0, []
+        pending = collection.find({'stipend_min': {'$exists': False}}, source_fields).batch_size(BATCH_SIZE)
+        for doc in pending:
+            operations.append(UpdateOne({'_id': doc['_id']}, {'$set': normalize_listing(doc)}))
+            if len(operations) >= BATCH_SIZE:
+                updated += collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+        if updated:
+            bump_version(model.collection_name)
+        report[collection.name] = updated
+    return report
+
+
+def reconcile_statistics_rollups():
+    """Recompute the listing_rollups statistics from both listing collections"""
+    report = {}
+    for model in (InternshalaInternshipModel(), LinkedInInternshipModel()):
+        report[model.collection_name] = model.rollups.reconcile(model)
+    return report
+
+
+BACKFILLS = {
+    'listing-keys': backfill_linkedin_listing_keys,
+    'normalized-fields': backfill_normalized_fields,
+    'rollups': reconcile_statistics_rollups,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    names = argv or list(BACKFILLS)
+    unknown = [name for name in names if name not in BACKFILLS]
+    if unknown:
+        print(f"[ERROR] Unknown backfill(s): {', '.join(unknown)}. Available: {', '.join(BACKFILLS)}")
+        return 2
+
+    for name in names:
+        try:
+            report = BACKFILLS[name]()
+            print(f"[SUCCESS] {name}: {report}")
+        except Exception as e:
+            print(f"[ERROR] {name} failed: {str(e)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,123 +1,181 @@
 # database/db_connection.py
 from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-class MockDatabase:
-    """Mock database for testing when MongoDB is not available"""
-    def __init__(self):
-        self.collections = {}
-        print("📝 Using mock database for testing")
-    
-    def __getitem__(self, collection_name):
-        if collection_name not in self.collections:
-            self.collections[collection_name] = MockCollection()
-        return self.collections[collection_name]
-    
-    def list_collection_names(self):
-        return list(self.collections.keys())
-    
-    def create_collection(self, name):
-        if name not in self.collections:
-            self.collections[name] = MockCollection()
-
-class MockCollection:
-    """Mock collection for testing"""
-    def __init__(self):
-        self.data = []
-        self._id_counter = 1
-    
-    def insert_one(self, document):
-        document['_id'] = self._id_counter
-        self._id_counter += 1
-        self.data.append(document)
-        return type('Result', (), {'inserted_id': document['_id']})()
-    
-    def find_one(self, query):
-        for doc in self.data:
-            if all(doc.get(k) == v for k, v in query.items()):
-                return doc
-        return None
-    
-    def find(self, query=None):
-        if query is None:
-            return self.data
-        results = []
-        for doc in self.data:
-            if all(doc.get(k) == v for k, v in query.items()):
-                results.append(doc)
-        return results
-    
-    def delete_one(self, query):
-        for i, doc in enumerate(self.data):
-            if all(doc.get(k) == v for k, v in query.items()):
-                del self.data[i]
-                return type('Result', (), {'deleted_count': 1})()
-        return type('Result', (), {'deleted_count': 0})()
-    
-    def delete_many(self, query):
-        count = 0
-        for i in range(len(self.data) - 1, -1, -1):
-            doc = self.data[i]
-            if all(doc.get(k) == v for k, v in query.items()):
-                del self.data[i]
-                count += 1
-        return type('Result', (), {'deleted_count': count})()
-    
-    def create_index(self, field, **kwargs):
-        pass  # Mock implementation
-
-def get_db_connection():
-    """Create a connection to the MongoDB Cloud database"""
+# Process-wide client registry. MongoClient is thread-safe and owns its own
+# connection pool, so every route and model shares the one built here.
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+# The first URI that answered a ping; kept for the life of the process
+_resolved_uri = None
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"[WARNING] Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+
+def get_pool_settings():
+    """Connection pool sizing and health-check settings passed to MongoClient"""
+    return {
+        'maxPoolSize': _env_int('MONGO_MAX_POOL_SIZE', 50),
+        'minPoolSize': _env_int('MONGO_MIN_POOL_SIZE', 1),
+        'maxIdleTimeMS': _env_int('MONGO_MAX_IDLE_TIME_MS', 300000),
+        'waitQueueTimeoutMS': _env_int('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000),
+        'heartbeatFrequencyMS': _env_int('MONGO_HEARTBEAT_FREQUENCY_MS', 10000),
+        'serverSelectionTimeoutMS': _env_int('MONGO_SERVER_SELECTION_TIMEOUT_MS', 10000),
+        'connectTimeoutMS': _env_int('MONGO_CONNECT_TIMEOUT_MS', 20000),
+        'socketTimeoutMS': _env_int('MONGO_SOCKET_TIMEOUT_MS', 30000),
+        'retryWrites': True,
+    }
+
+
+def _reset_client_after_fork():
+    """Drop the parent's client in a forked child; its sockets are not ours to use"""
+    global _client, _client_pid, _client_lock
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+
+def _candidate_uris():
+    """Atlas first, then MONGO_URI (a local server when unset)"""
+    candidates = []
+    for uri in (os.environ.get('MONGO_URI_ATLAS'),
+                os.environ.get('MONGO_URI', 'mongodb://localhost:27017/')):
+        if uri and uri not in candidates:
+            candidates.append(uri)
+    return candidates
+
+
+def _resolve_mongo_uri():
+    """Pick the first reachable URI and remember it so later clients skip the probe"""
+    global _resolved_uri
+    if _resolved_uri:
+        return _resolved_uri
+
+    candidates = _candidate_uris()
+    if len(candidates) == 1:
+        _resolved_uri = candidates[0]
+        return _resolved_uri
+
+    probe_timeout = _env_int('MONGO_PROBE_TIMEOUT_MS', 5000)
+    errors = []
+    for uri in candidates:
+        if uri.startswith('memory://'):
+            _resolved_uri = uri
+            return uri
+        probe = MongoClient(uri, serverSelectionTimeoutMS=probe_timeout)
+        try:
+            probe.admin.command('ping')
+            _resolved_uri = uri
+            return uri
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            errors.append(str(e))
+        finally:
+            probe.close()
+
+    raise Exception(f"Could not connect to any MongoDB instance: {'; '.join(errors)}")
+
+
+def get_mongo_client():
+    """Return the shared MongoClient, creating it on first use in this process"""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _client_lock:
+        if _client is not None and _client_pid == pid:
+            return _client
+
+        try:
+            mongo_uri = _resolve_mongo_uri()
+            if mongo_uri.startswith('memory://'):
+                # Indexed in-process engine for tests and benchmarks; see database/memory_engine.py
+                from database.memory_engine import MemoryClient
+                client = MemoryClient(mongo_uri)
+            else:
+                # connect=False defers the handshake to the first operation
+                client = MongoClient(mongo_uri, connect=False, **get_pool_settings())
+
+            if os.environ.get('MONGO_PING_ON_CONNECT', 'false').lower() == 'true':
+                client.admin.command('ping')
+        except Exception as e:
+            print(f"[ERROR] MongoDB connection error: {str(e)}")
+            print("[INFO] Please check MONGO_URI_ATLAS / MONGO_URI and ensure MongoDB is accessible")
+            raise Exception(f"MongoDB connection failed: {str(e)}")
+
+        _client = client
+        _client_pid = pid
+        return _client
+
+
+def get_db_connection(db_name=None):
+    """Return a database handle backed by the shared, pooled MongoClient"""
+    client = get_mongo_client()
+    return client[db_name or os.environ.get('DB_NAME', 'ApplyAsYouGo')]
+
+
+def close_db_connection():
+    """Close the shared client (e.g. on shutdown); the next call reconnects"""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def check_db_health():
+    """Ping the database through the shared pool and report latency"""
+    started = time.perf_counter()
     try:
-        # Get MongoDB Cloud connection string from environment
-        # Try Atlas first, fallback to local
-        mongo_uri = os.environ.get('MONGO_URI_ATLAS') or os.environ.get('MONGO_URI')
-        db_name = os.environ.get('DB_NAME', 'ApplyAsYouGo')
-        
-        if not mongo_uri:
-            raise Exception("MONGO_URI environment variable is required for MongoDB Cloud connection")
-        
-        # Add connection timeout and retry settings for cloud connections
-        client = MongoClient(
-            mongo_uri,
-            serverSelectionTimeoutMS=10000,  # 10 second timeout for cloud
-            connectTimeoutMS=20000,          # 20 second connection timeout
-            socketTimeoutMS=30000,           # 30 second socket timeout
-            retryWrites=True,
-            maxPoolSize=10,
-            minPoolSize=1
-        )
-        
-        # Test the connection
-        client.admin.command('ping')
-        print(f"[SUCCESS] Successfully connected to MongoDB Cloud: {db_name}")
-        
-        db = client[db_name]
-        return db
+        get_mongo_client().admin.command('ping')
+        return {
+            'ok': True,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
     except Exception as e:
-        print(f"[ERROR] MongoDB Cloud connection error: {str(e)}")
-        print("[INFO] Please check your MONGO_URI and ensure MongoDB Cloud is accessible")
-        raise Exception(f"MongoDB Cloud connection failed: {str(e)}")
+        # The details (hosts, credentials in the URI) stay in the server log
+        print(f"[ERROR] Database health check failed: {str(e)}")
+        return {
+            'ok': False,
+            'error': 'Database unreachable'
+        }
 
 def init_database():
     """Initialize database with required collections and indexes"""
     try:
+        from database.indexes import ensure_indexes
+
         db = get_db_connection()
 
         # Create collections if they don't exist
-        if "resumes" not in db.list_collection_names():
-            db.create_collection("resumes")
-
-        if "users" not in db.list_collection_names():
-            db.create_collection("users")
+        existing = db.list_collection_names()
+        for name in ("resumes", "users"):
+            if name not in existing:
+                db.create_collection(name)
 
-        # Create useful indexes
-        db.resumes.create_index("upload_date")
-        db.users.create_index("email", unique=True)
+        # Every index the routes and models rely on; see database/indexes.py
+        report = ensure_indexes()
+        print(f"[SUCCESS] Database indexes ready ({len(report['created'])} ok, {len(report['failed'])} failed)")
 
         return True
     except Exception as e:
@@ -0,0 +1,283 @@
+# database/indexes.py
+"""
+Declarative index manifest for every hot query in the app.
+
+Apply it with ensure_indexes() (called from init_database() at startup) or
+from the command line:
+
+    python -m database.indexes            # create any missing indexes
+    python -m database.indexes --check    # also explain() each canonical query
+                                          # and fail if one is a COLLSCAN
+"""
+import sys
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+from database.db_connection import get_db_connection
+from models.base_model import BaseMongoModel
+from models.internshala_model import InternshalaInternshipModel
+from models.linkedinInternships import LinkedInInternshipModel
+from models.listing_rollup_model import ListingRollupModel
+from models.scrape_job_model import ScrapeJobModel
+from models.scrape_state_model import ScrapeStateModel
+from utils.pagination import LISTING_SORT, SEARCH_SORT
+
+# Where each manifest entry lives. 'app' is the database used by the
+# user-facing routes; 'listings' is the one the internship models use.
+APP_DB = 'app'
+LISTINGS_DB = 'listings'
+
+# Listing collections are addressed through their models so that the
+# *_COLLECTION_NAME environment overrides are honoured.
+INTERNSHALA = InternshalaInternshipModel
+LINKEDIN = LinkedInInternshipModel
+
+# ?q= / ?title= search on the list routes; weights rank title matches first
+TEXT_SEARCH_KEYS = [('title', TEXT), ('company', TEXT), ('skills', TEXT)]
+TEXT_SEARCH_OPTIONS = {
+    'name': 'listing_text_search',
+    'weights': {'title': 10, 'company': 5, 'skills': 3},
+    'default_language': 'english',
+}
+
+# ?min_stipend= / ?max_days_left= / ?max_applicants= on the list routes,
+# over the typed fields from services/listing_normalizer.py. The range field
+# leads so the bounds are an index seek; category is the common equality.
+RANGE_FILTER_KEYS = [
+    [('stipend_min', ASCENDING), ('scraped_at', DESCENDING)],
+    [('category', ASCENDING), ('stipend_min', ASCENDING), ('scraped_at', DESCENDING)],
+    [('deadline', ASCENDING), ('scraped_at', DESCENDING)],
+    [('applicants_count', ASCENDING), ('scraped_at', DESCENDING)],
+]
+
+INDEX_MANIFEST = [
+    # Users and auth
+    {'database': APP_DB, 'collection': 'users',
+     'keys': [('email', ASCENDING)], 'options': {'unique': True}},
+    {'database': APP_DB, 'collection': 'resumes',
+     'keys': [('upload_date', ASCENDING)]},
+    {'database': APP_DB, 'collection': 'resumes',
+     'keys': [('user_email', ASCENDING)]},
+    # Upserts in /user/preferences and /user/application-profile are keyed on
+    # user_email, so a unique index is what keeps them to one doc per user
+    {'database': APP_DB, 'collection': 'application_profiles',
+     'keys': [('user_email', ASCENDING)], 'options': {'unique': True}},
+    {'database': APP_DB, 'collection': 'user_preferences',
+     'keys': [('user_email', ASCENDING)], 'options': {'unique': True}},
+
+    # Application tracking (/user/applications, /api/dashboard/stats)
+    {'database': APP_DB, 'collection': 'internship_applications',
+     'keys': [('user_email', ASCENDING), ('applied_date', DESCENDING)]},
+    {'database': APP_DB, 'collection': 'internship_applications',
+     'keys': [('user_email', ASCENDING), ('applied_at', DESCENDING)]},
+
+    # Contact messages (/admin/contact-messages[/<status>])
+    {'database': APP_DB, 'collection': 'contact',
+     'keys': [('status', ASCENDING), ('created_at', DESCENDING)]},
+    {'database': APP_DB, 'collection': 'contact',
+     'keys': [('created_at', DESCENDING)]},
+
+    # Recent listings on the dashboard
+    {'database': APP_DB, 'collection': 'linkedin_internships',
+     'keys': [('scraped_at', DESCENDING)]},
+    {'database': APP_DB, 'collection': 'internshala_internships',
+     'keys': [('scraped_at', DESCENDING)]},
+    {'database': APP_DB, 'collection': 'unstop_internships',
+     'keys': [('scraped_at', DESCENDING)]},
+
+    # Listing collections are paged newest first by (scraped_at, _id); see
+    # utils/pagination.py. _id is part of each key so keyset seeks need no sort.
+    # Each also carries the weighted text index behind ?q= search.
+
+    # Internshala listings: the scraper dedups with internship_id $in
+    {'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'keys': [('internship_id', ASCENDING)], 'options': {'unique': True}},
+    {'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'keys': [('scraped_at', DESCENDING), ('_id', DESCENDING)]},
+    {'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'keys': [('category', ASCENDING), ('scraped_at', DESCENDING), ('_id', DESCENDING)]},
+    {'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'keys': [('company', ASCENDING), ('scraped_at', DESCENDING), ('_id', DESCENDING)]},
+    {'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'keys': TEXT_SEARCH_KEYS, 'options': TEXT_SEARCH_OPTIONS},
+    *({'database': LISTINGS_DB, 'collection': INTERNSHALA, 'keys': keys} for keys in RANGE_FILTER_KEYS),
+
+    # LinkedIn listings: the scraper upserts each card on listing_key. Partial
+    # so listings saved before the key existed don't collide on null; run
+    # `python -m database.backfill listing-keys` to give them one.
+    {'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'keys': [('listing_key', ASCENDING)],
+     'options': {'unique': True, 'partialFilterExpression': {'listing_key': {'$exists': True}}}},
+    {'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'keys': [('scraped_at', DESCENDING), ('_id', DESCENDING)]},
+    {'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'keys': [('category', ASCENDING), ('scraped_at', DESCENDING), ('_id', DESCENDING)]},
+    {'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'keys': [('company', ASCENDING), ('scraped_at', DESCENDING), ('_id', DESCENDING)]},
+    {'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'keys': TEXT_SEARCH_KEYS, 'options': TEXT_SEARCH_OPTIONS},
+    *({'database': LISTINGS_DB, 'collection': LINKEDIN, 'keys': keys} for keys in RANGE_FILTER_KEYS),
+
+    # Statistics rollups: $inc upserts hit the unique key, /statistics reads
+    # each dimension largest first
+    {'database': LISTINGS_DB, 'collection': ListingRollupModel,
+     'keys': [('source', ASCENDING), ('dimension', ASCENDING), ('value', ASCENDING)],
+     'options': {'unique': True}},
+    {'database': LISTINGS_DB, 'collection': ListingRollupModel,
+     'keys': [('source', ASCENDING), ('dimension', ASCENDING), ('count', DESCENDING)]},
+
+    # Incremental crawl state: one document per (source, category)
+    {'database': LISTINGS_DB, 'collection': ScrapeStateModel,
+     'keys': [('source', ASCENDING), ('category', ASCENDING)], 'options': {'unique': True}},
+
+    # Background scrape jobs: the unique partial key lets identical requests
+    # attach to the job in flight; finished jobs expire at expires_at
+    {'database': LISTINGS_DB, 'collection': ScrapeJobModel,
+     'keys': [('active_key', ASCENDING)],
+     'options': {'unique': True, 'partialFilterExpression': {'active_key': {'$exists': True}}}},
+    {'database': LISTINGS_DB, 'collection': ScrapeJobModel,
+     'keys': [('expires_at', ASCENDING)], 'options': {'expireAfterSeconds': 0}},
+    {'database': LISTINGS_DB, 'collection': ScrapeJobModel,
+     'keys': [('created_at', DESCENDING)]},
+
+    # Legacy InternshipModel lookups
+    {'database': LISTINGS_DB, 'collection': 'internships',
+     'keys': [('category', ASCENDING)]},
+]
+
+# The query each route runs, used by --check to prove none is a COLLSCAN
+CANONICAL_QUERIES = [
+    {'route': 'POST /user/login', 'database': APP_DB, 'collection': 'users',
+     'filter': {'email': 'user@example.com'}},
+    {'route': 'GET /user/applications', 'database': APP_DB, 'collection': 'internship_applications',
+     'filter': {'user_email': 'user@example.com'}, 'sort': [('applied_date', DESCENDING)]},
+    {'route': 'GET /api/dashboard/stats', 'database': APP_DB, 'collection': 'internship_applications',
+     'filter': {'user_email': 'user@example.com'}},
+    {'route': 'GET /user/application-profile', 'database': APP_DB, 'collection': 'application_profiles',
+     'filter': {'user_email': 'user@example.com'}},
+    {'route': 'POST /user/preferences', 'database': APP_DB, 'collection': 'user_preferences',
+     'filter': {'user_email': 'user@example.com'}},
+    {'route': 'GET /admin/contact-messages', 'database': APP_DB, 'collection': 'contact',
+     'filter': {}, 'sort': [('created_at', DESCENDING)]},
+    {'route': 'GET /admin/contact-messages/<status>', 'database': APP_DB, 'collection': 'contact',
+     'filter': {'status': 'new'}, 'sort': [('created_at', DESCENDING)]},
+    {'route': 'GET /api/dashboard', 'database': APP_DB, 'collection': 'linkedin_internships',
+     'filter': {}, 'sort': [('scraped_at', DESCENDING)]},
+    {'route': 'POST /api/internshala/scrape', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'internship_id': {'$in': ['internshala_1', 'internshala_2']}}},
+    {'route': 'POST /api/internshala/scrape (high-water mark)', 'database': LISTINGS_DB,
+     'collection': ScrapeStateModel, 'filter': {'source': 'internshala', 'category': 'web-development'}},
+    {'route': 'POST /api/internshala/scrape (attach to job)', 'database': LISTINGS_DB, 'collection': ScrapeJobModel,
+     'filter': {'active_key': '0' * 40}},
+    {'route': 'GET /api/v1/scrape-jobs', 'database': LISTINGS_DB, 'collection': ScrapeJobModel,
+     'filter': {}, 'sort': [('created_at', DESCENDING)]},
+    {'route': 'GET /api/internshala/list?category=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'category': 'web-development'}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/internshala/list?company=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'company': 'Example Corp'}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/internshala/list?q=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'$text': {'$search': 'python developer'}, 'category': 'web-development'},
+     'sort': SEARCH_SORT},
+    {'route': 'GET /api/internshala/list?min_stipend=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'stipend_min': {'$gte': 10000}}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/internshala/list?category=&min_stipend=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'category': 'web-development', 'stipend_min': {'$gte': 10000}}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/internshala/list?max_days_left=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'deadline': {'$gte': datetime(2025, 1, 1), '$lte': datetime(2025, 1, 8)}}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/internshala/list?max_applicants=', 'database': LISTINGS_DB, 'collection': INTERNSHALA,
+     'filter': {'applicants_count': {'$lte': 50}}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/internshala/statistics', 'database': LISTINGS_DB, 'collection': ListingRollupModel,
+     'filter': {'source': 'internshala', 'dimension': 'company', 'count': {'$gt': 0}}, 'sort': [('count', DESCENDING)]},
+    {'route': 'POST /api/linkedin/scrape', 'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'filter': {'listing_key': 'li:3812345678'}},
+    {'route': 'GET /api/linkedin/list?category=', 'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'filter': {'category': 'internship'}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/linkedin/list?company=', 'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'filter': {'company': 'Example Corp'}, 'sort': LISTING_SORT},
+    {'route': 'GET /api/linkedin/list?q=', 'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'filter': {'$text': {'$search': 'data analyst'}}, 'sort': SEARCH_SORT},
+    {'route': 'GET /api/linkedin/list?cursor=', 'database': LISTINGS_DB, 'collection': LINKEDIN,
+     'filter': {'$or': [{'scraped_at': {'$lt': 1700000000.0}},
+                        {'scraped_at': 1700000000.0, '_id': {'$lt': '000000000000000000000000'}},
+                        {'scraped_at': None}]},
+     'sort': LISTING_SORT},
+]
+
+
+def _resolve_collection(entry):
+    """Turn a manifest entry's database/collection pair into a Collection"""
+    target = entry['collection']
+    if isinstance(target, type) and issubclass(target, BaseMongoModel):
+        return target().collection
+    if entry['database'] == LISTINGS_DB:
+        return BaseMongoModel(collection_name=target).collection
+    return get_db_connection()[target]
+
+
+def ensure_indexes(manifest=None):
+    """
+    Create every index in the manifest. Safe to run repeatedly: existing
+    indexes with the same spec are left alone, and conflicts (e.g. duplicate
+    data blocking a unique index) are reported without stopping the others.
+    """
+    report = {'created': [], 'failed': []}
+    for entry in manifest or INDEX_MANIFEST:
+        collection = _resolve_collection(entry)
+        label = f"{collection.name}{entry['keys']}"
+        try:
+            name = collection.create_index(entry['keys'], **entry.get('options', {}))
+            report['created'].append(f"{collection.name}.{name}")
+        except OperationFailure as e:
+            print(f"[ERROR] Index {label} could not be built: {e}")
+            report['failed'].append({'index': label, 'error': str(e)})
+    return report
+
+
+def _find_stages(plan, found=None):
+    """Collect every 'stage' name in an explain() plan tree"""
+    if found is None:
+        found = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            found.append(plan['stage'])
+        for value in plan.values():
+            _find_stages(value, found)
+    elif isinstance(plan, list):
+        for item in plan:
+            _find_stages(item, found)
+    return found
+
+
+def verify_query_plans(queries=None):
+    """Explain each canonical route query; return the ones that fall back to COLLSCAN"""
+    failures = []
+    for query in queries or CANONICAL_QUERIES:
+        collection = _resolve_collection(query)
+        cursor = collection.find(query['filter'])
+        if query.get('sort'):
+            cursor = cursor.sort(query['sort'])
+        plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+        stages = _find_stages(plan)
+        if 'COLLSCAN' in stages:
+            failures.append({'route': query['route'], 'collection': collection.name, 'stages': stages})
+    return failures
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    report = ensure_indexes()
+    print(f"[SUCCESS] {len(report['created'])} indexes in place, {len(report['failed'])} failed")
+
+    if '--check' in argv:
+        failures = verify_query_plans()
+        for failure in failures:
+            print(f"[ERROR] COLLSCAN for {failure['route']} on {failure['collection']}: {failure['stages']}")
+        if failures:
+            return 1
+        print(f"[SUCCESS] All {len(CANONICAL_QUERIES)} canonical queries use an index")
+
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
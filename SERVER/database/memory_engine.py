@@ -0,0 +1,1785 @@
+# database/memory_engine.py
+"""
+In-memory, MongoDB-compatible storage engine.
+
+Selected with MONGO_URI=memory:// (see database.db_connection). It stands in
+for pymongo's MongoClient so the real routes, models and scrapers can run and
+be benchmarked without a MongoDB server:
+
+- documents live in a dict keyed by _id (the implicit _id_ index)
+- every create_index() builds a secondary index with a hash map for equality
+  lookups and a sorted list for range scans and ordered walks, including
+  unique, sparse, partial and multikey (array) indexes, plus weighted text
+  indexes (an inverted index) for $text queries and {'$meta': 'textScore'}
+- find() plans each query against those indexes, so equality/$in/range
+  filters and sort+limit on an indexed prefix never scan the collection;
+  cursor.explain() reports the chosen plan in mongod's format
+- the query, update and aggregation operators this codebase uses are
+  supported, and results/errors use pymongo's own result and error types
+
+Data lives only as long as the process.
+"""
+import datetime
+import itertools
+import math
+import re
+import threading
+from decimal import Decimal
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError, OperationFailure
+from pymongo.operations import DeleteMany, DeleteOne, IndexModel, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+from sortedcontainers import SortedList
+
+# ---------------------------------------------------------------------------
+# Value ordering and document helpers
+# ---------------------------------------------------------------------------
+
+# Sorts after every real key; used to build open-ended index bounds
+_MAX_KEY = (100,)
+
+
+def _type_rank(value):
+    """BSON comparison order, so mixed-type fields sort the way mongod sorts them"""
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float, Decimal, Decimal128)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, (list, tuple)):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime.datetime):
+        return 9
+    if isinstance(value, re.Pattern):
+        return 11
+    return 10
+
+
+def _sort_key(value):
+    """A hashable, totally ordered key; values of different types never get compared"""
+    # Fast paths for the types that make up almost every indexed field
+    kind = type(value)
+    if kind is str:
+        return (3, value)
+    if kind is int or kind is float:
+        return (2, value)
+    if kind is ObjectId:
+        return (7, value)
+    if value is None:
+        return (1,)
+    rank = _type_rank(value)
+    if rank == 1:
+        return (1,)
+    if rank == 2:
+        if isinstance(value, Decimal128):
+            value = value.to_decimal()
+        return (2, value)
+    if rank == 9:
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return (9, value)
+    if rank in (4, 5, 10, 11):
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def _is_scalar(value):
+    return not isinstance(value, (dict, list, tuple, re.Pattern))
+
+
+def _clone(value):
+    """Deep copy with BSON round-trip semantics (tuples become lists, datetimes naive UTC ms)"""
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clone(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def _get_values(doc, path):
+    """Every value reachable at a dotted path, descending into arrays"""
+    if '.' not in path:
+        if isinstance(doc, dict) and path in doc:
+            return [doc[path]]
+        return []
+
+    current = [doc]
+    for part in path.split('.'):
+        found = []
+        for item in current:
+            if isinstance(item, dict):
+                if part in item:
+                    found.append(item[part])
+            elif isinstance(item, list):
+                if part.isdigit() and int(part) < len(item):
+                    found.append(item[int(part)])
+                for element in item:
+                    if isinstance(element, dict) and part in element:
+                        found.append(element[part])
+        current = found
+    return current
+
+
+def _expand(values):
+    """Field values plus the elements of any arrays among them"""
+    for value in values:
+        yield value
+        if isinstance(value, list):
+            yield from value
+
+
+def _set_path(doc, path, value):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        if isinstance(target, list) and part.isdigit():
+            target = target[int(part)]
+            continue
+        if not isinstance(target.get(part), (dict, list)):
+            target[part] = {}
+        target = target[part]
+    if isinstance(target, list) and parts[-1].isdigit():
+        target[int(parts[-1])] = value
+    else:
+        target[parts[-1]] = value
+
+
+def _unset_path(doc, path):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        target = target.get(part) if isinstance(target, dict) else None
+        if target is None:
+            return
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+
+
+def _first_value(doc, path, default=None):
+    values = _get_values(doc, path)
+    return values[0] if values else default
+
+
+def _normalize_sort(key_or_list, direction=None):
+    """Accept every form pymongo does: 'field', ('field', dir), [(f, d)], {f: d}"""
+    if key_or_list is None:
+        return None
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    spec = []
+    for item in key_or_list:
+        if isinstance(item, str):
+            spec.append((item, 1))
+        else:
+            spec.append((item[0], item[1]))
+    return spec
+
+
+def _normalize_index_keys(keys, direction=None):
+    if isinstance(keys, str):
+        return [(keys, direction if direction is not None else 1)]
+    return _normalize_sort(keys)
+
+
+def _sort_docs(docs, sort_spec, meta=None):
+    """Stable multi-key sort; one pass per key from least to most significant"""
+    docs = list(docs)
+    for field, direction in reversed(sort_spec):
+        if isinstance(direction, dict):
+            # {'$meta': ...} sorts are always descending by the computed value
+            docs.sort(key=lambda d: _sort_key((meta or {}).get(id(d), 0)), reverse=True)
+            continue
+        descending = direction == -1
+
+        def key(doc, field=field, descending=descending):
+            value = _first_value(doc, field)
+            if isinstance(value, list) and value:
+                keys = [_sort_key(v) for v in value]
+                return max(keys) if descending else min(keys)
+            return _sort_key(value)
+
+        docs.sort(key=key, reverse=descending)
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Query matching
+# ---------------------------------------------------------------------------
+
+_REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}
+
+
+def _compile_regex(pattern, options=''):
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    flags = 0
+    for option in options or '':
+        flags |= _REGEX_FLAGS.get(option, 0)
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise OperationFailure(f"Regular expression is invalid: {e}", 51091)
+
+
+def _eq_match(values, target):
+    if isinstance(target, re.Pattern):
+        return any(isinstance(v, str) and target.search(v) for v in _expand(values))
+    if target is None and not values:
+        return True
+    target_key = _sort_key(target)
+    return any(_sort_key(v) == target_key for v in _expand(values))
+
+
+def _compare_match(values, target, compare):
+    target_key = _sort_key(target)
+    for value in _expand(values):
+        key = _sort_key(value)
+        if key[0] == target_key[0] and compare(key, target_key):
+            return True
+    return False
+
+
+_COMPARATORS = {
+    '$gt': lambda a, b: a > b,
+    '$gte': lambda a, b: a >= b,
+    '$lt': lambda a, b: a < b,
+    '$lte': lambda a, b: a <= b,
+}
+
+
+def _compile_operator(op, arg, options):
+    """Compile one field operator into a predicate over that field's values"""
+    if op == '$eq':
+        return lambda values: _eq_match(values, arg)
+    if op == '$ne':
+        return lambda values: not _eq_match(values, arg)
+    if op in _COMPARATORS:
+        compare = _COMPARATORS[op]
+        return lambda values: _compare_match(values, arg, compare)
+    if op == '$in':
+        targets = [_compile_regex(t) if isinstance(t, re.Pattern) else t for t in arg]
+        return lambda values: any(_eq_match(values, t) for t in targets)
+    if op == '$nin':
+        return lambda values: not any(_eq_match(values, t) for t in arg)
+    if op == '$exists':
+        return lambda values: bool(values) == bool(arg)
+    if op == '$regex':
+        regex = _compile_regex(arg, options)
+        return lambda values: any(isinstance(v, str) and regex.search(v) for v in _expand(values))
+    if op == '$not':
+        if isinstance(arg, dict):
+            inner = [_compile_operator(k, v, arg.get('$options', '')) for k, v in arg.items() if k != '$options']
+            return lambda values: not all(p(values) for p in inner)
+        regex = _compile_regex(arg)
+        return lambda values: not any(isinstance(v, str) and regex.search(v) for v in _expand(values))
+    if op == '$size':
+        return lambda values: any(isinstance(v, list) and len(v) == arg for v in values)
+    if op == '$all':
+        return lambda values: all(_eq_match(values, t) for t in arg)
+    if op == '$elemMatch':
+        if all(k.startswith('$') for k in arg):
+            inner = [_compile_operator(k, v, arg.get('$options', '')) for k, v in arg.items() if k != '$options']
+            element_match = lambda element: all(p([element]) for p in inner)
+        else:
+            doc_match = compile_filter(arg)
+            element_match = lambda element: isinstance(element, dict) and doc_match(element)
+        return lambda values: any(
+            isinstance(v, list) and any(element_match(e) for e in v) for v in values
+        )
+    if op == '$type':
+        return lambda values: any(type(v).__name__ == arg for v in values)
+    raise OperationFailure(f"unknown operator: {op}", 2)
+
+
+def _compile_field(path, condition):
+    if isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition):
+        options = condition.get('$options', '')
+        predicates = [
+            _compile_operator(op, arg, options)
+            for op, arg in condition.items() if op != '$options'
+        ]
+        if len(predicates) == 1:
+            only = predicates[0]
+            return lambda doc: only(_get_values(doc, path))
+
+        def match_all(doc):
+            values = _get_values(doc, path)
+            return all(p(values) for p in predicates)
+        return match_all
+    return lambda doc: _eq_match(_get_values(doc, path), condition)
+
+
+def compile_filter(filter_doc):
+    """Compile a query document into a predicate(doc) -> bool"""
+    if not filter_doc:
+        return lambda doc: True
+
+    predicates = []
+    for key, condition in filter_doc.items():
+        if key == '$and':
+            parts = [compile_filter(c) for c in condition]
+            predicates.append(lambda doc, parts=parts: all(p(doc) for p in parts))
+        elif key == '$or':
+            parts = [compile_filter(c) for c in condition]
+            predicates.append(lambda doc, parts=parts: any(p(doc) for p in parts))
+        elif key == '$nor':
+            parts = [compile_filter(c) for c in condition]
+            predicates.append(lambda doc, parts=parts: not any(p(doc) for p in parts))
+        elif key == '$comment':
+            continue
+        elif key.startswith('$'):
+            raise OperationFailure(f"unknown top level operator: {key}", 2)
+        else:
+            predicates.append(_compile_field(key, condition))
+
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda doc: all(p(doc) for p in predicates)
+
+
+def _index_usable_terms(filter_doc):
+    """Split a filter into the equality, $in and range terms an index can serve"""
+    equality, in_lists, ranges = {}, {}, {}
+    clauses = [filter_doc] + [c for c in filter_doc.get('$and', []) if isinstance(c, dict)]
+    for clause in clauses:
+        for field, condition in clause.items():
+            if field.startswith('$'):
+                continue
+            if isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition):
+                if '$eq' in condition and _is_scalar(condition['$eq']):
+                    equality[field] = condition['$eq']
+                if '$in' in condition and all(_is_scalar(v) for v in condition['$in']):
+                    in_lists[field] = list(condition['$in'])
+                for op in _COMPARATORS:
+                    if op in condition and _is_scalar(condition[op]) and condition[op] is not None:
+                        ranges.setdefault(field, {})[op] = condition[op]
+            elif _is_scalar(condition):
+                equality[field] = condition
+    return equality, in_lists, ranges
+
+
+# ---------------------------------------------------------------------------
+# Updates
+# ---------------------------------------------------------------------------
+
+def _is_operator_update(update):
+    return bool(update) and all(k.startswith('$') for k in update)
+
+
+def _apply_update(doc, update, is_insert=False):
+    """Return a new document with the update applied; the stored one is never mutated"""
+    if not _is_operator_update(update):
+        replacement = _clone(update)
+        replacement['_id'] = doc['_id']
+        return replacement
+
+    new_doc = _clone(doc)
+    for op, fields in update.items():
+        if op == '$set':
+            for path, value in fields.items():
+                _set_path(new_doc, path, _clone(value))
+        elif op == '$setOnInsert':
+            if is_insert:
+                for path, value in fields.items():
+                    _set_path(new_doc, path, _clone(value))
+        elif op == '$unset':
+            for path in fields:
+                _unset_path(new_doc, path)
+        elif op in ('$inc', '$mul'):
+            for path, amount in fields.items():
+                current = _first_value(new_doc, path, 0)
+                if not isinstance(current, (int, float, Decimal)) or isinstance(current, bool):
+                    raise OperationFailure(f"Cannot apply {op} to a value of non-numeric type", 14)
+                _set_path(new_doc, path, current + amount if op == '$inc' else current * amount)
+        elif op in ('$min', '$max'):
+            for path, value in fields.items():
+                current = _first_value(new_doc, path)
+                if current is None or (
+                    _sort_key(value) < _sort_key(current) if op == '$min' else _sort_key(value) > _sort_key(current)
+                ):
+                    _set_path(new_doc, path, _clone(value))
+        elif op in ('$push', '$addToSet'):
+            for path, value in fields.items():
+                items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+                current = _first_value(new_doc, path)
+                current = list(current) if isinstance(current, list) else []
+                for item in items:
+                    if op == '$push' or not any(_sort_key(item) == _sort_key(c) for c in current):
+                        current.append(_clone(item))
+                if isinstance(value, dict) and '$slice' in value:
+                    size = value['$slice']
+                    current = current[size:] if size < 0 else current[:size]
+                _set_path(new_doc, path, current)
+        elif op == '$pull':
+            for path, value in fields.items():
+                current = _first_value(new_doc, path)
+                if isinstance(current, list):
+                    if isinstance(value, dict):
+                        match = _compile_field('v', value)
+                        kept = [c for c in current if not match({'v': c})]
+                    else:
+                        kept = [c for c in current if _sort_key(c) != _sort_key(value)]
+                    _set_path(new_doc, path, kept)
+        elif op == '$rename':
+            for path, new_path in fields.items():
+                values = _get_values(new_doc, path)
+                if values:
+                    _unset_path(new_doc, path)
+                    _set_path(new_doc, new_path, values[0])
+        elif op == '$currentDate':
+            for path in fields:
+                _set_path(new_doc, path, _clone(datetime.datetime.now(datetime.timezone.utc)))
+        else:
+            raise OperationFailure(f"Unknown modifier: {op}", 9)
+    new_doc['_id'] = doc['_id']
+    return new_doc
+
+
+def _upsert_seed(filter_doc):
+    """The document an upsert starts from: the filter's equality terms"""
+    seed = {}
+    clauses = [filter_doc] + [c for c in filter_doc.get('$and', []) if isinstance(c, dict)]
+    for clause in clauses:
+        for field, condition in clause.items():
+            if field.startswith('$'):
+                continue
+            if isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition):
+                if '$eq' in condition:
+                    _set_path(seed, field, _clone(condition['$eq']))
+            else:
+                _set_path(seed, field, _clone(condition))
+    return seed
+
+
+# ---------------------------------------------------------------------------
+# Aggregation expressions and stages
+# ---------------------------------------------------------------------------
+
+def _eval(expr, doc):
+    if isinstance(expr, str) and expr.startswith('$'):
+        if expr == '$$ROOT':
+            return doc
+        values = _get_values(doc, expr[1:])
+        if not values:
+            return None
+        return values[0] if len(values) == 1 else values
+    if isinstance(expr, list):
+        return [_eval(item, doc) for item in expr]
+    if isinstance(expr, dict):
+        if len(expr) == 1:
+            op, arg = next(iter(expr.items()))
+            if op.startswith('$'):
+                return _eval_operator(op, arg, doc)
+        return {key: _eval(value, doc) for key, value in expr.items()}
+    return expr
+
+
+def _eval_operator(op, arg, doc):
+    if op == '$literal':
+        return arg
+    args = [_eval(a, doc) for a in arg] if isinstance(arg, list) else [_eval(arg, doc)]
+    if op == '$ifNull':
+        return next((a for a in args if a is not None), None)
+    if op == '$cond':
+        if isinstance(arg, dict):
+            args = [_eval(arg['if'], doc), _eval(arg['then'], doc), _eval(arg['else'], doc)]
+        return args[1] if args[0] else args[2]
+    if op in ('$add', '$sum'):
+        if len(args) == 1 and isinstance(args[0], list):
+            args = args[0]
+        return sum(a for a in args if isinstance(a, (int, float)) and not isinstance(a, bool))
+    if op == '$subtract':
+        if args[0] is None or args[1] is None:
+            return None
+        difference = args[0] - args[1]
+        # date - date is a number of milliseconds, as in mongod
+        if isinstance(difference, datetime.timedelta):
+            return int(difference.total_seconds() * 1000)
+        return difference
+    if op == '$multiply':
+        result = 1
+        for a in args:
+            result *= a
+        return result
+    if op == '$divide':
+        return None if args[0] is None or args[1] is None else args[0] / args[1]
+    if op in ('$ceil', '$floor'):
+        if args[0] is None:
+            return None
+        return (math.ceil if op == '$ceil' else math.floor)(args[0])
+    if op == '$toLower':
+        return (args[0] or '').lower()
+    if op == '$toUpper':
+        return (args[0] or '').upper()
+    if op == '$concat':
+        return None if any(a is None for a in args) else ''.join(args)
+    if op == '$size':
+        return len(args[0] or [])
+    if op == '$in':
+        return any(_sort_key(args[0]) == _sort_key(v) for v in args[1] or [])
+    if op == '$arrayElemAt':
+        array, index = args
+        return array[index] if array and -len(array) <= index < len(array) else None
+    if op in ('$eq', '$ne', '$gt', '$gte', '$lt', '$lte'):
+        left, right = _sort_key(args[0]), _sort_key(args[1])
+        return {
+            '$eq': left == right, '$ne': left != right, '$gt': left > right,
+            '$gte': left >= right, '$lt': left < right, '$lte': left <= right,
+        }[op]
+    if op == '$and':
+        return all(args)
+    if op == '$or':
+        return any(args)
+    if op == '$not':
+        return not args[0]
+    if op in ('$min', '$max'):
+        values = args[0] if len(args) == 1 and isinstance(args[0], list) else args
+        values = [v for v in values if v is not None]
+        if not values:
+            return None
+        return (min if op == '$min' else max)(values, key=_sort_key)
+    raise OperationFailure(f"Unrecognized expression '{op}'", 168)
+
+
+class _Accumulator:
+    def __init__(self, op, expr):
+        self.op, self.expr = op, expr
+        self.value = None
+        self.count = 0
+        self.items = []
+
+    def add(self, doc):
+        value = _eval(self.expr, doc) if self.op != '$count' else 1
+        op = self.op
+        if op in ('$sum', '$count'):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.value = (self.value or 0) + value
+            elif self.value is None:
+                self.value = 0
+        elif op == '$avg':
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.value = (self.value or 0) + value
+                self.count += 1
+        elif op == '$min':
+            if value is not None and (self.value is None or _sort_key(value) < _sort_key(self.value)):
+                self.value = value
+        elif op == '$max':
+            if value is not None and (self.value is None or _sort_key(value) > _sort_key(self.value)):
+                self.value = value
+        elif op == '$first':
+            if not self.count:
+                self.value = value
+            self.count += 1
+        elif op == '$last':
+            self.value = value
+        elif op == '$push':
+            self.items.append(value)
+        elif op == '$addToSet':
+            if not any(_sort_key(value) == _sort_key(i) for i in self.items):
+                self.items.append(value)
+        else:
+            raise OperationFailure(f"unknown group operator '{op}'", 15952)
+
+    def result(self):
+        if self.op in ('$push', '$addToSet'):
+            return self.items
+        if self.op == '$avg':
+            return self.value / self.count if self.count else None
+        return self.value
+
+
+def _stage_group(docs, spec):
+    groups = {}
+    for doc in docs:
+        group_id = _eval(spec['_id'], doc)
+        key = _sort_key(group_id)
+        if key not in groups:
+            accumulators = {
+                field: _Accumulator(*next(iter(acc.items())))
+                for field, acc in spec.items() if field != '_id'
+            }
+            groups[key] = (group_id, accumulators)
+        for accumulator in groups[key][1].values():
+            accumulator.add(doc)
+    results = []
+    for group_id, accumulators in groups.values():
+        out = {'_id': group_id}
+        for field, accumulator in accumulators.items():
+            out[field] = accumulator.result()
+        results.append(out)
+    return results
+
+
+def _stage_unwind(docs, spec):
+    if isinstance(spec, str):
+        spec = {'path': spec}
+    path = spec['path'][1:]
+    keep_empty = spec.get('preserveNullAndEmptyArrays', False)
+    results = []
+    for doc in docs:
+        value = _first_value(doc, path)
+        if isinstance(value, list) and value:
+            for item in value:
+                out = dict(doc)
+                _set_path(out, path, item)
+                results.append(out)
+        elif value is not None and not isinstance(value, list):
+            results.append(doc)
+        elif keep_empty:
+            results.append(doc)
+    return results
+
+
+def run_pipeline(docs, pipeline, meta=None):
+    """Run aggregation stages over an in-memory list of documents"""
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == '$match':
+            match = compile_filter(spec)
+            docs = [doc for doc in docs if match(doc)]
+        elif name == '$sort':
+            docs = _sort_docs(docs, _normalize_sort(spec), meta)
+        elif name == '$skip':
+            docs = docs[spec:]
+        elif name == '$limit':
+            docs = docs[:spec]
+        elif name == '$project':
+            docs = [_project(doc, spec, meta) for doc in docs]
+        elif name in ('$addFields', '$set'):
+            added = []
+            for doc in docs:
+                out = dict(doc)
+                for field, expr in spec.items():
+                    _set_path(out, field, _meta_or_eval(expr, doc, meta))
+                added.append(out)
+            docs = added
+        elif name == '$unset':
+            fields = [spec] if isinstance(spec, str) else spec
+            docs = [{k: v for k, v in doc.items() if k not in fields} for doc in docs]
+        elif name == '$group':
+            docs = _stage_group(docs, spec)
+        elif name == '$count':
+            docs = [{spec: len(docs)}] if docs else []
+        elif name == '$facet':
+            docs = [{field: run_pipeline(list(docs), sub, meta) for field, sub in spec.items()}]
+        elif name == '$unwind':
+            docs = _stage_unwind(docs, spec)
+        elif name == '$sortByCount':
+            docs = _sort_docs(_stage_group(docs, {'_id': spec, 'count': {'$sum': 1}}), [('count', -1)])
+        elif name == '$replaceRoot':
+            docs = [_eval(spec['newRoot'], doc) for doc in docs]
+        else:
+            raise OperationFailure(f"Unrecognized pipeline stage name: '{name}'", 40324)
+    return docs
+
+
+def _meta_or_eval(expr, doc, meta):
+    if isinstance(expr, dict) and '$meta' in expr:
+        return (meta or {}).get(id(doc), 0.0)
+    return _eval(expr, doc)
+
+
+def _project(doc, projection, meta=None):
+    """Apply a find()/$project projection, returning a new document"""
+    if not projection:
+        return _clone(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+
+    include_id = projection.get('_id', 1) not in (0, False)
+    computed, included, excluded = {}, [], []
+    for field, spec in projection.items():
+        if field == '_id':
+            if not isinstance(spec, (int, bool)):
+                computed[field] = spec
+            continue
+        if isinstance(spec, (bool, int, float)):
+            (included if spec else excluded).append(field)
+        else:
+            computed[field] = spec
+    if included and excluded:
+        raise OperationFailure("Cannot do exclusion on field in inclusion projection", 31254)
+
+    if excluded or not (included or computed):
+        out = _clone(doc)
+        for field in excluded:
+            _unset_path(out, field)
+        if not include_id:
+            out.pop('_id', None)
+    else:
+        out = {}
+        if include_id and '_id' in doc and '_id' not in computed:
+            out['_id'] = _clone(doc['_id'])
+        for field in included:
+            values = _get_values(doc, field)
+            if values:
+                _set_path(out, field, _clone(values[0]))
+    for field, expr in computed.items():
+        _set_path(out, field, _clone(_meta_or_eval(expr, doc, meta)))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Indexes and query planning
+# ---------------------------------------------------------------------------
+
+class _Index:
+    """A secondary index: hash buckets for equality plus a sorted list for ranges/order"""
+
+    def __init__(self, name, keys, unique=False, sparse=False, partial_filter=None, options=None):
+        self.name = name
+        self.keys = keys
+        self.fields = [field for field, _ in keys]
+        self.unique = unique
+        self.sparse = sparse
+        self.partial_filter = partial_filter
+        self.options = options or {}
+        self._partial_match = compile_filter(partial_filter) if partial_filter else None
+        self.entries = SortedList()
+        self.buckets = {}
+        self.multikey = False
+
+    @property
+    def complete(self):
+        """Whether every document has an entry, so the index can answer any query"""
+        return not (self.sparse or self.partial_filter)
+
+    def serves(self, equality, in_lists, ranges):
+        """
+        Whether the index holds every document a query with these terms can
+        match. Complete indexes always do; sparse and partial ones only when
+        the query itself implies the index's filter, as mongod requires.
+        """
+        if self.complete:
+            return True
+
+        def non_null(field):
+            if field in equality:
+                return equality[field] is not None
+            if field in in_lists:
+                return None not in in_lists[field]
+            return field in ranges
+
+        if self.sparse and not any(non_null(field) for field in self.fields):
+            return False
+        for field, condition in (self.partial_filter or {}).items():
+            if field.startswith('$'):
+                return False
+            if isinstance(condition, dict):
+                if condition != {'$exists': True} or not non_null(field):
+                    return False
+            elif field not in equality or equality[field] != condition:
+                return False
+        return True
+
+    def keys_for(self, doc):
+        """Index keys for a document; array values fan out into one key per element"""
+        if self._partial_match and not self._partial_match(doc):
+            return []
+        values_per_field = [_get_values(doc, field) for field in self.fields]
+        if all(len(values) == 1 and type(values[0]) is not list for values in values_per_field):
+            return [tuple(_sort_key(values[0]) for values in values_per_field)]
+
+        per_field = []
+        present = False
+        for values in values_per_field:
+            present = present or bool(values)
+            expanded = []
+            for value in values or [None]:
+                if isinstance(value, list):
+                    self.multikey = True
+                    expanded.extend(value or [None])
+                else:
+                    expanded.append(value)
+            per_field.append({_sort_key(v) for v in expanded})
+        if self.sparse and not present:
+            return []
+        return list(itertools.product(*per_field))
+
+    def check_unique(self, doc, id_key, keys=None):
+        if not self.unique:
+            return
+        for key in keys if keys is not None else self.keys_for(doc):
+            holders = self.buckets.get(key)
+            if holders and (len(holders) > 1 or id_key not in holders):
+                dup = dict(zip(self.fields, (k[1] if len(k) > 1 else None for k in key)))
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error index: {self.name} dup key: {dup}",
+                    11000,
+                    {'index': 0, 'code': 11000, 'keyPattern': dict(self.keys), 'keyValue': dup},
+                )
+
+    def add(self, id_key, doc, keys=None):
+        for key in keys if keys is not None else self.keys_for(doc):
+            self.buckets.setdefault(key, set()).add(id_key)
+            self.entries.add(key + (id_key,))
+
+    def add_to_buckets(self, id_key, keys):
+        for key in keys:
+            self.buckets.setdefault(key, set()).add(id_key)
+
+    def add_many(self, pairs):
+        """Bulk-load (id_key, doc) pairs; SortedList.update is much faster than repeated add"""
+        new_entries = []
+        for id_key, doc in pairs:
+            for key in self.keys_for(doc):
+                self.buckets.setdefault(key, set()).add(id_key)
+                new_entries.append(key + (id_key,))
+        self.entries.update(new_entries)
+
+    def load_entries(self, entries):
+        """Bulk-load sorted entries collected by _store(..., pending)"""
+        self.entries.update(entries)
+
+    def remove(self, id_key, doc):
+        for key in self.keys_for(doc):
+            holders = self.buckets.get(key)
+            if holders:
+                holders.discard(id_key)
+                if not holders:
+                    del self.buckets[key]
+            self.entries.discard(key + (id_key,))
+
+    def describe(self):
+        info = {'v': 2, 'key': dict(self.keys), 'name': self.name}
+        if self.unique:
+            info['unique'] = True
+        if self.sparse:
+            info['sparse'] = True
+        if self.partial_filter:
+            info['partialFilterExpression'] = self.partial_filter
+        info.update(self.options)
+        return info
+
+
+# Words $text ignores, as mongod's English stop-word list does
+_STOP_WORDS = frozenset(
+    'a an and are as at be but by for from has have in is it its of on or that the '
+    'this to was were will with'.split()
+)
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+_SEARCH_PATTERN = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def _stem(token):
+    """A deliberately small stemmer: folds plurals so 'interns' finds 'intern'"""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def _text_terms(text):
+    return [_stem(t) for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOP_WORDS]
+
+
+class _TextIndex(_Index):
+    """
+    A $text index: an inverted index from stemmed term to per-document score.
+
+    Scores follow mongod's shape: each field contributes
+    weight * frequency * (0.5 + 0.5 * occurrences / field_terms), summed over
+    the matched terms, so short fields that repeat a term rank highest.
+    """
+
+    def __init__(self, name, keys, weights=None, options=None):
+        super().__init__(name, keys, options=options)
+        self.text_fields = [field for field, kind in keys if kind == 'text']
+        self.weights = {field: (weights or {}).get(field, 1) for field in self.text_fields}
+        # The planner only walks B-tree style indexes; $text comes through search()
+        self.fields = []
+        self.postings = {}
+
+    def keys_for(self, doc):
+        scores = {}
+        for field in self.text_fields:
+            texts = [v for value in _get_values(doc, field)
+                     for v in (value if isinstance(value, list) else [value]) if isinstance(v, str)]
+            terms = [term for text in texts for term in _text_terms(text)]
+            if not terms:
+                continue
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                frequency = sum(0.5 ** i for i in range(count))
+                coefficient = 0.5 + 0.5 * count / len(terms)
+                scores[term] = scores.get(term, 0.0) + self.weights[field] * frequency * coefficient
+        return list(scores.items())
+
+    def add(self, id_key, doc, keys=None):
+        self.add_to_buckets(id_key, keys if keys is not None else self.keys_for(doc))
+
+    def add_to_buckets(self, id_key, keys):
+        for term, score in keys:
+            self.postings.setdefault(term, {})[id_key] = score
+
+    def add_many(self, pairs):
+        for id_key, doc in pairs:
+            self.add_to_buckets(id_key, self.keys_for(doc))
+
+    def load_entries(self, entries):
+        pass
+
+    def remove(self, id_key, doc):
+        for term, _ in self.keys_for(doc):
+            holders = self.postings.get(term)
+            if holders:
+                holders.pop(id_key, None)
+                if not holders:
+                    del self.postings[term]
+
+    def serves(self, equality, in_lists, ranges):
+        return False
+
+    def search(self, spec, docs):
+        """Score every document matching a $text spec; returns {id_key: score}"""
+        query = spec.get('$search', '') if isinstance(spec, dict) else ''
+        terms, excluded, phrases, excluded_phrases = [], set(), [], []
+        for negate_phrase, phrase, negate, word in _SEARCH_PATTERN.findall(query):
+            if phrase:
+                (excluded_phrases if negate_phrase else phrases).append(phrase.lower())
+                terms.extend(_text_terms(phrase))
+            elif negate:
+                excluded.update(_text_terms(word))
+            else:
+                terms.extend(_text_terms(word))
+
+        scores = {}
+        for term in set(terms):
+            for id_key, score in self.postings.get(term, {}).items():
+                scores[id_key] = scores.get(id_key, 0.0) + score
+        for term in excluded:
+            for id_key in self.postings.get(term, {}):
+                scores.pop(id_key, None)
+
+        # Phrases narrow the term matches to documents containing them verbatim
+        if phrases or excluded_phrases:
+            for id_key in list(scores):
+                doc = docs[id_key]
+                text = '\n'.join(
+                    v for field in self.text_fields for value in _get_values(doc, field)
+                    for v in (value if isinstance(value, list) else [value]) if isinstance(v, str)
+                ).lower()
+                if any(p not in text for p in phrases) or any(p in text for p in excluded_phrases):
+                    del scores[id_key]
+        return scores
+
+    def describe(self):
+        info = {
+            'v': 2, 'key': {'_fts': 'text', '_ftsx': 1}, 'name': self.name,
+            'weights': dict(self.weights), 'default_language': 'english',
+            'language_override': 'language', 'textIndexVersion': 3,
+        }
+        info.update({k: v for k, v in self.options.items() if k not in ('weights', 'default_language')})
+        return info
+
+
+class _Plan:
+    def __init__(self, stage, candidates, ordered=False, index=None, direction='forward', estimate=0):
+        self.stage = stage
+        self.candidates = candidates
+        self.ordered = ordered
+        self.index = index
+        self.direction = direction
+        self.estimate = estimate
+
+
+def _range_bounds(prefix, range_ops):
+    """Lower/upper bounds in a sorted index for an equality prefix plus one range"""
+    lower, upper = prefix, prefix + (_MAX_KEY,)
+    if not range_ops:
+        return lower, upper
+    ranks = set()
+    for op, value in range_ops.items():
+        key = _sort_key(value)
+        ranks.add(key[0])
+        if op == '$gt':
+            lower = prefix + (key, _MAX_KEY)
+        elif op == '$gte':
+            lower = prefix + (key,)
+        elif op == '$lt':
+            upper = prefix + (key,)
+        elif op == '$lte':
+            upper = prefix + (key, _MAX_KEY)
+    # Type bracketing: a numeric range never matches strings and vice versa
+    rank = min(ranks)
+    if '$gt' not in range_ops and '$gte' not in range_ops:
+        lower = prefix + ((rank,),)
+    if '$lt' not in range_ops and '$lte' not in range_ops:
+        upper = prefix + ((rank + 0.5,),)
+    return lower, upper
+
+
+# ---------------------------------------------------------------------------
+# Collections, cursors, databases, client
+# ---------------------------------------------------------------------------
+
+class MemoryCursor:
+    """The subset of pymongo.cursor.Cursor the app uses, evaluated lazily"""
+
+    def __init__(self, collection, filter=None, projection=None, skip=0, limit=0,
+                 sort=None, batch_size=0, **kwargs):
+        self._collection = collection
+        self._filter = filter or {}
+        self._projection = projection
+        self._skip = skip
+        self._limit = limit
+        self._sort = _normalize_sort(sort)
+        self._batch_size = batch_size
+        self._results = None
+        self._killed = False
+
+    def _check_unstarted(self):
+        if self._results is not None:
+            raise OperationFailure("cannot set options after executing query")
+
+    def sort(self, key_or_list, direction=None):
+        self._check_unstarted()
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip):
+        self._check_unstarted()
+        self._skip = skip
+        return self
+
+    def limit(self, limit):
+        self._check_unstarted()
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size):
+        self._batch_size = batch_size
+        return self
+
+    def max_time_ms(self, max_time_ms):
+        return self
+
+    def hint(self, index):
+        return self
+
+    def collation(self, collation):
+        return self
+
+    def _execute(self):
+        docs, meta, _ = self._collection._select(
+            self._filter, self._sort, self._skip, self._limit
+        )
+        projection = self._projection
+        self._results = (_project(doc, projection, meta) for doc in docs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._killed:
+            raise StopIteration
+        if self._results is None:
+            self._execute()
+        return next(self._results)
+
+    next = __next__
+
+    @property
+    def alive(self):
+        return not self._killed
+
+    def to_list(self, length=None):
+        return list(itertools.islice(self, length))
+
+    def clone(self):
+        return MemoryCursor(self._collection, self._filter, self._projection, self._skip,
+                            self._limit, self._sort, self._batch_size)
+
+    def rewind(self):
+        self._results = None
+        self._killed = False
+        return self
+
+    def close(self):
+        self._killed = True
+
+    def explain(self):
+        return self._collection._explain(self._filter, self._sort, self._limit)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryCommandCursor:
+    """Iterator over aggregation results, shaped like pymongo's CommandCursor"""
+
+    def __init__(self, docs):
+        self._iter = iter(docs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iter)
+
+    next = __next__
+
+    def batch_size(self, batch_size):
+        return self
+
+    def to_list(self, length=None):
+        return list(itertools.islice(self, length))
+
+    def close(self):
+        self._iter = iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryCollection:
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self.full_name = f"{database.name}.{name}"
+        self._docs = {}
+        self._indexes = {}
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"MemoryCollection({self.full_name!r})"
+
+    def with_options(self, **kwargs):
+        return self
+
+    # -- internals ---------------------------------------------------------
+
+    def _store(self, doc, pending=None):
+        """
+        Insert a normalized document, enforcing every unique index first.
+        With `pending`, sorted-index entries are collected there for one bulk
+        load instead of being added one at a time.
+        """
+        if '_id' not in doc:
+            doc['_id'] = ObjectId()
+        id_key = _sort_key(doc['_id'])
+        if id_key in self._docs:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.full_name} index: _id_ dup key: {{ _id: {doc['_id']!r} }}",
+                11000,
+                {'index': 0, 'code': 11000, 'keyPattern': {'_id': 1}, 'keyValue': {'_id': doc['_id']}},
+            )
+        keys = {name: index.keys_for(doc) for name, index in self._indexes.items()}
+        for name, index in self._indexes.items():
+            index.check_unique(doc, id_key, keys[name])
+        self._docs[id_key] = doc
+        for name, index in self._indexes.items():
+            if pending is None:
+                index.add(id_key, doc, keys[name])
+            else:
+                index.add_to_buckets(id_key, keys[name])
+                pending.setdefault(name, []).extend(key + (id_key,) for key in keys[name])
+        self.database._mark_created(self.name)
+        return doc['_id']
+
+    def _replace(self, old, new):
+        id_key = _sort_key(old['_id'])
+        for index in self._indexes.values():
+            index.remove(id_key, old)
+        try:
+            for index in self._indexes.values():
+                index.check_unique(new, id_key)
+        except DuplicateKeyError:
+            for index in self._indexes.values():
+                index.add(id_key, old)
+            raise
+        self._docs[id_key] = new
+        for index in self._indexes.values():
+            index.add(id_key, new)
+
+    def _remove(self, doc):
+        id_key = _sort_key(doc['_id'])
+        del self._docs[id_key]
+        for index in self._indexes.values():
+            index.remove(id_key, doc)
+
+    def _plan(self, filter_doc, sort_spec):
+        """Choose an access path for a query, the way mongod's planner would"""
+        filter_doc = filter_doc or {}
+        equality, in_lists, ranges = _index_usable_terms(filter_doc)
+
+        if '_id' in equality:
+            key = _sort_key(equality['_id'])
+            return _Plan('IDHACK', [key] if key in self._docs else [], ordered=True, estimate=1)
+        if '_id' in in_lists:
+            keys = [_sort_key(v) for v in in_lists['_id']]
+            return _Plan('IXSCAN', [k for k in keys if k in self._docs], index='_id_', estimate=len(keys))
+
+        requested_sort = sort_spec or []
+        # Text-score ($meta) sorts can never come from a B-tree walk
+        sort_spec = None if any(isinstance(d, dict) for _, d in requested_sort) else requested_sort
+        tie_break = None
+        core = list(sort_spec or [])
+        if core and core[-1][0] == '_id':
+            tie_break = core.pop()[1]
+
+        best = None
+        for index in self._indexes.values():
+            if not index.fields or not index.serves(equality, in_lists, ranges):
+                continue
+            prefix_len = 0
+            while prefix_len < len(index.fields) and index.fields[prefix_len] in equality:
+                prefix_len += 1
+            prefix = tuple(_sort_key(equality[f]) for f in index.fields[:prefix_len])
+            rest = index.fields[prefix_len:]
+            range_ops = ranges.get(rest[0]) if rest else None
+
+            # Can walking this index produce the requested order?
+            ordered, descending = False, False
+            wanted = [(f, d) for f, d in core if f not in equality]
+            if sort_spec is not None and not index.multikey:
+                directions = {d for _, d in wanted} | ({tie_break} if tie_break is not None else set())
+                wanted_fields = [f for f, _ in wanted]
+                if tie_break is not None and rest[len(wanted_fields):len(wanted_fields) + 1] == ['_id']:
+                    wanted_fields.append('_id')
+                fields_match = wanted_fields == rest[:len(wanted_fields)]
+                # Entries with equal keys are stored in _id order, so an _id
+                # tie-break is free once the sort covers the whole key
+                covers_ties = tie_break is None or len(wanted_fields) == len(rest)
+                if fields_match and covers_ties and len(directions) <= 1:
+                    ordered = True
+                    descending = directions == {-1}
+
+            if prefix_len:
+                lower, upper = _range_bounds(prefix, range_ops)
+                candidates = [(lower, upper)]
+            elif index.fields[0] in in_lists:
+                candidates = [
+                    _range_bounds((_sort_key(v),), None) for v in in_lists[index.fields[0]]
+                ]
+                ordered = ordered and len(candidates) <= 1
+            elif range_ops:
+                candidates = [_range_bounds((), range_ops)]
+            elif ordered and sort_spec:
+                candidates = [((), (_MAX_KEY,))]
+            else:
+                continue
+
+            estimate = sum(
+                index.entries.bisect_left(upper) - index.entries.bisect_left(lower)
+                for lower, upper in candidates
+            )
+            score = (estimate, 0 if ordered else 1, -prefix_len)
+            if best is None or score < best[0]:
+                best = (score, index, candidates, ordered, descending, estimate)
+
+        if best is None:
+            return _Plan('COLLSCAN', list(self._docs), ordered=not requested_sort, estimate=len(self._docs))
+
+        _, index, bounds, ordered, descending, estimate = best
+        def candidates():
+            seen = set() if index.multikey or len(bounds) > 1 else None
+            for lower, upper in bounds:
+                for entry in index.entries.irange(lower, upper, inclusive=(True, False), reverse=descending):
+                    id_key = entry[-1]
+                    if seen is not None:
+                        if id_key in seen:
+                            continue
+                        seen.add(id_key)
+                    yield id_key
+
+        return _Plan('IXSCAN', candidates(), ordered=ordered or not requested_sort, index=index.name,
+                     direction='backward' if descending else 'forward', estimate=estimate)
+
+    def _text_index(self):
+        for index in self._indexes.values():
+            if isinstance(index, _TextIndex):
+                return index
+        raise OperationFailure("text index required for $text query", 27)
+
+    def _select(self, filter_doc, sort_spec, skip=0, limit=0):
+        """Run a query; returns (documents, text-score map, plan)"""
+        filter_doc = filter_doc or {}
+        text_spec = filter_doc.get('$text')
+        if text_spec is not None:
+            filter_doc = {k: v for k, v in filter_doc.items() if k != '$text'}
+        match = compile_filter(filter_doc)
+        scores, meta = None, None
+        with self._lock:
+            if text_spec is not None:
+                # $text always runs off the inverted index, then the rest of the filter
+                index = self._text_index()
+                scores = index.search(text_spec, self._docs)
+                plan = _Plan('TEXT', list(scores), ordered=not sort_spec, index=index.name, estimate=len(scores))
+                meta = {}
+            else:
+                plan = self._plan(filter_doc, sort_spec)
+            needed = skip + limit if limit and plan.ordered else None
+            docs = []
+            for id_key in plan.candidates:
+                doc = self._docs.get(id_key)
+                if doc is None or not match(doc):
+                    continue
+                docs.append(doc)
+                if scores is not None:
+                    meta[id(doc)] = scores[id_key]
+                if needed is not None and len(docs) >= needed:
+                    break
+        if sort_spec and not plan.ordered:
+            docs = _sort_docs(docs, sort_spec, meta)
+        if skip or limit:
+            docs = docs[skip:skip + limit if limit else None]
+        return docs, meta, plan
+
+    def _explain(self, filter_doc, sort_spec, limit=0):
+        filter_doc = filter_doc or {}
+        with self._lock:
+            if '$text' in filter_doc:
+                index = self._text_index()
+                plan = _Plan('TEXT', [], ordered=not sort_spec, index=index.name)
+            else:
+                plan = self._plan(filter_doc, sort_spec)
+        if plan.stage == 'TEXT':
+            stage = {
+                'stage': 'TEXT_MATCH',
+                'inputStage': {
+                    'stage': 'TEXT_OR',
+                    'inputStage': {'stage': 'IXSCAN', 'indexName': plan.index,
+                                   'keyPattern': {'_fts': 'text', '_ftsx': 1}},
+                },
+            }
+        elif plan.stage == 'IXSCAN':
+            index = self._indexes.get(plan.index)
+            stage = {
+                'stage': 'FETCH',
+                'inputStage': {
+                    'stage': 'IXSCAN',
+                    'indexName': plan.index,
+                    'keyPattern': dict(index.keys) if index else {'_id': 1},
+                    'isMultiKey': bool(index and index.multikey),
+                    'direction': plan.direction,
+                },
+            }
+        else:
+            stage = {'stage': plan.stage}
+        if sort_spec and not plan.ordered:
+            stage = {'stage': 'SORT', 'sortPattern': dict(sort_spec), 'inputStage': stage}
+        if limit:
+            stage = {'stage': 'LIMIT', 'limitAmount': limit, 'inputStage': stage}
+        return {
+            'queryPlanner': {
+                'namespace': self.full_name,
+                'parsedQuery': filter_doc or {},
+                'winningPlan': stage,
+                'rejectedPlans': [],
+            },
+            'ok': 1.0,
+        }
+
+    # -- reads -------------------------------------------------------------
+
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        return MemoryCursor(self, filter, projection, *args, **kwargs)
+
+    def find_one(self, filter=None, *args, **kwargs):
+        if filter is not None and not isinstance(filter, dict):
+            filter = {'_id': filter}
+        return next(iter(self.find(filter, *args, **kwargs).limit(1)), None)
+
+    def count_documents(self, filter, skip=0, limit=0, **kwargs):
+        if not filter and not skip and not limit:
+            return len(self._docs)
+        docs, _, _ = self._select(filter, None, skip, limit)
+        return len(docs)
+
+    def estimated_document_count(self, **kwargs):
+        return len(self._docs)
+
+    def distinct(self, key, filter=None, **kwargs):
+        docs, _, _ = self._select(filter or {}, None)
+        seen, values = set(), []
+        for value in _expand(v for doc in docs for v in _get_values(doc, key)):
+            if isinstance(value, list):
+                continue
+            sort_key = _sort_key(value)
+            if sort_key not in seen:
+                seen.add(sort_key)
+                values.append(_clone(value))
+        return values
+
+    def aggregate(self, pipeline, **kwargs):
+        pipeline = list(pipeline)
+        # Push a leading $match/$sort/$skip/$limit down into the query planner
+        filter_doc, sort_spec, skip, limit, position = {}, None, 0, 0, 0
+        if position < len(pipeline) and '$match' in pipeline[position]:
+            filter_doc = pipeline[position]['$match']
+            position += 1
+        if position < len(pipeline) and '$sort' in pipeline[position]:
+            sort_spec = _normalize_sort(pipeline[position]['$sort'])
+            position += 1
+            if position < len(pipeline) and '$skip' in pipeline[position]:
+                skip = pipeline[position]['$skip']
+                position += 1
+            if position < len(pipeline) and '$limit' in pipeline[position]:
+                limit = pipeline[position]['$limit']
+                position += 1
+        docs, meta, _ = self._select(filter_doc, sort_spec, skip, limit)
+        results = run_pipeline(docs, pipeline[position:], meta)
+        return MemoryCommandCursor(_clone(doc) for doc in results)
+
+    # -- writes ------------------------------------------------------------
+
+    def insert_one(self, document, **kwargs):
+        doc = _clone(document)
+        with self._lock:
+            inserted_id = self._store(doc)
+        document['_id'] = inserted_id
+        return InsertOneResult(inserted_id, True)
+
+    def insert_many(self, documents, ordered=True, **kwargs):
+        documents = list(documents)
+        inserted_ids, errors, pending = [], [], {}
+        with self._lock:
+            try:
+                for position, document in enumerate(documents):
+                    doc = _clone(document)
+                    try:
+                        inserted_id = self._store(doc, pending)
+                    except DuplicateKeyError as e:
+                        errors.append({'index': position, 'code': 11000, 'errmsg': str(e), 'op': document})
+                        if ordered:
+                            break
+                        continue
+                    document['_id'] = inserted_id
+                    inserted_ids.append(inserted_id)
+            finally:
+                for name, entries in pending.items():
+                    self._indexes[name].load_entries(entries)
+        if errors:
+            raise BulkWriteError({
+                'writeErrors': errors, 'writeConcernErrors': [], 'nInserted': len(inserted_ids),
+                'nUpserted': 0, 'nMatched': 0, 'nModified': 0, 'nRemoved': 0, 'upserted': [],
+            })
+        return InsertManyResult(inserted_ids, True)
+
+    def _update(self, filter_doc, update, upsert=False, multi=False, replace=False):
+        if replace and _is_operator_update(update):
+            raise ValueError("replacement can not include $ operators")
+        if not replace and not _is_operator_update(update):
+            raise ValueError("update only works with $ operators")
+        with self._lock:
+            docs, _, _ = self._select(filter_doc, None, 0, 0 if multi else 1)
+            modified = 0
+            for doc in docs:
+                new_doc = _apply_update(doc, update)
+                if new_doc != doc:
+                    self._replace(doc, new_doc)
+                    modified += 1
+            if docs or not upsert:
+                return {'n': len(docs), 'nModified': modified, 'updatedExisting': bool(docs)}
+            seed = _upsert_seed(filter_doc)
+            if '_id' not in seed:
+                seed['_id'] = update.get('_id', ObjectId()) if replace else ObjectId()
+            new_doc = _apply_update(seed, update, is_insert=True)
+            upserted_id = self._store(new_doc)
+            return {'n': 1, 'nModified': 0, 'upserted': upserted_id, 'updatedExisting': False}
+
+    def update_one(self, filter, update, upsert=False, **kwargs):
+        return UpdateResult(self._update(filter, update, upsert), True)
+
+    def update_many(self, filter, update, upsert=False, **kwargs):
+        return UpdateResult(self._update(filter, update, upsert, multi=True), True)
+
+    def replace_one(self, filter, replacement, upsert=False, **kwargs):
+        return UpdateResult(self._update(filter, replacement, upsert, replace=True), True)
+
+    def delete_one(self, filter, **kwargs):
+        with self._lock:
+            docs, _, _ = self._select(filter, None, 0, 1)
+            for doc in docs:
+                self._remove(doc)
+        return DeleteResult({'n': len(docs)}, True)
+
+    def delete_many(self, filter, **kwargs):
+        with self._lock:
+            docs, _, _ = self._select(filter, None)
+            for doc in docs:
+                self._remove(doc)
+        return DeleteResult({'n': len(docs)}, True)
+
+    def find_one_and_update(self, filter, update, projection=None, sort=None, upsert=False,
+                            return_document=ReturnDocument.BEFORE, **kwargs):
+        with self._lock:
+            docs, _, _ = self._select(filter, _normalize_sort(sort), 0, 1)
+            if docs:
+                before = docs[0]
+                after = _apply_update(before, update)
+                if after != before:
+                    self._replace(before, after)
+            elif upsert:
+                seed = _upsert_seed(filter)
+                seed.setdefault('_id', ObjectId())
+                before = None
+                after = _apply_update(seed, update, is_insert=True)
+                self._store(after)
+            else:
+                return None
+        result = after if return_document == ReturnDocument.AFTER else before
+        return _project(result, projection) if result is not None else None
+
+    def find_one_and_delete(self, filter, projection=None, sort=None, **kwargs):
+        with self._lock:
+            docs, _, _ = self._select(filter, _normalize_sort(sort), 0, 1)
+            if not docs:
+                return None
+            self._remove(docs[0])
+        return _project(docs[0], projection)
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        result = {
+            'writeErrors': [], 'writeConcernErrors': [], 'nInserted': 0, 'nUpserted': 0,
+            'nMatched': 0, 'nModified': 0, 'nRemoved': 0, 'upserted': [],
+        }
+        with self._lock:
+            for position, request in enumerate(requests):
+                try:
+                    if isinstance(request, InsertOne):
+                        doc = _clone(request._doc)
+                        request._doc['_id'] = self._store(doc)
+                        result['nInserted'] += 1
+                    elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                        raw = self._update(
+                            request._filter, request._doc, bool(request._upsert),
+                            multi=isinstance(request, UpdateMany), replace=isinstance(request, ReplaceOne),
+                        )
+                        if 'upserted' in raw:
+                            result['nUpserted'] += 1
+                            result['upserted'].append({'index': position, '_id': raw['upserted']})
+                        else:
+                            result['nMatched'] += raw['n']
+                            result['nModified'] += raw['nModified']
+                    elif isinstance(request, (DeleteOne, DeleteMany)):
+                        method = self.delete_many if isinstance(request, DeleteMany) else self.delete_one
+                        result['nRemoved'] += method(request._filter).deleted_count
+                    else:
+                        raise TypeError(f"{request!r} is not a valid request")
+                except DuplicateKeyError as e:
+                    result['writeErrors'].append({'index': position, 'code': 11000, 'errmsg': str(e)})
+                    if ordered:
+                        break
+        if result['writeErrors']:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # -- indexes -----------------------------------------------------------
+
+    def create_index(self, keys, **kwargs):
+        keys = _normalize_index_keys(keys)
+        name = kwargs.pop('name', None) or '_'.join(f"{field}_{direction}" for field, direction in keys)
+        unique = bool(kwargs.pop('unique', False))
+        sparse = bool(kwargs.pop('sparse', False))
+        partial_filter = kwargs.pop('partialFilterExpression', None)
+        kwargs.pop('background', None)
+        kwargs.pop('session', None)
+        is_text = any(direction == 'text' for _, direction in keys)
+
+        with self._lock:
+            for existing in self._indexes.values():
+                if is_text and isinstance(existing, _TextIndex) and (existing.name, existing.keys) != (name, keys):
+                    raise OperationFailure(
+                        f"Index already exists with a different name: {existing.name}"
+                        " (only one text index per collection is allowed)", 85
+                    )
+                same_spec = (existing.unique, existing.sparse, existing.partial_filter) == (unique, sparse, partial_filter)
+                if existing.name == name:
+                    if existing.keys == keys and same_spec:
+                        return name
+                    raise OperationFailure(
+                        f"An existing index has the same name as the requested index: {name}", 86
+                    )
+                if existing.keys == keys and same_spec:
+                    raise OperationFailure(
+                        f"Index already exists with a different name: {existing.name}", 85
+                    )
+
+            if is_text:
+                index = _TextIndex(name, keys, kwargs.pop('weights', None), kwargs)
+            else:
+                index = _Index(name, keys, unique, sparse, partial_filter, kwargs)
+            if unique:
+                for id_key, doc in self._docs.items():
+                    keys_for_doc = index.keys_for(doc)
+                    index.check_unique(doc, id_key, keys_for_doc)
+                    index.add(id_key, doc, keys_for_doc)
+            else:
+                index.add_many(self._docs.items())
+            self._indexes[name] = index
+            self.database._mark_created(self.name)
+        return name
+
+    def create_indexes(self, indexes, **kwargs):
+        names = []
+        for model in indexes:
+            spec = dict(model.document if isinstance(model, IndexModel) else model)
+            keys = list(spec.pop('key').items())
+            names.append(self.create_index(keys, **spec))
+        return names
+
+    def index_information(self):
+        info = {'_id_': {'v': 2, 'key': [('_id', 1)]}}
+        for index in self._indexes.values():
+            details = index.describe()
+            details['key'] = list(index.keys)
+            details.pop('name')
+            info[index.name] = details
+        return info
+
+    def list_indexes(self, **kwargs):
+        specs = [{'v': 2, 'key': {'_id': 1}, 'name': '_id_'}]
+        specs.extend(index.describe() for index in self._indexes.values())
+        return MemoryCommandCursor(specs)
+
+    def drop_index(self, index_or_name, **kwargs):
+        name = index_or_name
+        if not isinstance(index_or_name, str) or index_or_name not in self._indexes:
+            keys = _normalize_index_keys(index_or_name)
+            name = next((i.name for i in self._indexes.values() if i.keys == keys), index_or_name)
+        with self._lock:
+            if name not in self._indexes:
+                raise OperationFailure(f"index not found with name [{name}]", 27)
+            del self._indexes[name]
+
+    def drop_indexes(self, **kwargs):
+        with self._lock:
+            self._indexes.clear()
+
+    def drop(self, **kwargs):
+        self.database.drop_collection(self.name)
+
+
+class MemoryDatabase:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self._collections = {}
+        self._created = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"MemoryDatabase({self.name!r})"
+
+    def __getitem__(self, name):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.setdefault(name, MemoryCollection(self, name))
+        return collection
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name, **kwargs):
+        return self[name]
+
+    def _mark_created(self, name):
+        self._created.add(name)
+
+    def list_collection_names(self, **kwargs):
+        return sorted(self._created)
+
+    def create_collection(self, name, **kwargs):
+        if name in self._created:
+            raise CollectionInvalid(f"collection {name} already exists")
+        self._mark_created(name)
+        return self[name]
+
+    def drop_collection(self, name, **kwargs):
+        if not isinstance(name, str):
+            name = name.name
+        with self._lock:
+            self._collections.pop(name, None)
+            self._created.discard(name)
+
+    def command(self, command, **kwargs):
+        name = command if isinstance(command, str) else next(iter(command))
+        if name == 'ping':
+            return {'ok': 1.0}
+        if name == 'dbStats':
+            return {
+                'db': self.name,
+                'collections': len(self._created),
+                'objects': sum(len(self[c]._docs) for c in self._created),
+                'ok': 1.0,
+            }
+        raise OperationFailure(f"no such command: '{name}'", 59)
+
+
+class MemoryClient:
+    """Drop-in for pymongo.MongoClient backed by in-process storage"""
+
+    def __init__(self, uri='memory://', **kwargs):
+        self._uri = uri
+        self._databases = {}
+        self._lock = threading.Lock()
+        # memory:///name selects the default database, as a mongodb:// path would
+        path = uri.split('://', 1)[-1].split('/', 1)
+        self._default_db = path[1].split('?')[0] if len(path) > 1 and path[1] else None
+
+    def __repr__(self):
+        return f"MemoryClient({self._uri!r})"
+
+    def __getitem__(self, name):
+        database = self._databases.get(name)
+        if database is None:
+            with self._lock:
+                database = self._databases.setdefault(name, MemoryDatabase(self, name))
+        return database
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_database(self, name=None, **kwargs):
+        return self[name or self._default_db or 'test']
+
+    def get_default_database(self, default=None, **kwargs):
+        return self[self._default_db or default or 'test']
+
+    def list_database_names(self, **kwargs):
+        return [name for name, db in self._databases.items() if db._created]
+
+    def drop_database(self, name, **kwargs):
+        if not isinstance(name, str):
+            name = name.name
+        with self._lock:
+            self._databases.pop(name, None)
+
+    def server_info(self, **kwargs):
+        return {'version': '7.0.0', 'storageEngine': 'memory', 'ok': 1.0}
+
+    def close(self):
+        pass
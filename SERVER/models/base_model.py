@@ -0,0 +1,186 @@
+# models/base_model.py
+import os
+import re
+from dotenv import load_dotenv
+from pymongo.errors import OperationFailure
+from database.db_connection import get_db_connection, get_mongo_client
+from utils.fieldsets import resolve_projection
+from utils.pagination import (
+    APPROXIMATE_COUNT_LIMIT, DEFAULT_PAGE_SIZE, LISTING_SORT, SEARCH_SORT,
+    InvalidCursor, encode_cursor, keyset_filter
+)
+from utils.streaming import STREAM_BATCH_SIZE
+
+load_dotenv()
+
+class BaseMongoModel:
+    """
+    Base class for models backed by a single MongoDB collection.
+
+    All models share the process-wide client from database.db_connection,
+    and nothing touches the network until the collection is first used, so
+    building a model (even at import time) is free.
+    """
+    # Environment variable that overrides the collection name, and its default
+    collection_env = None
+    default_collection = None
+    default_db_name = 'resume_processor_db'
+
+    # Fields clients may ask for with ?fields=, and the named ?profile= sets
+    FIELDS = ()
+    FIELD_PROFILES = {}
+
+    def __init__(self, collection_name=None, db_name=None):
+        self.db_name = db_name or os.getenv('DB_NAME', self.default_db_name)
+        self.collection_name = collection_name or (
+            os.getenv(self.collection_env, self.default_collection)
+            if self.collection_env else self.default_collection
+        )
+        self._collection = None
+        # Set once a text index is seen; until then '$text' searches are checked first
+        self._text_index = False
+
+    @property
+    def client(self):
+        return get_mongo_client()
+
+    @property
+    def db(self):
+        return get_db_connection(self.db_name)
+
+    @property
+    def collection(self):
+        """The model's collection, resolved on first access"""
+        client = get_mongo_client()
+        # Re-resolve if the registry built a new client (e.g. after fork)
+        if self._collection is None or self._collection.database.client is not client:
+            self._collection = client[self.db_name][self.collection_name]
+        return self._collection
+
+    def projection(self, fields=None, profile=None, default='list'):
+        """Mongo projection for a ?fields= / ?profile= request (see utils/fieldsets.py)"""
+        return resolve_projection(self.FIELDS, self.FIELD_PROFILES, fields, profile, default)
+
+    def _has_text_index(self):
+        if not self._text_index:
+            self._text_index = any('textIndexVersion' in spec
+                                   for spec in self.collection.index_information().values())
+        return self._text_index
+
+    def search_filters(self, filters):
+        """
+        `filters` as they can run now. While the collection has no text index
+        (init_database still building it, or the build failed) a '$text'
+        search becomes a case-insensitive match of the escaped term in the
+        title, as ?title= used to be, instead of an OperationFailure.
+        """
+        if not filters or '$text' not in filters or self._has_text_index():
+            return filters
+        filters = dict(filters)
+        term = filters.pop('$text')['$search']
+        filters['title'] = {'$regex': re.escape(term), '$options': 'i'}
+        return filters
+
+    def find_page(self, filters, projection=None, per_page=DEFAULT_PAGE_SIZE, cursor=None, page=None):
+        """
+        One page of documents, newest first by (scraped_at, _id).
+
+        With `cursor` (a token from a previous page) the page is found by
+        keyset seek, so deep pages cost the same as the first one. Without it,
+        `page` falls back to offset pagination. Returns (documents, next_cursor);
+        next_cursor is None on the last page.
+        """
+        query = filters
+        if cursor:
+            position = keyset_filter(cursor)
+            query = {'$and': [filters, position]} if filters else position
+
+        results = self.collection.find(query, projection).sort(LISTING_SORT)
+        if page and not cursor:
+            results = results.skip((page - 1) * per_page)
+
+        # One extra document tells us whether another page exists
+        documents = list(results.limit(per_page + 1))
+        has_more = len(documents) > per_page
+        documents = documents[:per_page]
+        next_cursor = encode_cursor(documents[-1]) if has_more else None
+        return documents, next_cursor
+
+    def find_page_with_total(self, filters, projection=None, per_page=DEFAULT_PAGE_SIZE,
+                             cursor=None, page=None, approximate=False):
+        """
+        Like find_page, but also returns the total number of matches, in a
+        single round trip: the page and the count are two $facet branches over
+        one indexed $match + $sort. Without filters the total comes from
+        collection metadata (estimated_document_count) instead.
+
+        A '$text' filter switches to relevance order: documents gain a
+        'score' field and pages are addressed by `page` only.
+
+        With `approximate`, counting stops at APPROXIMATE_COUNT_LIMIT.
+        Returns (documents, total, next_cursor, total_is_estimate).
+        """
+        filters = self.search_filters(filters)
+        try:
+            return self._find_page_with_total(filters, projection, per_page, cursor, page, approximate)
+        except OperationFailure:
+            if '$text' not in (filters or {}):
+                raise
+            # The text index has gone since it was seen; search titles instead
+            self._text_index = False
+            return self._find_page_with_total(self.search_filters(filters), projection, per_page,
+                                              cursor, page, approximate)
+
+    def _find_page_with_total(self, filters, projection, per_page, cursor, page, approximate):
+        text_search = '$text' in (filters or {})
+        if text_search and cursor:
+            raise InvalidCursor("Search results are paged with ?page=, not a cursor")
+        if text_search and projection:
+            projection = {**projection, 'score': {'$meta': 'textScore'}}
+
+        if not filters:
+            documents, next_cursor = self.find_page(
+                filters, projection, per_page=per_page, cursor=cursor, page=page
+            )
+            return documents, self.collection.estimated_document_count(), next_cursor, True
+
+        data_stages = []
+        if cursor:
+            data_stages.append({'$match': keyset_filter(cursor)})
+        elif page and page > 1:
+            data_stages.append({'$skip': (page - 1) * per_page})
+        # One extra document tells us whether another page exists
+        data_stages.append({'$limit': per_page + 1})
+        if projection:
+            data_stages.append({'$project': projection})
+
+        total_stages = [{'$count': 'n'}]
+        if approximate:
+            total_stages.insert(0, {'$limit': APPROXIMATE_COUNT_LIMIT})
+
+        pipeline = [
+            {'$match': filters},
+            {'$sort': SEARCH_SORT if text_search else dict(LISTING_SORT)},
+            {'$facet': {'data': data_stages, 'total': total_stages}},
+        ]
+        result = next(iter(self.collection.aggregate(pipeline, allowDiskUse=True)), None) or {}
+
+        documents = result.get('data', [])
+        has_more = len(documents) > per_page
+        documents = documents[:per_page]
+        next_cursor = encode_cursor(documents[-1]) if has_more and not text_search else None
+        total = result['total'][0]['n'] if result.get('total') else 0
+        return documents, total, next_cursor, approximate and total >= APPROXIMATE_COUNT_LIMIT
+
+    def iter_documents(self, filters, projection=None, limit=0, batch_size=STREAM_BATCH_SIZE):
+        """
+        A lazily evaluated cursor over every match, newest first. Meant for
+        streaming responses: documents are pulled from the server
+        `batch_size` at a time rather than materialised as a list.
+        """
+        results = self.collection.find(self.search_filters(filters), projection)
+        results = results.sort(LISTING_SORT).batch_size(batch_size)
+        if limit:
+            results = results.limit(limit)
+        return results
+
@@ -1,117 +1,101 @@
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from bson import ObjectId
-import os
-from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+from models.base_model import BaseMongoModel
+from models.listing_rollup_model import ListingRollupModel
+from services.listing_normalizer import NORMALIZED_FIELDS
+from utils.fieldsets import CARD_FIELDS, fieldset
+from utils.pagination import DEFAULT_PAGE_SIZE, LISTING_SORT
+from utils.response_cache import bump_version
 
-load_dotenv()
+class InternshalaInternshipModel(BaseMongoModel):
+    collection_env = 'INTERNSHALA_COLLECTION_NAME'
+    default_collection = 'internshala'
 
-class InternshalaInternshipModel:
-    def __init__(self):
-        db_name = os.getenv('DB_NAME', 'resume_processor_db')
-        collection_name = os.getenv('INTERNSHALA_COLLECTION_NAME', 'internshala')
-        
-        # Try Atlas first, then fallback to local
-        atlas_uri = os.getenv('MONGO_URI_ATLAS')
-        local_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
-        
-        self.client = None
-        
-        # Try Atlas connection first
-        if atlas_uri:
-            try:
-                print("Attempting to connect to MongoDB Atlas...")
-                self.client = MongoClient(atlas_uri, serverSelectionTimeoutMS=5000)
-                # Test the connection
-                self.client.admin.command('ping')
-                print("Successfully connected to MongoDB Atlas")
-            except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-                print(f"Atlas connection failed: {e}")
-                self.client = None
-        
-        # Fallback to local MongoDB
-        if not self.client:
-            try:
-                print("Attempting to connect to local MongoDB...")
-                self.client = MongoClient(local_uri, serverSelectionTimeoutMS=5000)
-                # Test the connection
-                self.client.admin.command('ping')
-                print("Successfully connected to local MongoDB")
-            except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-                print(f"Local MongoDB connection failed: {e}")
-                raise Exception("Could not connect to any MongoDB instance. Please ensure MongoDB is running locally or Atlas is accessible.")
-        
-        self.db = self.client[db_name]
-        self.collection = self.db[collection_name]
+    def __init__(self, collection_name=None, db_name=None):
+        super().__init__(collection_name, db_name)
+        # Statistics are kept pre-aggregated next to the listings
+        self.rollups = ListingRollupModel(db_name=self.db_name)
 
-    def find_internships(self, filters):
-        total_count = self.collection.count_documents(filters)
-        cursor = self.collection.find(
+    # Fields returned by the list endpoints
+    LIST_PROJECTION = {
+        '_id': 1,
+        'title': 1,
+        'company': 1,
+        'location': 1,
+        'applicants': 1,
+        'days_left': 1,
+        'skills': 1,
+        'category': 1,
+        'apply_link': 1,
+        'stipend': 1,
+        'scraped_at': 1,
+        'stipend_min': 1,
+        'stipend_max': 1,
+        'applicants_count': 1,
+        'deadline': 1,
+        'duration_weeks': 1,
+    }
+
+    # Everything a client may request with ?fields=
+    FIELDS = ('internship_id', 'title', 'company', 'location', 'stipend', 'duration', 'apply_link',
+              'category', 'applicants', 'days_left', 'skills', 'scraped_at') + NORMALIZED_FIELDS
+    FIELD_PROFILES = {
+        'card': fieldset(CARD_FIELDS),
+        'list': LIST_PROJECTION,
+        'detail': fieldset(FIELDS),
+    }
+
+    def find_internships(self, filters, per_page=DEFAULT_PAGE_SIZE, cursor=None, page=None, approximate=False,
+                         projection=None):
+        documents, total_count, next_cursor, estimated = self.find_page_with_total(
             filters,
-            {
-                '_id': 1,
-                'title': 1,
-                'company': 1,
-                'location': 1,
-                'applicants': 1,
-                'days_left': 1,
-                'skills': 1,
-                'category': 1,
-                'apply_link': 1,
-                "stipend": 1,
-            }
+            projection or self.LIST_PROJECTION,
+            per_page=per_page,
+            cursor=cursor,
+            page=page,
+            approximate=approximate
         )
-        internships = []
-        for doc in cursor:
-            doc['_id'] = str(doc['_id'])
-            internships.append(doc)
-        return internships, total_count
+        return documents, total_count, next_cursor, estimated
 
-    def find_by_id(self, internship_id):
+    def find_by_id(self, internship_id, projection=None):
         try:
-            obj_id = ObjectId(internship_id)
-            internship = self.collection.find_one({'_id': obj_id})
-            if internship:
-                internship['_id'] = str(internship['_id'])
-            return internship
+            return self.collection.find_one(
+                {'_id': ObjectId(internship_id)}, projection or self.FIELD_PROFILES['detail']
+            )
         except Exception:
             return None
 
     def get_statistics(self):
-        stats = {
-            'total_count': self.collection.count_documents({}),
-            'by_category': [],
-            'by_company': [],
-            'days_left_distribution': []
-        }
-
-        pipeline = [
-            {'$group': {'_id': '$category', 'count': {'$sum': 1}}},
-            {'$sort': {'count': -1}}
-        ]
-        stats['by_category'] = list(self.collection.aggregate(pipeline))
+        """Totals, category/company histograms and days-left buckets, read from the rollups"""
+        return self.rollups.get_statistics(self)
 
-        pipeline = [
-            {'$group': {'_id': '$company', 'count': {'$sum': 1}}},
-            {'$sort': {'count': -1}},
-            {'$limit': 10}
-        ]
-        stats['by_company'] = list(self.collection.aggregate(pipeline))
-
-        pipeline = [
-            {'$group': {'_id': '$days_left', 'count': {'$sum': 1}}},
-            {'$sort': {'_id': 1}}
-        ]
-        stats['days_left_distribution'] = list(self.collection.aggregate(pipeline))
-
-        return stats
+    def insert_listings(self, listings):
+        """
+        Insert new listings in one unordered batch, count them into the
+        statistics rollups and invalidate cached responses. The unique
+        internship_id index rejects anything a concurrent scrape saved in the
+        meantime; the rest are kept. Returns the number saved.
+        """
+        if not listings:
+            return 0
+        try:
+            self.collection.insert_many(listings, ordered=False)
+            failed = set()
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(err.get('code') != 11000 for err in errors):
+                raise
+            failed = {err['index'] for err in errors}
+        saved = [listing for i, listing in enumerate(listings) if i not in failed]
+        self.rollups.apply(self.collection_name, added=saved)
+        if saved:
+            bump_version(self.collection_name)
+        return len(saved)
 
     def get_internships_by_category(self, category):
         """Get internships by category"""
         try:
-            filters = {'category': category}
-            internships, total_count = self.find_internships(filters)
-            return internships
+            return list(self.collection.find({'category': category}, self.LIST_PROJECTION).sort(LISTING_SORT))
         except Exception as e:
             print(f"Error getting internships by category: {str(e)}")
             return []
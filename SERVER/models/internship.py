@@ -1,11 +1,8 @@
-from pymongo import MongoClient
+from models.base_model import BaseMongoModel
 
 
-class InternshipModel:
-    def __init__(self):
-        self.client = MongoClient('mongodb://localhost:27017/')
-        self.db = self.client['resume_processor_db']
-        self.collection = self.db['internships']
+class InternshipModel(BaseMongoModel):
+    default_collection = 'internships'
     
     def insert_internship(self, internship_data):
         """Insert a new internship into the database"""
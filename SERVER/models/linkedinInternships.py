@@ -1,90 +1,203 @@
-from pymongo import MongoClient
+import hashlib
+import re
 from bson import ObjectId
-import os
-from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from models.base_model import BaseMongoModel
+from models.listing_rollup_model import ListingRollupModel, ROLLUP_PROJECTION
+from services.listing_normalizer import NORMALIZED_FIELDS
+from utils.fieldsets import CARD_FIELDS, fieldset
+from utils.pagination import DEFAULT_PAGE_SIZE
+from utils.response_cache import bump_version
 
-# Load environment variables
-load_dotenv()
+# linkedin.com/jobs/view/<slug>-<id>/ or ...?currentJobId=<id>
+_JOB_ID_PATTERN = re.compile(r'(?:/jobs/view/(?:[^/?#]*-)?|[?&]currentJobId=)(\d+)')
+# Stored in place of a missing location; keyed the same as no location
+_NO_LOCATION = 'not specified'
 
-class LinkedInInternshipModel:
-    def __init__(self):
-        # MongoDB Configuration
-        mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
-        db_name = os.getenv('DB_NAME', 'resume_processor_db')
-        collection_name = os.getenv('LINKEDIN_COLLECTION_NAME', 'linkedin')  # Separate collection
+class LinkedInInternshipModel(BaseMongoModel):
+    # Separate collection from Internshala listings
+    collection_env = 'LINKEDIN_COLLECTION_NAME'
+    default_collection = 'linkedin'
 
-        # Connect to MongoDB
-        self.client = MongoClient(mongo_uri)
-        self.db = self.client[db_name]
-        self.collection = self.db[collection_name]
+    def __init__(self, collection_name=None, db_name=None):
+        super().__init__(collection_name, db_name)
+        # Statistics are kept pre-aggregated next to the listings
+        self.rollups = ListingRollupModel(db_name=self.db_name)
 
-    def find_internships(self, filters):
-        """Find all LinkedIn internships with optional filters (no pagination)"""
-        total_count = self.collection.count_documents(filters)
+    # Fields returned by the list endpoints
+    LIST_PROJECTION = {
+        '_id': 1,
+        'title': 1,
+        'company': 1,
+        'location': 1,
+        'applicants': 1,
+        'days_left': 1,
+        'skills': 1,
+        'category': 1,
+        'apply_link': 1,
+        'stipend': 1,
+        'scraped_at': 1,
+        'stipend_min': 1,
+        'stipend_max': 1,
+        'applicants_count': 1,
+        'deadline': 1,
+        'duration_weeks': 1,
+    }
 
-        cursor = self.collection.find(
+    # Everything a client may request; internal keys (listing_key) stay out
+    FIELDS = ('title', 'company', 'location', 'apply_link', 'category', 'usertype', 'quick_apply',
+              'passing_year', 'stipend', 'scraped_at') + NORMALIZED_FIELDS
+    FIELD_PROFILES = {
+        'card': fieldset(CARD_FIELDS),
+        'list': LIST_PROJECTION,
+        'detail': fieldset(FIELDS),
+    }
+
+    # Fields a re-scrape may change; everything else is written once on insert
+    MUTABLE_FIELDS = ('title', 'company', 'location', 'apply_link', 'category',
+                      'usertype', 'quick_apply', 'passing_year', 'stipend') + NORMALIZED_FIELDS
+
+    @staticmethod
+    def listing_key(title, company, location=None, link=None):
+        """
+        Stable natural key for a listing: LinkedIn's job id when the link
+        carries one, otherwise a hash of title, company and location. A
+        missing location, '' and the stored "Not specified" hash the same.
+        """
+        match = _JOB_ID_PATTERN.search(link or '')
+        if match:
+            return f"li:{match.group(1)}"
+        parts = [(value or '').strip().lower() for value in (title, company, location)]
+        if parts[2] == _NO_LOCATION:
+            parts[2] = ''
+        return 'h:' + hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def upsert_listings(self, listings):
+        """
+        Write a scraped batch in one unordered bulk_write of upserts keyed on
+        listing_key, invalidating cached responses if anything changed.
+        Returns {'inserted', 'updated', 'unchanged'} counts.
+        """
+        if not listings:
+            return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+        operations, keys = [], []
+        for listing in listings:
+            key = listing.get('listing_key') or self.listing_key(
+                listing.get('title'), listing.get('company'), listing.get('location'), listing.get('apply_link')
+            )
+            mutable = {field: listing[field] for field in self.MUTABLE_FIELDS if field in listing}
+            first_seen = {field: value for field, value in listing.items()
+                          if field not in mutable and field not in ('_id', 'listing_key')}
+            keys.append(key)
+            operations.append(UpdateOne(
+                {'listing_key': key},
+                {'$set': mutable, '$setOnInsert': first_seen},
+                upsert=True
+            ))
+
+        # Current rollup fields of listings already stored, so a re-scrape that
+        # moves one to another category/company/deadline can be re-counted
+        previous = {
+            doc['listing_key']: doc
+            for doc in self.collection.find({'listing_key': {'$in': keys}}, {'listing_key': 1, **ROLLUP_PROJECTION})
+        }
+
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            details, retry = result.bulk_api_result, []
+        except BulkWriteError as e:
+            # Two scrapes upserting the same new key race on the unique index;
+            # the loser's op will match the winner's document on a second try.
+            details = e.details
+            retry = [error['index'] for error in details.get('writeErrors', [])
+                     if error.get('code') == 11000]
+            other_errors = len(details.get('writeErrors', [])) - len(retry)
+            if other_errors:
+                print(f"[WARNING] {other_errors} LinkedIn listings could not be written")
+
+        inserted_at = {upsert['index'] for upsert in details.get('upserted', [])}
+        matched = details.get('nMatched', 0)
+        modified = details.get('nModified', 0)
+        if retry:
+            second = self.collection.bulk_write([operations[i] for i in retry], ordered=False)
+            inserted_at.update(retry[i] for i in second.upserted_ids)
+            matched += second.matched_count
+            modified += second.modified_count
+
+        added, removed = [], []
+        for i, (key, listing) in enumerate(zip(keys, listings)):
+            if i in inserted_at:
+                added.append(listing)
+            elif key in previous and self._rollup_fields(previous[key]) != self._rollup_fields(listing):
+                removed.append(previous[key])
+                added.append(listing)
+        self.rollups.apply(self.collection_name, added=added, removed=removed)
+        if inserted_at or modified:
+            bump_version(self.collection_name)
+
+        return {'inserted': len(inserted_at), 'updated': modified, 'unchanged': matched - modified}
+
+    @staticmethod
+    def _rollup_fields(listing):
+        return tuple(listing.get(field) for field in ROLLUP_PROJECTION)
+
+    def backfill_listing_keys(self):
+        """
+        Give listings saved before listing_key existed their key. When two old
+        documents map to the same key only the oldest keeps it, so the unique
+        index can still be built; the rest are reported for cleanup.
+        """
+        # Keys already taken, read once rather than looked up per document
+        seen = {doc['listing_key'] for doc in self.collection.find({'listing_key': {'$exists': True}},
+                                                                   {'_id': 0, 'listing_key': 1})}
+        updated, duplicates = 0, 0
+        pending = self.collection.find(
+            {'listing_key': {'$exists': False}},
+            {'title': 1, 'company': 1, 'location': 1, 'apply_link': 1}
+        ).sort('_id', 1)
+        operations = []
+        for doc in pending:
+            key = self.listing_key(doc.get('title'), doc.get('company'), doc.get('location'), doc.get('apply_link'))
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            operations.append(UpdateOne({'_id': doc['_id']}, {'$set': {'listing_key': key}}))
+            if len(operations) >= 500:
+                updated += self.collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += self.collection.bulk_write(operations, ordered=False).modified_count
+        if updated:
+            bump_version(self.collection_name)
+        return {'updated': updated, 'duplicates': duplicates}
+
+    def find_internships(self, filters, per_page=DEFAULT_PAGE_SIZE, cursor=None, page=None, approximate=False,
+                         projection=None):
+        """Find one page of LinkedIn internships, and the total, in one query"""
+        documents, total_count, next_cursor, estimated = self.find_page_with_total(
             filters,
-            {
-                '_id': 1,
-                'title': 1,
-                'company': 1,
-                'location': 1,
-                'applicants': 1,
-                'days_left': 1,
-                'skills': 1,
-                'category': 1,
-                'apply_link': 1,
-            }
+            projection or self.LIST_PROJECTION,
+            per_page=per_page,
+            cursor=cursor,
+            page=page,
+            approximate=approximate
         )
 
-        internships = []
-        for doc in cursor:
-            doc['_id'] = str(doc['_id'])  # Convert ObjectId to string
-            internships.append(doc)
-
-        return internships, total_count
+        return documents, total_count, next_cursor, estimated
 
 
-    def find_by_id(self, internship_id):
+    def find_by_id(self, internship_id, projection=None):
         """Find a LinkedIn internship by its ID"""
         try:
-            object_id = ObjectId(internship_id)
-            internship = self.collection.find_one({'_id': object_id})
-            if internship:
-                internship['_id'] = str(internship['_id'])
-            return internship
+            return self.collection.find_one(
+                {'_id': ObjectId(internship_id)}, projection or self.FIELD_PROFILES['detail']
+            )
         except Exception:
             return None
 
     def get_statistics(self):
-        """Get statistics about LinkedIn internships"""
-        stats = {
-            'total_count': self.collection.count_documents({}),
-            'by_category': [],
-            'by_company': [],
-            'days_left_distribution': []
-        }
-
-        # Count by category
-        pipeline = [
-            {'$group': {'_id': '$category', 'count': {'$sum': 1}}},
-            {'$sort': {'count': -1}}
-        ]
-        stats['by_category'] = list(self.collection.aggregate(pipeline))
-
-        # Count by company
-        pipeline = [
-            {'$group': {'_id': '$company', 'count': {'$sum': 1}}},
-            {'$sort': {'count': -1}},
-            {'$limit': 10}
-        ]
-        stats['by_company'] = list(self.collection.aggregate(pipeline))
-
-        # Days left distribution
-        pipeline = [
-            {'$group': {'_id': '$days_left', 'count': {'$sum': 1}}},
-            {'$sort': {'_id': 1}}
-        ]
-        stats['days_left_distribution'] = list(self.collection.aggregate(pipeline))
-
-        return stats
+        """Get statistics about LinkedIn internships, read from the rollups"""
+        return self.rollups.get_statistics(self)
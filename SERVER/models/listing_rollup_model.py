@@ -0,0 +1,140 @@
+# models/listing_rollup_model.py
+from collections import Counter
+from datetime import datetime, timezone
+from pymongo import DeleteOne, UpdateOne
+from models.base_model import BaseMongoModel
+from utils.response_cache import bump_version
+
+TOP_COMPANIES = 10
+
+# Fields a listing's rollup entries depend on; fetch these before rewriting one
+ROLLUP_PROJECTION = {'category': 1, 'company': 1, 'deadline': 1}
+
+
+class ListingRollupModel(BaseMongoModel):
+    """
+    Pre-aggregated statistics for the listing collections.
+
+    One document per (source, dimension, value) holds a count, e.g.
+    {'source': 'internshala', 'dimension': 'category', 'value': 'web', 'count': 42}.
+    The listing models' write paths keep the counts current with $inc, so
+    reading statistics touches a handful of small indexed documents no matter
+    how many listings there are. reconcile() recomputes them from the source
+    collection to correct any drift.
+    """
+    collection_env = 'LISTING_ROLLUP_COLLECTION_NAME'
+    default_collection = 'listing_rollups'
+
+    # Dimensions tracked per listing; 'total' has a single None value
+    DIMENSIONS = ('total', 'category', 'company', 'deadline')
+
+    @staticmethod
+    def _dimension_values(listing):
+        return [
+            ('total', None),
+            ('category', listing.get('category')),
+            ('company', listing.get('company')),
+            ('deadline', listing.get('deadline')),
+        ]
+
+    def apply(self, source, added=(), removed=()):
+        """
+        Count `added` listings in and `removed` listings out of the rollups for
+        `source`, in one unordered bulk write. Failures are logged, not raised:
+        the listing write already happened and reconcile() will catch up. The
+        listing write calling this bumps the cache version for both.
+        """
+        increments = Counter()
+        for listing in added:
+            for key in self._dimension_values(listing):
+                increments[key] += 1
+        for listing in removed:
+            for key in self._dimension_values(listing):
+                increments[key] -= 1
+
+        operations = [
+            UpdateOne({'source': source, 'dimension': dimension, 'value': value},
+                      {'$inc': {'count': delta}}, upsert=True)
+            for (dimension, value), delta in increments.items() if delta
+        ]
+        if not operations:
+            return
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            print(f"[WARNING] Could not update {source} statistics rollups: {str(e)}")
+
+    def _counts(self, source, dimension, limit=0):
+        results = self.collection.find(
+            {'source': source, 'dimension': dimension, 'count': {'$gt': 0}},
+            {'_id': 0, 'value': 1, 'count': 1}
+        ).sort('count', -1)
+        if limit:
+            results = results.limit(limit)
+        return [{'_id': doc['value'], 'count': doc['count']} for doc in results]
+
+    def get_statistics(self, listing_model, now=None):
+        """
+        Statistics for a listing model's collection, in the shape its
+        get_statistics() has always returned. Builds the rollups on first use.
+        """
+        source = listing_model.collection_name
+        total = self.collection.find_one({'source': source, 'dimension': 'total'})
+        if total is None:
+            self.reconcile(listing_model)
+            total = self.collection.find_one({'source': source, 'dimension': 'total'})
+
+        # Deadlines are stored as dates; turn them into days left as of today
+        now = now or datetime.now(timezone.utc)
+        today = datetime(now.year, now.month, now.day)
+        days_left = Counter()
+        for bucket in self._counts(source, 'deadline'):
+            deadline = bucket['_id']
+            days_left[(deadline - today).days if deadline is not None else None] += bucket['count']
+
+        return {
+            'total_count': total['count'] if total else 0,
+            'by_category': self._counts(source, 'category'),
+            'by_company': self._counts(source, 'company', limit=TOP_COMPANIES),
+            'days_left_distribution': [
+                {'_id': value, 'count': count}
+                for value, count in sorted(days_left.items(), key=lambda item: (item[0] is not None, item[0] or 0))
+            ],
+        }
+
+    def reconcile(self, listing_model):
+        """
+        Recompute every rollup for a listing collection from the collection
+        itself and overwrite the stored counts, invalidating the collection's
+        cached statistics if any changed. Returns how many rollup documents
+        changed. Increments that land while this runs are corrected on the
+        next pass.
+        """
+        source = listing_model.collection_name
+        actual = {}
+        listings = listing_model.collection
+        actual[('total', None)] = listings.count_documents({})
+        for dimension in self.DIMENSIONS[1:]:
+            for group in listings.aggregate([{'$group': {'_id': f'${dimension}', 'count': {'$sum': 1}}}]):
+                actual[(dimension, group['_id'])] = group['count']
+
+        stored = {
+            (doc['dimension'], doc.get('value')): doc
+            for doc in self.collection.find({'source': source})
+        }
+        operations = []
+        for key, count in actual.items():
+            doc = stored.get(key)
+            if doc is None or doc.get('count') != count:
+                operations.append(UpdateOne(
+                    {'source': source, 'dimension': key[0], 'value': key[1]},
+                    {'$set': {'count': count}}, upsert=True
+                ))
+        for key, doc in stored.items():
+            if key not in actual:
+                operations.append(DeleteOne({'_id': doc['_id']}))
+
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+            bump_version(source)
+        return len(operations)
@@ -1,11 +1,10 @@
 # models/resume_model.py
-from database.db_connection import get_db_connection
+from models.base_model import BaseMongoModel
 import datetime
 
-class ResumeModel:
-    def __init__(self):
-        self.db = get_db_connection()
-        self.collection = self.db.resumes
+class ResumeModel(BaseMongoModel):
+    default_collection = 'resumes'
+    default_db_name = 'ApplyAsYouGo'
     
     def save_resume_data(self, filepath, filename, extracted_data,ats_score):
         """
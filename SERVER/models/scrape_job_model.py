@@ -0,0 +1,110 @@
+# models/scrape_job_model.py
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from models.base_model import BaseMongoModel
+
+# Job states; active jobs hold their dedup key in `active_key`
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+ACTIVE = (QUEUED, RUNNING)
+FINISHED = (SUCCEEDED, FAILED)
+
+
+class ScrapeJobModel(BaseMongoModel):
+    """
+    Background scrape jobs, shared by every app process:
+
+        {'_id': '9f1c...', 'status': 'running', 'platforms': [...], 'categories': [...],
+         'filters': {...}, 'dedup_key': ..., 'active_key': ..., 'attach_count': 2,
+         'total': 4, 'completed': 1, 'created_at': ..., 'updated_at': ...,
+         'started_at': ..., 'finished_at': ..., 'result': {...}}
+
+    active_key is set only while a job is queued or running, and a unique
+    partial index on it lets one process create a job for a given request
+    while concurrent identical requests attach to it (services/scrape_jobs.py
+    builds it before the first create_or_attach). finish() sets expires_at,
+    so a TTL index on it removes jobs `ttl_hours` after they finish and never
+    one still queued or running. The process holding a job keeps its
+    updated_at current (touch, progress), and every status change is
+    conditional on the current status, so a worker never revives a job
+    another process has already given up on.
+    """
+    collection_env = 'SCRAPE_JOB_COLLECTION_NAME'
+    default_collection = 'scrape_jobs'
+
+    def create_or_attach(self, job, stale_after, ttl_hours):
+        """
+        Insert `job` (which carries a dedup_key) unless an identical one is in
+        flight. Returns (job document, created). An in-flight job not updated
+        for `stale_after` seconds is taken to be dead and failed first, to
+        expire after `ttl_hours` like any finished job.
+        """
+        for _ in range(3):
+            now = time.time()
+            existing = self.collection.find_one_and_update(
+                {'active_key': job['dedup_key']},
+                {'$inc': {'attach_count': 1}},
+                return_document=ReturnDocument.AFTER
+            )
+            if existing is not None:
+                if existing['updated_at'] >= now - stale_after:
+                    return existing, False
+                self.finish(existing['_id'], FAILED, ttl_hours, message='Abandoned: no progress from its worker')
+
+            document = {
+                **job,
+                '_id': uuid.uuid4().hex,
+                'status': QUEUED,
+                'active_key': job['dedup_key'],
+                'attach_count': 0,
+                'completed': 0,
+                'created_at': now,
+                'updated_at': now,
+            }
+            try:
+                self.collection.insert_one(document)
+                return document, True
+            except DuplicateKeyError:
+                continue  # created elsewhere in between; attach to it
+        raise RuntimeError('Could not create or attach to a scrape job')
+
+    def start(self, job_id):
+        """Mark a queued job running; False if it is no longer queued"""
+        now = time.time()
+        updated = self.collection.update_one(
+            {'_id': job_id, 'status': QUEUED},
+            {'$set': {'status': RUNNING, 'started_at': now, 'updated_at': now}}
+        )
+        return updated.modified_count == 1
+
+    def touch(self, job_ids):
+        """Heartbeat: show the jobs are still held by a live process"""
+        if job_ids:
+            self.collection.update_many({'_id': {'$in': list(job_ids)}, 'status': {'$in': list(ACTIVE)}},
+                                        {'$set': {'updated_at': time.time()}})
+
+    def progress(self, job_id):
+        """Count one more finished (platform, category) scrape of a running job"""
+        self.collection.update_one({'_id': job_id, 'status': RUNNING},
+                                   {'$inc': {'completed': 1}, '$set': {'updated_at': time.time()}})
+
+    def finish(self, job_id, status, ttl_hours, result=None, message=None):
+        """Mark an active job finished, to expire after `ttl_hours`; False if it already was"""
+        now = time.time()
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=ttl_hours)
+        updated = self.collection.update_one(
+            {'_id': job_id, 'status': {'$in': list(ACTIVE)}},
+            {'$set': {'status': status, 'result': result, 'message': message, 'finished_at': now, 'updated_at': now,
+                      'expires_at': expires_at},
+             '$unset': {'active_key': ''}}
+        )
+        return updated.modified_count == 1
+
+    def get(self, job_id):
+        return self.collection.find_one({'_id': job_id}, {'active_key': 0, 'expires_at': 0})
+
+    def recent(self, limit=20):
+        return list(self.collection.find({}, {'active_key': 0, 'expires_at': 0})
+                    .sort('created_at', DESCENDING).limit(limit))
@@ -0,0 +1,68 @@
+# models/scrape_state_model.py
+import time
+from pymongo import UpdateOne
+from models.base_model import BaseMongoModel
+
+# Newest listing ids remembered per category; a few, in case the top one is removed
+HIGH_WATER_SIZE = 5
+
+
+def category_key(category):
+    """'Web Development' / 'web_development' -> 'web-development', the form state is kept under"""
+    return str(category).strip().lower().replace(' ', '-').replace('_', '-')
+
+
+class ScrapeStateModel(BaseMongoModel):
+    """
+    Crawl and scheduling state, one document per (source, category):
+
+        {'source': 'internshala', 'category': 'web-development',
+         'high_water_ids': [...], 'updated_at': ..., 'runs': 12, 'total_new': 310,
+         'last_run': {'pages': 2, 'count': 14, 'seconds': 3.1, 'stop_reason': 'high_water', ...},
+         'queries': 840, 'last_scraped_at': ..., 'yield_per_run': 6.5}
+
+    high_water_ids are the newest listing ids the last clean run saw. The next
+    run stops at the first page that contains one, since everything after it
+    was already crawled. queries counts list requests for the category (see
+    services/scrape_demand.py); last_scraped_at and yield_per_run belong to
+    the scrape scheduler.
+    """
+    collection_env = 'SCRAPE_STATE_COLLECTION_NAME'
+    default_collection = 'scrape_state'
+
+    def get(self, source, category):
+        return self.collection.find_one({'source': source, 'category': category}, {'_id': 0})
+
+    def high_water_ids(self, source, category):
+        state = self.get(source, category)
+        return set(state.get('high_water_ids', [])) if state else set()
+
+    def record_run(self, source, category, high_water_ids, run):
+        """Store a finished run's stats and, when it saw any listings, its new high-water mark"""
+        update = {'updated_at': time.time(), 'last_run': run}
+        if high_water_ids:
+            update['high_water_ids'] = list(high_water_ids)[:HIGH_WATER_SIZE]
+        self.collection.update_one(
+            {'source': source, 'category': category},
+            {'$set': update, '$inc': {'runs': 1, 'total_new': run.get('count', 0)}},
+            upsert=True
+        )
+
+    def add_queries(self, counts):
+        """Add {(source, category): n} list-query counts in one unordered bulk write"""
+        operations = [
+            UpdateOne({'source': source, 'category': category}, {'$inc': {'queries': n}}, upsert=True)
+            for (source, category), n in counts.items() if n
+        ]
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+    def find_states(self, sources):
+        return list(self.collection.find({'source': {'$in': list(sources)}}, {'_id': 0, 'high_water_ids': 0}))
+
+    def record_schedule(self, source, category, last_scraped_at, yield_per_run):
+        self.collection.update_one(
+            {'source': source, 'category': category},
+            {'$set': {'last_scraped_at': last_scraped_at, 'yield_per_run': yield_per_run}},
+            upsert=True
+        )
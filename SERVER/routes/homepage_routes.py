@@ -1,4 +1,8 @@
-from flask import Blueprint, render_template_string
+from flask import Blueprint, render_template_string, jsonify
+from database.db_connection import check_db_health, get_pool_settings
+from services.scrape_scheduler import scheduler_stats
+from services.webdriver_pool import pool_stats
+from utils.response_cache import response_cache
 
 homepage_blueprint = Blueprint('homepage', __name__)
 
@@ -81,3 +85,22 @@ def get_homepage():
     """
     
     return html_content
+
+@homepage_blueprint.route('/health', methods=['GET'])
+def get_health():
+    """Health check endpoint reporting database reachability and pool settings"""
+    database = check_db_health()
+    pool = get_pool_settings()
+    return jsonify({
+        'status': 'ok' if database['ok'] else 'degraded',
+        'database': database,
+        'pool': {
+            'max_pool_size': pool['maxPoolSize'],
+            'min_pool_size': pool['minPoolSize'],
+            'heartbeat_frequency_ms': pool['heartbeatFrequencyMS']
+        },
+        'response_cache': response_cache.stats(),
+        'browser_pools': pool_stats(),
+        # None unless this process runs the scheduler
+        'scrape_scheduler': scheduler_stats()
+    }), 200 if database['ok'] else 503
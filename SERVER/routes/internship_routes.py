@@ -1,8 +1,8 @@
-from flask import Blueprint, request, Response
+from flask import Blueprint, request
 from controllers.internship_controller import InternshipController
-from bson import json_util
 from middlewares.auth_middleware import jwt_required
-import json
+from routes.scrape_jobs_routes import job_accepted
+from utils.serialization import json_response
 
 internship_blueprint = Blueprint('internship_routes', __name__)
 internship_controller = InternshipController()
@@ -11,11 +11,11 @@ internship_controller = InternshipController()
 @jwt_required
 def scrape_internships():
     category = request.args.get('category', 'web-development-internship')
-    result = internship_controller.scrape_internships(category)
-    return Response(
-        json_util.dumps(result),
-        mimetype='application/json'
-    )
+    try:
+        job, created = internship_controller.scrape_internships(category)
+    except ValueError as e:
+        return json_response({'success': False, 'message': str(e), 'count': 0}, status=400)
+    return job_accepted(job, created)
 
 @internship_blueprint.route('/get', methods=['GET'])
 @jwt_required
@@ -27,7 +27,4 @@ def get_internships():
         "count": len(internships),
         "data": internships
     }
-    return Response(
-        json_util.dumps(response_data),
-        mimetype='application/json'
-    )
\ No newline at end of file
+    return json_response(response_data)
\ No newline at end of file
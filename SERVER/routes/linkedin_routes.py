@@ -1,47 +1,94 @@
 from flask import Blueprint, request, jsonify
 from controllers.linkedin_controller import LinkedInController
+from routes.scrape_jobs_routes import job_accepted
+from services.listing_normalizer import range_filters
+from services.scrape_demand import tracks_demand
+from utils.fieldsets import InvalidFields, parse_fieldset_args
+from utils.pagination import parse_page_args, InvalidCursor
+from utils.response_cache import cached_response
+from utils.streaming import stream_response, wants_ndjson, wants_stream
 
 # Create the blueprint for LinkedIn API routes
 linkedin_bp = Blueprint('linkedin_internships', __name__, url_prefix='/api/linkedin')
 controller = LinkedInController()
 
-@linkedin_bp.route('/list', methods=['GET'])
-def api_list_linkedin_internships():
-    """API endpoint to get LinkedIn internships as JSON"""
-    # Get query parameters for filtering
-    category = request.args.get('category')
-    company = request.args.get('company')
-    title_search = request.args.get('title')
-    days_left = request.args.get('days_left')
-    
-    # Pagination parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    
+def _list_filters(args):
+    """Build the Mongo filter shared by /list and /export from query parameters"""
+    category = args.get('category')
+    company = args.get('company')
+    # ?title= is kept as an alias of ?q= for existing clients
+    search = (args.get('q') or args.get('title') or '').strip()
+    days_left = args.get('days_left')
+
     filters = {}
     if category:
         filters['category'] = category
     if company:
         filters['company'] = company
-    if title_search:
-        filters['title'] = {"$regex": title_search, "$options": "i"}
+    if search:
+        # Relevance-ranked text search over title, company and skills
+        filters['$text'] = {'$search': search}
     if days_left:
         filters['days_left'] = days_left
+    # Range filters over the normalized numeric/date fields
+    filters.update(range_filters(args))
+    return filters
 
-    result = controller.get_all_internships(filters)
-    return jsonify(result)
+@linkedin_bp.route('/list', methods=['GET'])
+@tracks_demand(controller.model.collection_name)
+@cached_response(controller.model.collection_name)
+def api_list_linkedin_internships():
+    """API endpoint to get LinkedIn internships as JSON"""
+    filters = _list_filters(request.args)
+    # ?fields=title,company or ?profile=card|list|detail trims each listing
+    fieldset = parse_fieldset_args(request.args)
+
+    # ?stream=1 sends every match as a streamed JSON array (or NDJSON)
+    if wants_stream(request):
+        try:
+            documents = controller.stream_internships(filters, **fieldset)
+        except InvalidFields as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return stream_response(documents, ndjson=wants_ndjson(request))
+
+    # Pagination parameters: keyset via ?cursor=, or ?page= as an offset fallback
+    paging = parse_page_args(request.args)
+
+    try:
+        result = controller.get_all_internships(filters, **paging, **fieldset)
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    # A database error is a 500, so the response cache never keeps it
+    return jsonify(result), 200 if result.get('success') else 500
+
+@linkedin_bp.route('/export', methods=['GET'])
+def api_export_linkedin_internships():
+    """API endpoint to download every matching LinkedIn internship as JSON or NDJSON"""
+    filters = _list_filters(request.args)
+    limit = max(0, request.args.get('limit', 0, type=int) or 0)
+    try:
+        documents = controller.stream_internships(
+            filters, full=True, limit=limit, **parse_fieldset_args(request.args)
+        )
+    except InvalidFields as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return stream_response(documents, ndjson=wants_ndjson(request), filename='linkedin_internships')
 
 @linkedin_bp.route('/<internship_id>', methods=['GET'])
+@cached_response(controller.model.collection_name)
 def api_get_linkedin_internship(internship_id):
     """API endpoint to get a specific LinkedIn internship by ID"""
-    result = controller.get_internship_by_id(internship_id)
+    try:
+        result = controller.get_internship_by_id(internship_id, **parse_fieldset_args(request.args))
+    except InvalidFields as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     return jsonify(result)
 
 @linkedin_bp.route('/scrape', methods=['POST'])
 def api_scrape_linkedin_internships():
-    """API endpoint to trigger LinkedIn internship scraping"""
+    """API endpoint to queue a background LinkedIn internship scrape; answers 202 with the job"""
     data = request.json or {}
-    
+
     filters = {
         'category': data.get('category', 'internship'),
         'usertype': data.get('usertype', 'fresher'),
@@ -50,30 +97,20 @@ def api_scrape_linkedin_internships():
     }
 
     try:
-        result = controller.trigger_scrape_internships(filters)
-        
-        if result.get('count', 0) > 0:
-            return jsonify({
-                'success': True,
-                'message': result.get('message', 'Scraping completed successfully'),
-                'count': result.get('count', 0)
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': result.get('message', 'No internships found'),
-                'count': 0
-            }), 400
-            
+        job, created = controller.trigger_scrape_internships(filters)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e), 'count': 0}), 400
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f'Scraping failed: {str(e)}',
+            'message': f'Could not queue scrape: {str(e)}',
             'count': 0
         }), 500
+    return job_accepted(job, created)
 
 @linkedin_bp.route('/statistics', methods=['GET'])
+@cached_response(controller.model.collection_name)
 def api_linkedin_statistics():
     """API endpoint to get statistics about LinkedIn internships"""
     result = controller.get_internship_statistics()
-    return jsonify(result)
+    return jsonify(result), 200 if result.get('success') else 500
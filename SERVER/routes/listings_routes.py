@@ -0,0 +1,90 @@
+from flask import Blueprint, request, jsonify
+from controllers.listings_controller import ListingsController
+from routes.scrape_jobs_routes import job_accepted
+from services.scrape_jobs import submit_scrape_job
+from services.scrape_orchestrator import PLATFORM_SCRAPERS
+from services.listing_normalizer import range_filters
+from services.scrape_demand import tracks_demand
+from utils.fieldsets import InvalidFields, parse_fieldset_args
+from utils.pagination import parse_page_args, InvalidCursor, PageTooDeep
+from utils.response_cache import cached_response
+from utils.streaming import stream_response, wants_ndjson, wants_stream
+
+# One listing feed across every platform collection
+listings_bp = Blueprint('listings', __name__, url_prefix='/api/v1/listings')
+controller = ListingsController()
+
+def _list_filters(args):
+    """Build the Mongo filter applied to every platform collection from query parameters"""
+    category = args.get('category')
+    company = args.get('company')
+    search = (args.get('q') or args.get('title') or '').strip()
+
+    filters = {}
+    if category:
+        filters['category'] = category
+    if company:
+        filters['company'] = company
+    if search:
+        filters['$text'] = {'$search': search}
+    filters.update(range_filters(args))
+    return filters
+
+def _platforms(args):
+    """?platform=linkedin&platform=internshala (or comma separated) narrows the platforms"""
+    names = [name.strip() for value in args.getlist('platform') for name in value.split(',') if name.strip()]
+    return names or None
+
+@listings_bp.route('', methods=['GET'])
+@tracks_demand(model.collection_name for model in controller.models.values())
+@cached_response(tuple(model.collection_name for model in controller.models.values()))
+def api_list_listings():
+    """API endpoint to get one page of listings from every platform, newest first"""
+    filters = _list_filters(request.args)
+    platforms = _platforms(request.args)
+    # ?fields=title,company or ?profile=card|list|detail trims each listing
+    fieldset = parse_fieldset_args(request.args)
+
+    unknown = sorted(set(platforms or ()) - set(controller.models))
+    if unknown:
+        return jsonify({'success': False, 'message': f"Unknown platform(s): {', '.join(unknown)}"}), 400
+
+    # ?stream=1 sends every match, merged across platforms, as a streamed JSON array (or NDJSON)
+    if wants_stream(request):
+        limit = max(0, request.args.get('limit', 0, type=int) or 0)
+        try:
+            documents = controller.stream_listings(filters, platforms, limit=limit, **fieldset)
+        except InvalidFields as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return stream_response(documents, ndjson=wants_ndjson(request))
+
+    paging = parse_page_args(request.args)
+    try:
+        result = controller.get_listings(
+            filters, platforms, per_page=paging['per_page'], cursor=paging['cursor'], page=paging['page'], **fieldset
+        )
+    except (InvalidCursor, InvalidFields, PageTooDeep) as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': f"Error retrieving listings: {str(e)}", 'data': []}), 500
+    return jsonify(result)
+
+@listings_bp.route('/scrape', methods=['POST'])
+def api_scrape_listings():
+    """API endpoint to queue a concurrent scrape of many categories on many platforms; answers 202 with the job"""
+    data = request.json or {}
+    platforms = data.get('platforms') or list(PLATFORM_SCRAPERS)
+    categories = data.get('categories') or ([data['category']] if data.get('category') else [])
+    if not categories:
+        return jsonify({'success': False, 'message': 'categories is required'}), 400
+
+    filters = {
+        'usertype': data.get('usertype', 'fresher'),
+        'passing_year': data.get('passing_year', '2027'),
+        'quick_apply': data.get('quick_apply', True)
+    }
+    try:
+        job, created = submit_scrape_job(platforms, categories, filters)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return job_accepted(job, created)
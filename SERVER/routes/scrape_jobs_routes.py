@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify, request
+from services.scrape_jobs import JOBS_URL, get_job, job_events, job_view, recent_jobs
+from utils.streaming import event_stream_response
+
+# Status of the background jobs the /scrape routes queue
+scrape_jobs_bp = Blueprint('scrape_jobs', __name__, url_prefix=JOBS_URL)
+
+
+def job_accepted(job, created):
+    """202 response for a queued job (or the identical one a request attached to)"""
+    view = job_view(job)
+    response = jsonify({
+        'success': True,
+        'message': 'Scrape queued' if created else 'Identical scrape already in progress; attached to it',
+        'attached': not created,
+        **view
+    })
+    response.status_code = 202
+    response.headers['Location'] = view['status_url']
+    return response
+
+
+@scrape_jobs_bp.route('', methods=['GET'])
+def api_list_scrape_jobs():
+    """API endpoint to list the most recent scrape jobs"""
+    limit = min(100, max(1, request.args.get('limit', 20, type=int) or 20))
+    return jsonify({'success': True, 'data': [job_view(job) for job in recent_jobs(limit)]})
+
+
+@scrape_jobs_bp.route('/<job_id>', methods=['GET'])
+def api_get_scrape_job(job_id):
+    """API endpoint to poll a scrape job's status and result"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Scrape job not found'}), 404
+    return jsonify({'success': True, **job_view(job)})
+
+
+@scrape_jobs_bp.route('/<job_id>/events', methods=['GET'])
+def api_scrape_job_events(job_id):
+    """API endpoint streaming a scrape job's status changes as Server-Sent Events until it finishes"""
+    if get_job(job_id) is None:
+        return jsonify({'success': False, 'message': 'Scrape job not found'}), 404
+    return event_stream_response(job_events(job_id))
@@ -11,6 +11,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.select import Select
+from services.wait_utils import document_ready, element_in_view, network_idle, page_changes
 import google.generativeai as genai
 from flask import current_app
 
@@ -77,7 +78,7 @@ class InternshalaBot:
             print("[BOT] Navigating to Internshala login page...")
             self.driver.get("https://internshala.com/login")
             print(f"[BOT] Current URL: {self.driver.current_url}")
-            time.sleep(3)  # Wait for page to load
+            document_ready(self.driver)
             
             # Check if already logged in (look for profile container)
             try:
@@ -176,8 +177,9 @@ class InternshalaBot:
             
             if google_button:
                 print("[BOT] Clicking Google login button...")
+                url, windows = self.driver.current_url, len(self.driver.window_handles)
                 self._human_like_click(google_button)
-                time.sleep(3)
+                page_changes(self.driver, url, window_count=windows, timeout=5)
                 
                 print("[BOT] ⏳ Please complete Google authentication in the browser window...")
                 print("[BOT] ⏳ Waiting for login to complete (timeout: 120 seconds)...")
@@ -214,9 +216,6 @@ class InternshalaBot:
             print(f"Search URL: {search_url}")
             self.driver.get(search_url)
             
-            # Wait for page to load
-            time.sleep(5)
-            
             # Wait for search results to load
             try:
                 self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "internship_meta")))
@@ -303,6 +302,8 @@ class InternshalaBot:
             
             # Store original window handle
             original_window = self.driver.current_window_handle
+            original_url = self.driver.current_url
+            window_count = len(self.driver.window_handles)
             
             try:
                 # Scroll to the card and click
@@ -317,8 +318,8 @@ class InternshalaBot:
                     
                 print("Clicked on internship listing")
                 
-                # Wait for new tab or page to load
-                time.sleep(3)
+                # Wait for the detail page to open in a new tab or this one
+                page_changes(self.driver, original_url, window_count=window_count)
                 
                 # Check if new tab opened
                 if len(self.driver.window_handles) > 1:
@@ -375,7 +376,6 @@ class InternshalaBot:
                     print("Clicked Apply button")
                     
                     # Wait for application form to load
-                    time.sleep(3)
                     self._wait_for_page_load()
                     
                     # Handle application form
@@ -432,19 +432,18 @@ class InternshalaBot:
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center', inline: 'center'});", 
                 element
             )
-            time.sleep(0.5)  # Small pause for scroll to complete
+            element_in_view(self.driver, element, timeout=2)  # Let the smooth scroll finish
         except Exception as e:
             print(f"Error scrolling to element: {e}")
 
     def _wait_for_page_load(self):
         """Wait for page to fully load"""
         try:
-            self.driver.execute_script("return document.readyState") == "complete"
+            document_ready(self.driver)
             # Wait for any AJAX calls to complete
-            time.sleep(2)
+            network_idle(self.driver)
         except Exception as e:
             print(f"Error waiting for page load: {e}")
-            time.sleep(3)  # Fallback wait
             
     def _handle_popups(self):
         """Handle any popups that might interfere with the application process"""
@@ -710,9 +709,12 @@ class InternshalaBot:
         try:
             next_button = self.driver.find_element(By.CSS_SELECTOR, "a.next")
             if "disabled" not in next_button.get_attribute("class"):
+                url = self.driver.current_url
+                first_card = self.driver.find_elements(By.CSS_SELECTOR, "div.individual_internship")[:1]
                 self._human_like_click(next_button)
-                # Wait for the next page to load
-                time.sleep(3)
+                # Wait for the next page (a new URL, or the old cards replaced)
+                page_changes(self.driver, url, element=first_card[0] if first_card else None)
+                self._wait_for_page_load()
                 return True
             else:
                 print("No more pages available")
@@ -734,7 +736,7 @@ class InternshalaBot:
         try:
             print(f"Navigating to internship URL: {url}")
             self.driver.get(url)
-            time.sleep(3)  # Wait for the page to load
+            self._wait_for_page_load()
 
             # Handle any popups
             self._handle_popups()
@@ -774,7 +776,6 @@ class InternshalaBot:
             print("Clicked Apply button")
 
             # Wait for application form to load
-            time.sleep(3)
             self._wait_for_page_load()
 
             # Handle the application form
@@ -849,7 +850,7 @@ class InternshalaBot:
                     self._scroll_into_view(submit_button)
                     self._human_like_click(submit_button)
                     print("Clicked submit button")
-                    time.sleep(2)
+                    self._wait_for_page_load()
                     return True
                 else:
                     print("Could not find any submit button")
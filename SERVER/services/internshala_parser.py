@@ -0,0 +1,112 @@
+# services/internshala_parser.py
+"""
+Internshala listing-page parser for the HTTP engine.
+
+A Python port of the card extraction script InternshalaScraper runs in the
+browser: the same card, title, company, location, stipend, duration and
+skill selector fallbacks, and the same output fields, so both engines
+produce identical documents.
+"""
+import time
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+MAX_SKILLS = 5
+
+CARD_SELECTORS = [
+    'div.individual_internship',
+    'div.container-fluid.individual_internship',
+    'div[id^="individual_internship_"]',
+    '.internship_meta',
+    '[data-internship-id]',
+]
+TITLE_SELECTORS = [
+    '.profile h3 a',
+    '.heading_4_5 a',
+    '.internship-heading-container h3',
+    '.heading a',
+    'h3 a',
+    '.profile a',
+]
+COMPANY_SELECTORS = [
+    '.company_name',
+    '.heading_6',
+    '.company-name',
+    '.company a',
+    'p a[href*="/company/"]',
+]
+LOCATION_SELECTORS = [
+    'span.location_link',
+    '.location',
+    '.location_name',
+    '[class*="location"]',
+]
+STIPEND_SELECTOR = '.stipend, [class*="stipend"]'
+DURATION_SELECTOR = '.internship_other_details_container .item_body, .duration, [class*="duration"]'
+SKILL_SELECTOR = '.round_tabs, .skill_tag, [class*="skill"]'
+LINK_SELECTOR = 'a[href*="/internship/"]'
+
+
+def _text(element):
+    return element.get_text().strip() if element is not None else ''
+
+
+def _first_text(card, selectors):
+    """Text of the first selector that matches with non-empty text"""
+    for selector in selectors:
+        text = _text(card.select_one(selector))
+        if text:
+            return text
+    return None
+
+
+def _cards(soup):
+    for selector in CARD_SELECTORS:
+        cards = soup.select(selector)
+        if cards:
+            return cards
+    return []
+
+
+def parse_internship_cards(html, category=None):
+    """Listing dicts for the cards on one Internshala search page ([] if none)"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    internships = []
+    for i, card in enumerate(_cards(soup)):
+        internship = {
+            'internship_id': (card.get('internshipid') or card.get('id') or card.get('data-internship-id')
+                              or f"internshala_{int(time.time() * 1000)}_{i}"),
+            'title': _first_text(card, TITLE_SELECTORS),
+            'company': _first_text(card, COMPANY_SELECTORS),
+            'location': _first_text(card, LOCATION_SELECTORS) or 'Not specified',
+            'stipend': _text(card.select_one(STIPEND_SELECTOR)) or 'Not mentioned',
+            'duration': _text(card.select_one(DURATION_SELECTOR)) or 'Not specified',
+            'apply_link': None,
+            'category': category,
+            'applicants': 'N/A',
+            'days_left': 'N/A',
+            'skills': [],
+        }
+
+        link = card.get('data-href')
+        if not link:
+            anchor = card.select_one(LINK_SELECTOR)
+            link = anchor.get('href') if anchor is not None else None
+        if link and not link.startswith('http'):
+            link = 'https://internshala.com' + link
+        internship['apply_link'] = link
+
+        for element in card.select(SKILL_SELECTOR):
+            skill = _text(element)
+            if skill and len(internship['skills']) < MAX_SKILLS:
+                internship['skills'].append(skill)
+
+        # Only keep cards with the essential data
+        if internship['title'] and internship['company']:
+            internships.append(internship)
+    return internships
@@ -1,19 +1,217 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 import time
+import os
+import requests
 from models.internshala_model import InternshalaInternshipModel
+from models.scrape_state_model import HIGH_WATER_SIZE, ScrapeStateModel, category_key
+from services.listing_normalizer import normalize_listing
+from services.internshala_parser import CARD_SELECTORS, parse_internship_cards
+from services.scrape_engine import BrowserEngine, HttpEngine, build_engine
+from services.wait_utils import document_ready, element_present
+from services.webdriver_pool import get_pool
+from utils.stage_timer import stage
+
+# Result pages read per category per run, and the share of already-saved
+# listings on a page that ends the crawl
+SCRAPE_MAX_PAGES = int(os.getenv('SCRAPE_MAX_PAGES', '10'))
+SCRAPE_KNOWN_STOP_RATIO = float(os.getenv('SCRAPE_KNOWN_STOP_RATIO', '0.8'))
+# Site the listing pages are loaded from; point it at a replay server
+# (python -m benchmarks.scrape_replay serve) to scrape offline
+INTERNSHALA_BASE_URL = os.getenv('INTERNSHALA_BASE_URL', 'https://internshala.com')
+
+# Hides modals, popups and overlays that cover the listing
+_CLOSE_POPUPS_JS = """
+    // Close any modals or popups
+    var modals = document.querySelectorAll('.modal, .popup, [class*="modal"], [class*="popup"]');
+    for (var i = 0; i < modals.length; i++) {
+        modals[i].style.display = 'none';
+    }
+    document.body.classList.remove('modal-open');
+    var backdrops = document.querySelectorAll('.modal-backdrop, [class*="backdrop"]');
+    for (var i = 0; i < backdrops.length; i++) {
+        backdrops[i].remove();
+    }
+
+    // Remove overlay elements
+    var overlays = document.querySelectorAll('[class*="overlay"]');
+    for (var i = 0; i < overlays.length; i++) {
+        overlays[i].style.display = 'none';
+    }
+"""
+
+# Reads every card on the page in one round trip; services/internshala_parser.py
+# is the Python port used by the HTTP engine
+_EXTRACT_CARDS_JS = """
+    var internships = [];
+
+    // Try multiple selectors for internship cards
+    var cardSelectors = [
+        'div.individual_internship',
+        'div.container-fluid.individual_internship', 
+        'div[id^="individual_internship_"]',
+        '.internship_meta',
+        '[data-internship-id]'
+    ];
+
+    var cards = [];
+    for (var s = 0; s < cardSelectors.length; s++) {
+        var foundCards = document.querySelectorAll(cardSelectors[s]);
+        if (foundCards.length > 0) {
+            cards = foundCards;
+            console.log('Found ' + cards.length + ' cards with selector: ' + cardSelectors[s]);
+            break;
+        }
+    }
+
+    if (cards.length === 0) {
+        console.log('No internship cards found');
+        return [];
+    }
+
+    for (var i = 0; i < cards.length; i++) {
+        var card = cards[i];
+        var internship = {
+            internship_id: null,
+            title: null,
+            company: null,
+            location: 'Not specified',
+            stipend: 'Not mentioned',
+            duration: 'Not specified',
+            apply_link: null,
+            category: arguments[0],
+            applicants: 'N/A',
+            days_left: 'N/A',
+            skills: []
+        };
+
+        // Get internship ID
+        internship.internship_id = card.getAttribute('internshipid') || 
+                                 card.getAttribute('id') || 
+                                 card.getAttribute('data-internship-id') ||
+                                 'internshala_' + Date.now() + '_' + i;
+
+        // Get link
+        var link = card.getAttribute('data-href');
+        if (!link) {
+            var linkElements = card.querySelectorAll('a[href*="/internship/"]');
+            if (linkElements.length > 0) {
+                link = linkElements[0].getAttribute('href');
+            }
+        }
+
+        if (link && !link.startsWith('http')) {
+            link = 'https://internshala.com' + link;
+        }
+        internship.apply_link = link;
+
+        // Get title - try multiple selectors
+        var titleSelectors = [
+            '.profile h3 a',
+            '.heading_4_5 a',
+            '.internship-heading-container h3',
+            '.heading a',
+            'h3 a',
+            '.profile a'
+        ];
+
+        for (var t = 0; t < titleSelectors.length; t++) {
+            var titleElement = card.querySelector(titleSelectors[t]);
+            if (titleElement && titleElement.textContent.trim()) {
+                internship.title = titleElement.textContent.trim();
+                break;
+            }
+        }
+
+        // Get company - try multiple selectors
+        var companySelectors = [
+            '.company_name',
+            '.heading_6',
+            '.company-name',
+            '.company a',
+            'p a[href*="/company/"]'
+        ];
+
+        for (var c = 0; c < companySelectors.length; c++) {
+            var companyElement = card.querySelector(companySelectors[c]);
+            if (companyElement && companyElement.textContent.trim()) {
+                internship.company = companyElement.textContent.trim();
+                break;
+            }
+        }
+
+        // Get location
+        var locationSelectors = [
+            'span.location_link',
+            '.location',
+            '.location_name',
+            '[class*="location"]'
+        ];
+
+        for (var l = 0; l < locationSelectors.length; l++) {
+            var locationElement = card.querySelector(locationSelectors[l]);
+            if (locationElement && locationElement.textContent.trim()) {
+                internship.location = locationElement.textContent.trim();
+                break;
+            }
+        }
+
+        // Get stipend
+        var stipendElement = card.querySelector('.stipend, [class*="stipend"]');
+        if (stipendElement && stipendElement.textContent.trim()) {
+            internship.stipend = stipendElement.textContent.trim();
+        }
+
+        // Get duration
+        var durationElement = card.querySelector('.internship_other_details_container .item_body, .duration, [class*="duration"]');
+        if (durationElement && durationElement.textContent.trim()) {
+            internship.duration = durationElement.textContent.trim();
+        }
+
+        // Get skills
+        var skillElements = card.querySelectorAll('.round_tabs, .skill_tag, [class*="skill"]');
+        for (var sk = 0; sk < skillElements.length; sk++) {
+            var skillText = skillElements[sk].textContent.trim();
+            if (skillText && internship.skills.length < 5) {
+                internship.skills.push(skillText);
+            }
+        }
+
+        // Only add if we have essential data
+        if (internship.title && internship.company) {
+            internships.push(internship);
+        }
+    }
+
+    return internships;
+"""
+
 
 class InternshalaScraper:
-    def __init__(self):
-        self.model = InternshalaInternshipModel()
-        
-    def _setup_driver(self):
+    # Request filters the crawl uses besides the category (none: it reads the category's pages)
+    FILTERS = ()
+
+    def __init__(self, model=None, base_url=None):
+        # Controllers pass their own model so both share one collection handle
+        self.model = model or InternshalaInternshipModel()
+        self.base_url = (base_url or INTERNSHALA_BASE_URL).rstrip('/')
+        # Warm browser sessions shared by every Internshala scrape in the process;
+        # no implicit wait, so each condition-wait poll returns at once
+        self.pool = get_pool('internshala', self._chrome_options, page_load_timeout=30)
+        self.state = ScrapeStateModel(db_name=self.model.db_name)
+        # Called before every page after the first; the orchestrator sets it to
+        # its per-host rate limit
+        self.throttle = None
+        self.max_pages = SCRAPE_MAX_PAGES
+        self.engine = build_engine(
+            HttpEngine(parse_internship_cards),
+            BrowserEngine(self.pool, self._browser_cards)
+        )
+
+    @staticmethod
+    def _chrome_options():
         chrome_options = Options()
         chrome_options.add_argument('--disable-gpu')
-        # chrome_options.add_argument('--headless')
+        # Headless is set by the pool (WEBDRIVER_HEADLESS)
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-extensions')
@@ -24,242 +222,143 @@ class InternshalaScraper:
             "profile.default_content_setting_values.css": 2
         }
         chrome_options.add_experimental_option("prefs", prefs)
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.implicitly_wait(3)  # Short implicit wait
-        
-        return driver
-    
+        return chrome_options
+
+    def page_url(self, category, page=1):
+        """URL of result page `page` for `category`"""
+        url = f"{self.base_url}/internships/{category_key(category)}-internship"
+        return url if page == 1 else f"{url}/page-{page}"
+
     def scrape_internships(self, filters):
-        driver = self._setup_driver()
-        
+        """
+        Crawl the category's result pages newest first, saving unseen listings,
+        until a page reaches the last run's high-water mark, a page is mostly
+        listings we already have, a page has no cards, or max_pages
+        (SCRAPE_MAX_PAGES).
+
+        Only the first page falls back to the browser: past it, a 404 or a
+        page without cards is the end of the results. A later page that
+        fails ends the crawl with what was saved so far.
+        """
         try:
             category = filters.get('category', 'web-development')
             
             # Use direct URL to avoid UI interactions
-            url_category = category.lower().replace(" ", "-").replace("_", "-")
-            url = f"https://internshala.com/internships/{url_category}-internship"
+            url_category = category_key(category)
+            source = self.model.collection_name
+            high_water = self.state.high_water_ids(source, url_category)
             
-            print(f"Scraping Internshala with URL: {url}")
-            driver.get(url)
-            time.sleep(3)
-            
-            # Close popups using JavaScript
-            driver.execute_script("""
-                // Close any modals or popups
-                var modals = document.querySelectorAll('.modal, .popup, [class*="modal"], [class*="popup"]');
-                for (var i = 0; i < modals.length; i++) {
-                    modals[i].style.display = 'none';
-                }
-                document.body.classList.remove('modal-open');
-                var backdrops = document.querySelectorAll('.modal-backdrop, [class*="backdrop"]');
-                for (var i = 0; i < backdrops.length; i++) {
-                    backdrops[i].remove();
-                }
-                
-                // Remove overlay elements
-                var overlays = document.querySelectorAll('[class*="overlay"]');
-                for (var i = 0; i < overlays.length; i++) {
-                    overlays[i].style.display = 'none';
-                }
-            """)
-            
-            # Wait for content to load
-            time.sleep(2)
-            
-            # Use JavaScript to extract all internship data at once
-            internships_data = driver.execute_script("""
-                var internships = [];
-                
-                // Try multiple selectors for internship cards
-                var cardSelectors = [
-                    'div.individual_internship',
-                    'div.container-fluid.individual_internship', 
-                    'div[id^="individual_internship_"]',
-                    '.internship_meta',
-                    '[data-internship-id]'
-                ];
+            started = time.monotonic()
+            pages, seen, saved_count, newest_ids = 0, 0, 0, []
+            stop_reason = 'max_pages'
+            for page in range(1, self.max_pages + 1):
+                # The caller paced the first page; pace the rest here
+                if page > 1 and self.throttle:
+                    self.throttle()
+                page_url = self.page_url(url_category, page)
+                print(f"Scraping Internshala with URL: {page_url}")
+                # Static HTML first; the browser only if the first page has no cards
+                try:
+                    internships_data, engine = self.engine.fetch_cards(page_url, category, fallback=page == 1)
+                except Exception as e:
+                    if page == 1:
+                        raise
+                    not_found = (isinstance(e, requests.HTTPError) and e.response is not None
+                                 and e.response.status_code == 404)
+                    stop_reason = 'no_cards' if not_found else 'error'
+                    if not not_found:
+                        print(f"[WARNING] Stopping the crawl at page {page}: {str(e)}")
+                    break
+                pages += 1
+                print(f"Extracted {len(internships_data)} internships from page {page} ({engine})")
                 
-                var cards = [];
-                for (var s = 0; s < cardSelectors.length; s++) {
-                    var foundCards = document.querySelectorAll(cardSelectors[s]);
-                    if (foundCards.length > 0) {
-                        cards = foundCards;
-                        console.log('Found ' + cards.length + ' cards with selector: ' + cardSelectors[s]);
-                        break;
-                    }
-                }
+                if not internships_data:
+                    stop_reason = 'no_cards'
+                    break
+                if not newest_ids:
+                    newest_ids = [i['internship_id'] for i in internships_data[:HIGH_WATER_SIZE]]
                 
-                if (cards.length === 0) {
-                    console.log('No internship cards found');
-                    return [];
-                }
+                with stage('persist'):
+                    saved, known = self._save_new(internships_data)
+                seen += len(internships_data)
+                saved_count += saved
                 
-                for (var i = 0; i < Math.min(cards.length, 25); i++) {
-                    var card = cards[i];
-                    var internship = {
-                        internship_id: null,
-                        title: null,
-                        company: null,
-                        location: 'Not specified',
-                        stipend: 'Not mentioned',
-                        duration: 'Not specified',
-                        apply_link: null,
-                        category: arguments[0],
-                        applicants: 'N/A',
-                        days_left: 'N/A',
-                        skills: []
-                    };
-                    
-                    // Get internship ID
-                    internship.internship_id = card.getAttribute('internshipid') || 
-                                             card.getAttribute('id') || 
-                                             card.getAttribute('data-internship-id') ||
-                                             'internshala_' + Date.now() + '_' + i;
-                    
-                    // Get link
-                    var link = card.getAttribute('data-href');
-                    if (!link) {
-                        var linkElements = card.querySelectorAll('a[href*="/internship/"]');
-                        if (linkElements.length > 0) {
-                            link = linkElements[0].getAttribute('href');
-                        }
-                    }
-                    
-                    if (link && !link.startsWith('http')) {
-                        link = 'https://internshala.com' + link;
-                    }
-                    internship.apply_link = link;
-                    
-                    // Get title - try multiple selectors
-                    var titleSelectors = [
-                        '.profile h3 a',
-                        '.heading_4_5 a',
-                        '.internship-heading-container h3',
-                        '.heading a',
-                        'h3 a',
-                        '.profile a'
-                    ];
-                    
-                    for (var t = 0; t < titleSelectors.length; t++) {
-                        var titleElement = card.querySelector(titleSelectors[t]);
-                        if (titleElement && titleElement.textContent.trim()) {
-                            internship.title = titleElement.textContent.trim();
-                            break;
-                        }
-                    }
-                    
-                    // Get company - try multiple selectors
-                    var companySelectors = [
-                        '.company_name',
-                        '.heading_6',
-                        '.company-name',
-                        '.company a',
-                        'p a[href*="/company/"]'
-                    ];
-                    
-                    for (var c = 0; c < companySelectors.length; c++) {
-                        var companyElement = card.querySelector(companySelectors[c]);
-                        if (companyElement && companyElement.textContent.trim()) {
-                            internship.company = companyElement.textContent.trim();
-                            break;
-                        }
-                    }
-                    
-                    // Get location
-                    var locationSelectors = [
-                        'span.location_link',
-                        '.location',
-                        '.location_name',
-                        '[class*="location"]'
-                    ];
-                    
-                    for (var l = 0; l < locationSelectors.length; l++) {
-                        var locationElement = card.querySelector(locationSelectors[l]);
-                        if (locationElement && locationElement.textContent.trim()) {
-                            internship.location = locationElement.textContent.trim();
-                            break;
-                        }
-                    }
-                    
-                    // Get stipend
-                    var stipendElement = card.querySelector('.stipend, [class*="stipend"]');
-                    if (stipendElement && stipendElement.textContent.trim()) {
-                        internship.stipend = stipendElement.textContent.trim();
-                    }
-                    
-                    // Get duration
-                    var durationElement = card.querySelector('.internship_other_details_container .item_body, .duration, [class*="duration"]');
-                    if (durationElement && durationElement.textContent.trim()) {
-                        internship.duration = durationElement.textContent.trim();
-                    }
-                    
-                    // Get skills
-                    var skillElements = card.querySelectorAll('.round_tabs, .skill_tag, [class*="skill"]');
-                    for (var sk = 0; sk < skillElements.length; sk++) {
-                        var skillText = skillElements[sk].textContent.trim();
-                        if (skillText && internship.skills.length < 5) {
-                            internship.skills.push(skillText);
-                        }
-                    }
-                    
-                    // Only add if we have essential data
-                    if (internship.title && internship.company) {
-                        internships.push(internship);
-                    }
-                }
-                
-                return internships;
-            """, category)
-            
-            print(f"Extracted {len(internships_data)} internships from page")
-            
-            if not internships_data:
-                return {'count': 0, 'message': 'No internships found on the page'}
+                if high_water.intersection(i['internship_id'] for i in internships_data):
+                    stop_reason = 'high_water'
+                    break
+                if known >= SCRAPE_KNOWN_STOP_RATIO * len(internships_data):
+                    stop_reason = 'known'
+                    break
             
-            # Save to database
-            collection = self.model.collection
-            internships_to_save = []
-            
-            # Filter existing records
-            existing_ids = set()
-            if internships_data:
-                existing_cursor = collection.find(
-                    {"internship_id": {"$in": [i["internship_id"] for i in internships_data]}},
-                    {"internship_id": 1}
-                )
-                
-                for doc in existing_cursor:
-                    existing_ids.add(doc["internship_id"])
-            
-            # Only add new internships
-            for internship in internships_data:
-                if internship["internship_id"] not in existing_ids:
-                    internship["scraped_at"] = time.time()
-                    internships_to_save.append(internship)
+            seconds = time.monotonic() - started
+            run = {
+                'pages': pages,
+                'seen': seen,
+                'count': saved_count,
+                'seconds': round(seconds, 3),
+                'new_per_minute': round(saved_count * 60 / seconds, 1) if seconds else 0.0,
+                'stop_reason': stop_reason,
+                'finished_at': time.time()
+            }
+            with stage('persist'):
+                self.state.record_run(source, url_category, newest_ids, run)
             
-            # Batch insert
-            if internships_to_save:
-                collection.insert_many(internships_to_save)
-                print(f"Saved {len(internships_to_save)} new internships to database")
+            if not seen:
+                return {**run, 'message': 'No internships found on the page'}
             
-            message = f'Successfully scraped {len(internships_data)} internships, {len(internships_to_save)} new'
+            message = (f'Successfully scraped {seen} internships from {pages} page(s), {saved_count} new '
+                       f'({run["new_per_minute"]} new/min, stopped: {stop_reason})')
             print(message)
             
-            return {
-                'count': len(internships_to_save), 
-                'message': message
-            }
+            return {**run, 'message': message}
             
         except Exception as e:
             error_msg = f"Internshala scraping error: {str(e)}"
             print(error_msg)
             raise Exception(error_msg)
+
+    def _save_new(self, internships_data):
+        """Save the cards not in the database yet; returns (saved, already known)"""
+        collection = self.model.collection
+        internships_to_save = []
+        
+        # Filter existing records
+        existing_ids = set()
+        existing_cursor = collection.find(
+            {"internship_id": {"$in": [i["internship_id"] for i in internships_data]}},
+            {"internship_id": 1}
+        )
+        for doc in existing_cursor:
+            existing_ids.add(doc["internship_id"])
+        
+        # Only add new internships
+        for internship in internships_data:
+            if internship["internship_id"] not in existing_ids:
+                internship["scraped_at"] = time.time()
+                # Typed stipend/applicants/deadline/duration for range filters
+                internship.update(normalize_listing(internship))
+                internships_to_save.append(internship)
+        
+        # Batch insert; also keeps the statistics rollups current
+        saved_count = 0
+        if internships_to_save:
+            saved_count = self.model.insert_listings(internships_to_save)
+            print(f"Saved {saved_count} new internships to database")
+        known = sum(1 for i in internships_data if i["internship_id"] in existing_ids)
+        return saved_count, known
+
+    def _browser_cards(self, driver, url, category):
+        """Load the page in a pooled browser and extract every card in one script call"""
+        with stage('navigate'):
+            driver.get(url)
+            document_ready(driver)
+            
+            # Close popups using JavaScript
+            driver.execute_script(_CLOSE_POPUPS_JS)
             
-        finally:
-            try:
-                if driver:
-                    driver.quit()
-            except Exception as e:
-                print(f"Error closing driver: {str(e)}")
\ No newline at end of file
+            # Wait for the first card (no cards at all costs one step timeout)
+            element_present(driver, CARD_SELECTORS)
+        
+        # Use JavaScript to extract all internship data at once
+        with stage('extract'):
+            return driver.execute_script(_EXTRACT_CARDS_JS, category)
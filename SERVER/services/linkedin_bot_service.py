@@ -9,6 +9,21 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
+from services.wait_utils import (
+    document_ready, element_gone, element_in_view, element_present, element_visible,
+    network_idle, page_changes, url_contains
+)
+
+# URL fragments of pages only a signed-in member sees
+LOGGED_IN_URLS = ["feed", "mynetwork", "/in/"]
+JOB_LIST_SELECTORS = [
+    ".jobs-search-results__list",
+    ".jobs-search__results-list",
+    ".scaffold-layout__list-container",
+    ".jobs-search-results-list",
+    "[data-job-id]",
+]
+EASY_APPLY_MODAL_SELECTORS = [".jobs-easy-apply-modal", "[data-test-modal][role='dialog']", "[role='dialog']"]
 
 class LinkedInBot:
     def __init__(self, email, password=None, use_google_login=False, user_profile=None):
@@ -67,8 +82,8 @@ class LinkedInBot:
         try:
             print("[BOT] Step 1: Navigating to LinkedIn...")
             self.driver.get("https://www.linkedin.com/login")
-            print("[BOT] Step 2: Waiting 3 seconds...")
-            time.sleep(3)
+            print("[BOT] Step 2: Waiting for the page to load...")
+            document_ready(self.driver)
             
             # Check if already logged in (redirected to feed)
             print("[BOT] Step 3: Checking current URL...")
@@ -127,8 +142,8 @@ class LinkedInBot:
             login_button = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']")))
             login_button.click()
             
-            # Wait for successful login
-            time.sleep(5)
+            # Wait for successful login (or a verification page)
+            url_contains(self.driver, LOGGED_IN_URLS + ["checkpoint"], timeout=15)
             
             # Check if we're on the feed page
             if "feed" in self.driver.current_url or "mynetwork" in self.driver.current_url:
@@ -198,27 +213,25 @@ class LinkedInBot:
             
             if google_button:
                 print("[BOT] Clicking Google login button...")
+                url, windows = self.driver.current_url, len(self.driver.window_handles)
                 try:
                     google_button.click()
                 except:
                     # Try JavaScript click if regular click fails
                     self.driver.execute_script("arguments[0].click();", google_button)
                 
-                time.sleep(3)
+                page_changes(self.driver, url, window_count=windows, timeout=5)
                 
                 print("[BOT] ⏳ Please complete Google authentication in the browser window...")
                 print("[BOT] ⏳ Waiting for login to complete (timeout: 120 seconds)...")
                 print(f"[BOT] Current URL: {self.driver.current_url}")
                 
                 # Wait until we're redirected to LinkedIn feed
-                for i in range(120):
-                    current_url = self.driver.current_url
-                    if "feed" in current_url or "mynetwork" in current_url or "/in/" in current_url:
+                for i in range(0, 120, 10):
+                    if url_contains(self.driver, LOGGED_IN_URLS, timeout=10, poll=1):
                         print("[BOT] ✓ Google login successful!")
                         return True
-                    if i % 10 == 0:  # Log every 10 seconds
-                        print(f"[BOT] Still waiting... ({i}/120 seconds)")
-                    time.sleep(1)
+                    print(f"[BOT] Still waiting... ({i + 10}/120 seconds)")
                 
                 print("[BOT] ✗ Google login timed out")
                 print(f"[BOT] Final URL: {self.driver.current_url}")
@@ -257,7 +270,7 @@ class LinkedInBot:
             print(f"[BOT] Navigating to: {search_url}")
             self.driver.get(search_url)
             print(f"[BOT] Waiting for page to load...")
-            time.sleep(5)
+            element_present(self.driver, JOB_LIST_SELECTORS, timeout=15)
             
             print(f"[BOT] Current URL: {self.driver.current_url}")
             print(f"[BOT] Page title: {self.driver.title}")
@@ -360,14 +373,14 @@ class LinkedInBot:
                     for btn in discard_buttons:
                         if "discard" in btn.text.lower():
                             btn.click()
-                            time.sleep(1)
+                            element_gone(self.driver, discard_modal[0], timeout=3)
                             break
             except:
                 pass
             
             # Scroll the job card into view
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", job_card)
-            time.sleep(1)
+            element_in_view(self.driver, job_card, timeout=2)
             
             # Click on the job card to view details
             try:
@@ -376,11 +389,16 @@ class LinkedInBot:
                 # Try JavaScript click if regular click fails
                 self.driver.execute_script("arguments[0].click();", job_card)
             
-            time.sleep(2)
+            # The details pane shows the clicked job once the URL carries its id
+            job_id = job_card.get_attribute("data-job-id")
+            if job_id:
+                url_contains(self.driver, f"currentJobId={job_id}", timeout=5)
             
             # Look for Easy Apply button
             try:
-                easy_apply_button = self.driver.find_element(By.CSS_SELECTOR, "button.jobs-apply-button")
+                easy_apply_button = element_visible(self.driver, "button.jobs-apply-button")
+                if easy_apply_button is None:
+                    raise NoSuchElementException("button.jobs-apply-button")
                 if "Easy Apply" in easy_apply_button.text or "easy apply" in easy_apply_button.text.lower():
                     print("[BOT] Found Easy Apply button, clicking...")
                     try:
@@ -388,7 +406,7 @@ class LinkedInBot:
                     except:
                         self.driver.execute_script("arguments[0].click();", easy_apply_button)
                     
-                    time.sleep(3)
+                    element_visible(self.driver, EASY_APPLY_MODAL_SELECTORS)
                     
                     # Handle the Easy Apply modal
                     # Check if it's a simple one-click apply or multi-step
@@ -417,7 +435,7 @@ class LinkedInBot:
                                     if btn.is_displayed() and ("next" in btn.text.lower() or "continue" in btn.text.lower()):
                                         print("[BOT] Clicking Next button...")
                                         btn.click()
-                                        time.sleep(2)
+                                        network_idle(self.driver, timeout=5)
                                         
                                         # Fill next page if needed
                                         if self.user_profile:
@@ -445,7 +463,7 @@ class LinkedInBot:
                                     if submit_button.is_displayed() and "submit" in submit_button.get_attribute("aria-label").lower():
                                         print("[BOT] Found simple submit button, clicking...")
                                         submit_button.click()
-                                        time.sleep(2)
+                                        network_idle(self.driver, timeout=5)
                                         print("[BOT] ✓ Application submitted!")
                                         submitted = True
                                         break
@@ -519,8 +537,6 @@ class LinkedInBot:
                         print(f"[BOT] Filled GitHub URL")
                 except:
                     continue
-            
-            time.sleep(1)
         except Exception as e:
             print(f"[BOT] Error filling form: {e}")
     
@@ -532,18 +548,17 @@ class LinkedInBot:
             for btn in dismiss_buttons:
                 if btn.is_displayed():
                     btn.click()
-                    time.sleep(1)
                     break
             
-            # Handle discard confirmation
-            time.sleep(1)
+            # Handle discard confirmation (shown only when the form was touched)
+            element_visible(self.driver, "button[data-test-dialog-primary-btn]", timeout=2)
             discard_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button[data-test-dialog-primary-btn]")
             for btn in discard_buttons:
                 try:
                     if btn.is_displayed() and "discard" in btn.text.lower():
                         print("[BOT] Clicking Discard button...")
                         btn.click()
-                        time.sleep(1)
+                        element_gone(self.driver, btn, timeout=3)
                         break
                 except:
                     continue
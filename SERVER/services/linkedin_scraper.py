@@ -1,18 +1,90 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import os
 import time
 from models.linkedinInternships import LinkedInInternshipModel  # Custom MongoDB model
+from services.listing_normalizer import normalize_listing
+from services.wait_utils import element_clickable, element_gone, element_present, page_grows
+from services.webdriver_pool import get_pool
+from utils.stage_timer import stage
+
+# Cards read per scrape
+MAX_CARDS = 15
+# Times the results list is scrolled to the bottom to load more cards
+MAX_SCROLLS = 2
+# Site the job search is loaded from; point it at a replay server
+# (python -m benchmarks.scrape_replay serve) to scrape offline
+LINKEDIN_BASE_URL = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com')
+
+CARD_SELECTORS = [
+    'ul.jobs-search__results-list li',
+    '.jobs-search-results__list-item',
+    '.job-search-card',
+    "[data-entity-urn*='jobPosting']",
+]
+
+# Reads title, company, location, salary and link from the first arguments[0]
+# job cards (found with the arguments[1] selectors) in one round trip, with the
+# same selector fallbacks per field
+_EXTRACT_CARDS_JS = """
+    var cardSelectors = arguments[1];
+    var fieldSelectors = {
+        title: ['h3 a span[title]', 'h3 a span', '.job-search-card__title a', 'h3', '[data-entity-urn] h3'],
+        company: ['h4 a span[title]', 'h4 a span', '.job-search-card__subtitle a', 'h4', '[data-entity-urn] h4'],
+        location: ['.job-search-card__location', '.artdeco-entity-lockup__caption',
+                   "div[class*='location']", "span[class*='location']"],
+        // Salary is only shown on some cards
+        stipend: ['.job-search-card__salary-info', "[class*='salary']"]
+    };
+
+    function firstText(card, selectors) {
+        for (var i = 0; i < selectors.length; i++) {
+            var element = card.querySelector(selectors[i]);
+            if (element) {
+                var text = element.getAttribute('title') || (element.innerText || element.textContent || '').trim();
+                if (text) {
+                    return text;
+                }
+            }
+        }
+        return null;
+    }
+
+    var cards = [];
+    for (var s = 0; s < cardSelectors.length; s++) {
+        cards = document.querySelectorAll(cardSelectors[s]);
+        if (cards.length > 0) {
+            break;
+        }
+    }
+
+    var results = [];
+    for (var c = 0; c < Math.min(cards.length, arguments[0]); c++) {
+        var card = cards[c];
+        var result = {};
+        for (var field in fieldSelectors) {
+            result[field] = firstText(card, fieldSelectors[field]);
+        }
+        var anchor = card.querySelector('h3 a, .job-search-card__title a, a[data-entity-urn]');
+        result.link = anchor && anchor.href ? anchor.href.split('?')[0] : null;
+        results.push(result);
+    }
+    return results;
+"""
 
-class LinkedInScraper:
-    def __init__(self):
-        self.model = LinkedInInternshipModel()
 
-    def _setup_driver(self):
+class LinkedInScraper:
+    # Request filters the search uses besides the category
+    FILTERS = ('usertype', 'passing_year', 'quick_apply')
+
+    def __init__(self, model=None, base_url=None):
+        # Controllers pass their own model so both share one collection handle
+        self.model = model or LinkedInInternshipModel()
+        self.base_url = (base_url or LINKEDIN_BASE_URL).rstrip('/')
+        # Warm browser sessions shared by every LinkedIn scrape in the process
+        self.pool = get_pool('linkedin', self._chrome_options, page_load_timeout=30)
+
+    @staticmethod
+    def _chrome_options():
         chrome_options = Options()
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920x1080')
@@ -23,18 +95,25 @@ class LinkedInScraper:
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
-        # chrome_options.add_argument('--headless')  # Uncomment for headless mode
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.set_page_load_timeout(30)  # 30 second page load timeout
-        wait = WebDriverWait(driver, 15)  # Reduced from 20 to 15
-        driver.implicitly_wait(10)  # Reduced from 20 to 10
+        # Headless is set by the pool (WEBDRIVER_HEADLESS)
+        return chrome_options
 
-        return driver, wait
+    def search_url(self, filters):
+        """Job search URL for the filters' category, user type and Easy Apply setting"""
+        keywords = f"internship {filters.get('category', 'internship')}".replace('-', ' ')
+        query = f"?keywords={keywords.replace(' ', '%20')}&f_WT=2&f_TPR=r86400&location=India"
+        
+        if filters.get('quick_apply', True):
+            query += "&f_AL=true"  # LinkedIn Easy Apply filter
+        if filters.get('usertype', 'fresher') == "fresher":
+            query += "&f_E=1"  # Entry-level only for freshers
+        return f"{self.base_url}/jobs/search/{query}"
 
     def scrape_internships(self, filters):
-        driver, wait = self._setup_driver()
+        with self.pool.session() as driver:
+            return self._scrape_page(driver, filters)
+
+    def _scrape_page(self, driver, filters):
         count = 0
 
         try:
@@ -44,141 +123,74 @@ class LinkedInScraper:
             quick_apply = filters.get('quick_apply', True)
 
             # Construct LinkedIn search URL with better parameters
-            base_url = "https://www.linkedin.com/jobs/search/"
-            keywords = f"internship {category}".replace('-', ' ')
-            query = f"?keywords={keywords.replace(' ', '%20')}&f_WT=2&f_TPR=r86400&location=India"
-            
-            if quick_apply:
-                query += "&f_AL=true"  # LinkedIn Easy Apply filter
-            if usertype == "fresher":
-                query += "&f_E=1"  # Entry-level only for freshers
-
-            print(f"Scraping LinkedIn with URL: {base_url + query}")
-            driver.get(base_url + query)
-            time.sleep(5)
-
-            # Handle potential popups/modals
-            try:
-                # Close any modal that might appear
-                close_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Dismiss']")
-                close_button.click()
-                time.sleep(1)
-            except:
-                pass
-
-            # Scroll to load more jobs (reduced scrolling for faster scraping)
-            for i in range(2):  # Reduced from 3 to 2
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)  # Reduced from 3 to 2 seconds
-                print(f"Scrolled {i+1} times")
-
-            # Try multiple selectors for job cards
-            job_cards = []
-            selectors = [
-                "ul.jobs-search__results-list li",
-                ".jobs-search-results__list-item",
-                ".job-search-card",
-                "[data-entity-urn*='jobPosting']"
-            ]
-
-            for selector in selectors:
+            url = self.search_url(filters)
+            print(f"Scraping LinkedIn with URL: {url}")
+            with stage('navigate'):
+                driver.get(url)
+                element_present(driver, CARD_SELECTORS)
+
+                # Handle potential popups/modals (checked once, so a missing one costs nothing)
                 try:
-                    job_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if job_cards:
-                        print(f"Found {len(job_cards)} job cards using selector: {selector}")
-                        break
+                    # Close any modal that might appear
+                    close_button = element_clickable(driver, "button[aria-label='Dismiss']", timeout=0)
+                    if close_button:
+                        close_button.click()
+                        element_gone(driver, close_button, timeout=2)
                 except:
-                    continue
+                    pass
 
-            if not job_cards:
-                print("No job cards found with any selector")
-                return {'count': 0, 'message': 'No job listings found on LinkedIn'}
+                # Scroll to load more jobs, moving on as soon as the list grows
+                for i in range(MAX_SCROLLS):
+                    height = driver.execute_script("window.scrollTo(0, document.body.scrollHeight); "
+                                                   "return document.body.scrollHeight;")
+                    if not page_grows(driver, height, timeout=3):
+                        break
+                    print(f"Scrolled {i+1} times")
 
-            collection = self.model.collection
+            # Read every card's fields in one script call; a selector that
+            # misses costs nothing, unlike a find_element under an implicit wait
+            with stage('extract'):
+                cards = driver.execute_script(_EXTRACT_CARDS_JS, MAX_CARDS, CARD_SELECTORS)
 
-            for i, card in enumerate(job_cards[:15]):  # Limit to first 15 jobs for faster scraping
-                try:
-                    # Try multiple selectors for each field
-                    title = self._extract_text(card, [
-                        "h3 a span[title]",
-                        "h3 a span",
-                        ".job-search-card__title a",
-                        "h3",
-                        "[data-entity-urn] h3"
-                    ])
-
-                    company = self._extract_text(card, [
-                        "h4 a span[title]",
-                        "h4 a span", 
-                        ".job-search-card__subtitle a",
-                        "h4",
-                        "[data-entity-urn] h4"
-                    ])
-
-                    location = self._extract_text(card, [
-                        ".job-search-card__location",
-                        ".artdeco-entity-lockup__caption",
-                        "div[class*='location']",
-                        "span[class*='location']"
-                    ])
-
-                    # Get the job link
-                    link = None
-                    try:
-                        link_element = card.find_element(By.CSS_SELECTOR, "h3 a, .job-search-card__title a, a[data-entity-urn]")
-                        link = link_element.get_attribute("href").split("?")[0]
-                    except:
-                        pass
-
-                    if title and company:  # Only save if we have essential data
-                        internship_data = {
-                            "title": title,
-                            "company": company,
-                            "location": location or "Not specified",
-                            "apply_link": link,
-                            "category": category,
-                            "usertype": usertype,
-                            "quick_apply": quick_apply,
-                            "passing_year": passing_year,
-                            "scraped_at": time.time()
-                        }
-
-                        # Check for duplicates
-                        existing = collection.find_one({
-                            "title": title,
-                            "company": company
-                        })
-
-                        if not existing:
-                            collection.insert_one(internship_data)
-                            count += 1
-                            print(f"Saved: {title} at {company}")
-
-                except Exception as e:
-                    print(f"Error processing job card {i}: {str(e)}")
-                    continue
-
-            message = f'Successfully scraped {count} LinkedIn internships'
+            if not cards:
+                print("No job cards found with any selector")
+                return {'count': 0, 'message': 'No job listings found on LinkedIn'}
+            print(f"Extracted {len(cards)} job cards from page")
+
+            listings = []
+
+            for card in cards:
+                title, company, location, link = card['title'], card['company'], card['location'], card['link']
+                if title and company:  # Only save if we have essential data
+                    internship_data = {
+                        "title": title,
+                        "company": company,
+                        "location": location or "Not specified",
+                        "apply_link": link,
+                        "category": category,
+                        "usertype": usertype,
+                        "quick_apply": quick_apply,
+                        "passing_year": passing_year,
+                        "stipend": card['stipend'] or "Not mentioned",
+                        "scraped_at": time.time()
+                    }
+                    internship_data.update(normalize_listing(internship_data))
+                    internship_data["listing_key"] = self.model.listing_key(
+                        title, company, internship_data["location"], link
+                    )
+                    listings.append(internship_data)
+
+            # One unordered bulk upsert for the whole batch, keyed on listing_key
+            with stage('persist'):
+                written = self.model.upsert_listings(listings)
+            count = written['inserted']
+
+            message = (f"Successfully scraped {count} new LinkedIn internships "
+                       f"({written['updated']} updated, {written['unchanged']} unchanged)")
             print(message)
-            return {'count': count, 'message': message}
+            return {'count': count, 'message': message, **written}
 
         except Exception as e:
             error_msg = f"LinkedIn scraping error: {str(e)}"
             print(error_msg)
-            return {'count': 0, 'message': error_msg}
-
-        finally:
-            if driver:
-                driver.quit()
-
-    def _extract_text(self, element, selectors):
-        """Try multiple selectors to extract text"""
-        for selector in selectors:
-            try:
-                found_element = element.find_element(By.CSS_SELECTOR, selector)
-                text = found_element.get_attribute("title") or found_element.text.strip()
-                if text:
-                    return text
-            except:
-                continue
-        return None
+            return {'success': False, 'count': 0, 'message': error_msg}
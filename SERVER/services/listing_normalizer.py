@@ -0,0 +1,162 @@
+# services/listing_normalizer.py
+"""
+Turns the free-text fields scrapers collect ("₹ 10,000 - 15,000 /month",
+"100+ applicants", "3 Months", "12 days left") into typed fields that can be
+indexed and range-queried:
+
+    stipend_min, stipend_max   rupees per month (0 for unpaid)
+    applicants_count           int
+    deadline                   datetime (UTC midnight of the last day to apply)
+    duration_weeks             int
+
+The original text fields are kept for display. A value that can't be parsed
+is stored as None, so every normalized document carries all five keys.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+NORMALIZED_FIELDS = ('stipend_min', 'stipend_max', 'applicants_count', 'deadline', 'duration_weeks')
+
+_NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_WEEKS_PER_MONTH = 52 / 12
+
+# Multiplier from a stipend's quoted period to a monthly amount
+_STIPEND_PERIODS = [
+    (re.compile(r'/\s*(?:week|wk)|per\s+week|weekly', re.I), _WEEKS_PER_MONTH),
+    (re.compile(r'/\s*(?:year|yr|annum)|per\s+(?:year|annum)|yearly|annually|\blpa\b|\bp\.?a\.?\b', re.I), 1 / 12),
+    (re.compile(r'/\s*(?:month|mo)|per\s+month|monthly', re.I), 1),
+]
+_LUMP_SUM = re.compile(r'lump\s*sum', re.I)
+_UNPAID = re.compile(r'\bunpaid\b', re.I)
+_DURATION_UNITS = [
+    (re.compile(r'month', re.I), _WEEKS_PER_MONTH),
+    (re.compile(r'week', re.I), 1),
+    (re.compile(r'day', re.I), 1 / 7),
+    (re.compile(r'year', re.I), 52),
+]
+
+
+def _numbers(text):
+    return [float(n.replace(',', '')) for n in _NUMBER.findall(text)]
+
+
+def parse_duration_weeks(text):
+    """'3 Months' -> 13, '6 Weeks' -> 6; None if there is no number or unit"""
+    if not isinstance(text, str):
+        return None
+    numbers = _numbers(text)
+    if not numbers:
+        return None
+    for pattern, weeks in _DURATION_UNITS:
+        if pattern.search(text):
+            return max(1, int(round(max(numbers) * weeks)))
+    return None
+
+
+def parse_stipend(text, duration_weeks=None):
+    """
+    Monthly (min, max) in rupees. Weekly and yearly amounts are converted;
+    a lump sum is spread over the duration when that is known. Returns
+    (None, None) for 'Not mentioned', 'Performance based' and the like.
+    """
+    if not isinstance(text, str):
+        return None, None
+    # Incentives are a bonus on top of the base stipend, not part of it
+    base = re.split(r'\+|incentive', text, maxsplit=1, flags=re.I)[0]
+    numbers = _numbers(base)
+    if not numbers:
+        return (0, 0) if _UNPAID.search(text) else (None, None)
+
+    if _LUMP_SUM.search(text):
+        if not duration_weeks:
+            return None, None
+        factor = _WEEKS_PER_MONTH / duration_weeks
+    else:
+        factor = next((f for pattern, f in _STIPEND_PERIODS if pattern.search(text)), 1)
+        if re.search(r'\blpa\b', text, re.I):
+            factor *= 100000
+
+    low, high = min(numbers), max(numbers)
+    return int(round(low * factor)), int(round(high * factor))
+
+
+def parse_applicants(text):
+    """'100+ applicants' -> 100, 'Be an early applicant' -> 0, 'N/A' -> None"""
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return int(text)
+    if not isinstance(text, str):
+        return None
+    numbers = _numbers(text)
+    if numbers:
+        return int(numbers[0])
+    if re.search(r'early applicant|no applicants', text, re.I):
+        return 0
+    return None
+
+
+def parse_days_left(text):
+    """'12 days left' -> 12, 'Today' -> 0, 'N/A' -> None"""
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return int(text)
+    if not isinstance(text, str):
+        return None
+    if re.search(r'\btoday\b', text, re.I):
+        return 0
+    numbers = _numbers(text)
+    if not numbers:
+        return None
+    days = numbers[0]
+    if re.search(r'week', text, re.I):
+        days *= 7
+    elif re.search(r'month', text, re.I):
+        days *= 30
+    return int(days)
+
+
+def _day_start(moment):
+    return datetime(moment.year, moment.month, moment.day)
+
+
+def deadline_from_days_left(days_left, scraped_at=None):
+    """UTC midnight of the deadline day, counted from when the card was scraped"""
+    if days_left is None:
+        return None
+    scraped = datetime.fromtimestamp(scraped_at, timezone.utc) if scraped_at else datetime.now(timezone.utc)
+    return _day_start(scraped) + timedelta(days=days_left)
+
+
+def normalize_listing(listing):
+    """The typed fields for one scraped listing (all of NORMALIZED_FIELDS)"""
+    duration_weeks = parse_duration_weeks(listing.get('duration'))
+    stipend_min, stipend_max = parse_stipend(listing.get('stipend'), duration_weeks)
+    return {
+        'stipend_min': stipend_min,
+        'stipend_max': stipend_max,
+        'applicants_count': parse_applicants(listing.get('applicants')),
+        'deadline': deadline_from_days_left(parse_days_left(listing.get('days_left')), listing.get('scraped_at')),
+        'duration_weeks': duration_weeks,
+    }
+
+
+def range_filters(args, now=None):
+    """
+    Mongo filters for the list routes' range parameters:
+    ?min_stipend=  ?max_days_left=  ?max_applicants=
+    Values that aren't integers are ignored, like the other filters.
+    """
+    filters = {}
+    min_stipend = args.get('min_stipend', type=int)
+    if min_stipend is not None:
+        filters['stipend_min'] = {'$gte': min_stipend}
+
+    max_days_left = args.get('max_days_left', type=int)
+    if max_days_left is not None:
+        # Still open, and closing within the window
+        today = _day_start(now or datetime.now(timezone.utc))
+        filters['deadline'] = {'$gte': today, '$lte': today + timedelta(days=max(0, max_days_left))}
+
+    max_applicants = args.get('max_applicants', type=int)
+    if max_applicants is not None:
+        filters['applicants_count'] = {'$lte': max_applicants}
+    return filters
+
@@ -7,9 +7,9 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
 import pickle
 import os
+from services.wait_utils import document_ready, page_changes, url_contains
 
 class OAuthHelper:
     """Helper class for OAuth authentication flows"""
@@ -71,18 +71,11 @@ class OAuthHelper:
             print(f"Waiting up to {timeout} seconds...")
             print(f"{'='*60}\n")
             
-            start_time = time.time()
-            
-            while time.time() - start_time < timeout:
-                current_url = driver.current_url
-                
-                # Check if we've reached the success URL
-                if success_url_pattern in current_url:
-                    print(f"\n✓ Login successful for {self.platform_name}!")
-                    self.save_session(driver)
-                    return True
-                
-                time.sleep(2)
+            # Check once a second until we've reached the success URL
+            if url_contains(driver, success_url_pattern, timeout=timeout, poll=1):
+                print(f"\n✓ Login successful for {self.platform_name}!")
+                self.save_session(driver)
+                return True
             
             print(f"\n✗ Login timeout for {self.platform_name}")
             return False
@@ -110,8 +103,9 @@ class OAuthHelper:
                     button = wait.until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
+                    url, windows = driver.current_url, len(driver.window_handles)
                     button.click()
-                    time.sleep(2)
+                    page_changes(driver, url, window_count=windows, timeout=5)
                     return True
                 except:
                     continue
@@ -121,8 +115,9 @@ class OAuthHelper:
                 buttons = driver.find_elements(By.TAG_NAME, "button")
                 for button in buttons:
                     if "google" in button.text.lower():
+                        url, windows = driver.current_url, len(driver.window_handles)
                         button.click()
-                        time.sleep(2)
+                        page_changes(driver, url, window_count=windows, timeout=5)
                         return True
             except:
                 pass
@@ -155,12 +150,12 @@ class GoogleLoginAutomation:
         
         # Navigate to Internshala login page
         driver.get("https://internshala.com/login")
-        time.sleep(2)
+        document_ready(driver)
         
         # Try to load existing session
         if oauth_helper.load_session(driver):
             driver.refresh()
-            time.sleep(2)
+            document_ready(driver)
             
             # Check if already logged in
             if "dashboard" in driver.current_url or "student" in driver.current_url:
@@ -190,11 +185,11 @@ class GoogleLoginAutomation:
         oauth_helper = OAuthHelper("linkedin")
         
         driver.get("https://www.linkedin.com/login")
-        time.sleep(2)
+        document_ready(driver)
         
         if oauth_helper.load_session(driver):
             driver.refresh()
-            time.sleep(2)
+            document_ready(driver)
             
             if "feed" in driver.current_url or "mynetwork" in driver.current_url:
                 return True
@@ -220,11 +215,11 @@ class GoogleLoginAutomation:
         oauth_helper = OAuthHelper("unstop")
         
         driver.get("https://unstop.com/login")
-        time.sleep(2)
+        document_ready(driver)
         
         if oauth_helper.load_session(driver):
             driver.refresh()
-            time.sleep(2)
+            document_ready(driver)
             
             if "dashboard" in driver.current_url or "profile" in driver.current_url:
                 return True
@@ -0,0 +1,57 @@
+# services/scrape_demand.py
+"""
+Demand signals for the scrape scheduler: how often each category is listed.
+
+The list routes count ?category= requests in memory (no I/O per request,
+and cache hits count too), and flush_demand() adds the counts to the
+`queries` totals in scrape_state, where the scheduler reads them, whether it
+runs in this process or on its own.
+"""
+import threading
+from collections import Counter
+from functools import wraps
+from flask import request
+from models.scrape_state_model import ScrapeStateModel, category_key
+
+_counts = Counter()
+_lock = threading.Lock()
+_state = ScrapeStateModel()
+
+
+def record_demand(sources, category):
+    if not category:
+        return
+    key = category_key(category)
+    with _lock:
+        for source in sources:
+            _counts[(source, key)] += 1
+
+
+def flush_demand(state=None):
+    """Write the counts gathered since the last flush; returns how many (source, category) pairs"""
+    global _counts
+    with _lock:
+        counts, _counts = _counts, Counter()
+    if not counts:
+        return 0
+    try:
+        (state or _state).add_queries(counts)
+    except Exception:
+        # Keep them for the next flush rather than lose the signal
+        with _lock:
+            _counts.update(counts)
+        raise
+    return len(counts)
+
+
+def tracks_demand(sources):
+    """Decorator counting each request's ?category= as demand on `sources` (collection names)"""
+    sources = (sources,) if isinstance(sources, str) else tuple(sources)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            record_demand(sources, request.args.get('category'))
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,142 @@
+# services/scrape_engine.py
+"""
+Pluggable fetch/parse engines for the listing scrapers.
+
+Most listing pages are rendered on the server, so the cheap path is one
+GET over a keep-alive requests.Session plus a BeautifulSoup parse. A real
+browser is only needed when that static HTML has no cards (a JS-rendered
+variant, a bot wall). Each engine turns a URL into a list of card dicts:
+
+    HttpEngine      requests + a parse(html, context) function
+    BrowserEngine   a WebDriverPool session + an extract(driver, url, context) function
+
+and FallbackEngine tries them in order until one returns cards. SCRAPE_ENGINE
+picks the chain: 'auto' (HTTP, then browser), 'http' or 'browser'.
+"""
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.stage_timer import stage
+
+SCRAPE_ENGINE = os.getenv('SCRAPE_ENGINE', 'auto').lower()
+SCRAPE_HTTP_TIMEOUT = float(os.getenv('SCRAPE_HTTP_TIMEOUT', '15'))
+SCRAPE_HTTP_RETRIES = int(os.getenv('SCRAPE_HTTP_RETRIES', '2'))
+
+# A desktop browser's headers; some listing sites serve a stripped page otherwise
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-IN,en;q=0.9',
+}
+
+
+class HttpPageFetcher:
+    """GETs pages over one keep-alive session per thread, retrying transient failures"""
+
+    def __init__(self, timeout=SCRAPE_HTTP_TIMEOUT, retries=SCRAPE_HTTP_RETRIES, headers=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = headers or DEFAULT_HEADERS
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            retry = Retry(total=self.retries, backoff_factor=0.5,
+                          status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',))
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url):
+        """Body of `url` as text; raises requests.RequestException on failure"""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher():
+    """The process-wide HttpPageFetcher"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = HttpPageFetcher()
+        return _fetcher
+
+
+class HttpEngine:
+    name = 'http'
+
+    def __init__(self, parse, fetcher=None):
+        self.parse = parse
+        self.fetcher = fetcher or get_fetcher()
+
+    def fetch_cards(self, url, context=None):
+        with stage('navigate'):
+            html = self.fetcher.get(url)
+        with stage('extract'):
+            return self.parse(html, context)
+
+
+class BrowserEngine:
+    name = 'browser'
+
+    def __init__(self, pool, extract):
+        self.pool = pool
+        self.extract = extract
+
+    def fetch_cards(self, url, context=None):
+        with self.pool.session() as driver:
+            return self.extract(driver, url, context)
+
+
+class FallbackEngine:
+    """Tries each engine in turn until one finds cards"""
+
+    def __init__(self, *engines):
+        self.engines = engines
+
+    def fetch_cards(self, url, context=None, fallback=True):
+        """
+        Returns (cards, name of the engine that produced them). With
+        fallback=False only the first engine is tried.
+        """
+        engines = self.engines if fallback else self.engines[:1]
+        cards, name = [], None
+        for index, engine in enumerate(engines):
+            name = engine.name
+            last = index == len(engines) - 1
+            try:
+                cards = engine.fetch_cards(url, context)
+            except requests.RequestException as e:
+                if last:
+                    raise
+                print(f"[WARNING] {engine.name} fetch of {url} failed ({str(e)}), falling back")
+                continue
+            if cards:
+                return cards, name
+            if not last:
+                print(f"[WARNING] No cards in the {engine.name} response for {url}, falling back")
+        return cards, name
+
+
+def build_engine(http_engine, browser_engine, mode=None):
+    """The engine chain for SCRAPE_ENGINE (or `mode`)"""
+    mode = (mode or SCRAPE_ENGINE).lower()
+    if mode == 'http':
+        return FallbackEngine(http_engine)
+    if mode == 'browser':
+        return FallbackEngine(browser_engine)
+    return FallbackEngine(http_engine, browser_engine)
@@ -0,0 +1,185 @@
+# services/scrape_jobs.py
+"""
+Scrapes as background jobs, so the /scrape routes answer at once.
+
+submit_scrape_job() records a job in scrape_jobs and hands it to a small
+worker pool (SCRAPE_JOB_WORKERS) that runs it through the shared
+ScrapeOrchestrator. The route returns 202 with the job id, and clients poll
+GET /api/v1/scrape-jobs/<id> or follow /api/v1/scrape-jobs/<id>/events
+(Server-Sent Events). A request identical to one still queued or running
+(same platforms, categories and filters) attaches to that job instead of
+starting another, across app processes too.
+
+While this process holds a job, queued or running, it refreshes the job's
+updated_at every SCRAPE_JOB_HEARTBEAT_SECONDS and after each finished
+category, so only a job whose process died goes stale.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from models.scrape_job_model import FAILED, FINISHED, SUCCEEDED, ScrapeJobModel
+from models.scrape_state_model import category_key
+from services.scrape_orchestrator import get_orchestrator
+
+SCRAPE_JOB_WORKERS = int(os.getenv('SCRAPE_JOB_WORKERS', '2'))
+SCRAPE_JOB_STALE_SECONDS = float(os.getenv('SCRAPE_JOB_STALE_SECONDS', '1800'))
+SCRAPE_JOB_TTL_HOURS = float(os.getenv('SCRAPE_JOB_TTL_HOURS', '24'))
+SCRAPE_JOB_EVENT_POLL_SECONDS = float(os.getenv('SCRAPE_JOB_EVENT_POLL_SECONDS', '1'))
+SCRAPE_JOB_HEARTBEAT_SECONDS = float(os.getenv('SCRAPE_JOB_HEARTBEAT_SECONDS', '60'))
+
+JOBS_URL = '/api/v1/scrape-jobs'
+
+_jobs = ScrapeJobModel()
+_executor = ThreadPoolExecutor(max_workers=max(1, SCRAPE_JOB_WORKERS), thread_name_prefix='scrape-job')
+# Jobs this process has queued or is running
+_live = set()
+_live_lock = threading.Lock()
+_heartbeat = None
+_indexes_ready = False
+_indexes_lock = threading.Lock()
+
+
+def _ensure_job_indexes():
+    """
+    Build the scrape_jobs indexes once, before the first job is created:
+    deduplication relies on the unique index on active_key, and init_database
+    builds the manifest in the background, if at all (MONGO_ENSURE_INDEXES).
+    """
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    from database.indexes import INDEX_MANIFEST, ensure_indexes
+
+    with _indexes_lock:
+        if not _indexes_ready:
+            report = ensure_indexes([entry for entry in INDEX_MANIFEST if entry['collection'] is ScrapeJobModel])
+            # Failures were reported; try again on the next submit
+            _indexes_ready = not report['failed']
+
+
+def _beat_forever():
+    while True:
+        time.sleep(SCRAPE_JOB_HEARTBEAT_SECONDS)
+        with _live_lock:
+            job_ids = list(_live)
+        try:
+            _jobs.touch(job_ids)
+        except Exception as e:
+            print(f"[WARNING] Could not refresh scrape job heartbeats: {str(e)}")
+
+
+def _hold(job_id):
+    global _heartbeat
+    with _live_lock:
+        _live.add(job_id)
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=_beat_forever, name='scrape-job-heartbeat', daemon=True)
+            _heartbeat.start()
+
+
+def _dedup_key(platforms, categories, filters):
+    request = {'platforms': sorted(platforms), 'categories': sorted(categories), 'filters': filters}
+    return hashlib.sha1(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def submit_scrape_job(platforms, categories, filters=None):
+    """
+    Queue a scrape of every category on every platform, or attach to the
+    identical one in flight. Returns (job, created). Raises ValueError for an
+    unknown platform or an empty request.
+    """
+    orchestrator = get_orchestrator()
+    platforms = list(dict.fromkeys(platforms))
+    categories = list(dict.fromkeys(category_key(c) for c in categories if c))
+    orchestrator.validate(platforms)
+    if not platforms or not categories:
+        raise ValueError('At least one platform and one category are required')
+
+    # Only filters the platforms' scrapers read, so requests differing in
+    # nothing else (e.g. LinkedIn options on an Internshala crawl) share a job
+    filters = orchestrator.used_filters(platforms, filters)
+    _ensure_job_indexes()
+    job, created = _jobs.create_or_attach(
+        {'platforms': platforms, 'categories': categories, 'filters': filters,
+         'total': len(platforms) * len(categories),
+         'dedup_key': _dedup_key(platforms, categories, filters)},
+        stale_after=SCRAPE_JOB_STALE_SECONDS, ttl_hours=SCRAPE_JOB_TTL_HOURS
+    )
+    if created:
+        _hold(job['_id'])
+        _executor.submit(_run_job, job['_id'], platforms, categories, filters)
+    return job, created
+
+
+def _run_job(job_id, platforms, categories, filters):
+    try:
+        if not _jobs.start(job_id):
+            print(f"[WARNING] Scrape job {job_id} was no longer queued; skipped")
+            return
+        try:
+            result = get_orchestrator().run(platforms, categories, filters,
+                                            on_result=lambda _: _jobs.progress(job_id))
+        except Exception as e:
+            print(f"[ERROR] Scrape job {job_id} failed: {str(e)}")
+            _jobs.finish(job_id, FAILED, SCRAPE_JOB_TTL_HOURS, message=str(e))
+            return
+        status = SUCCEEDED if result['succeeded'] else FAILED
+        message = f"{result['total_count']} new listings from {result['succeeded']}/{len(result['results'])} scrapes"
+        if _jobs.finish(job_id, status, SCRAPE_JOB_TTL_HOURS, result=result, message=message):
+            print(f"[SUCCESS] Scrape job {job_id} {status}: {message}")
+        else:
+            print(f"[WARNING] Scrape job {job_id} had already been failed elsewhere; result not saved")
+    finally:
+        with _live_lock:
+            _live.discard(job_id)
+
+
+def get_job(job_id):
+    return _jobs.get(job_id)
+
+
+def wait_for_job(job_id, poll=SCRAPE_JOB_EVENT_POLL_SECONDS):
+    """Block until the job finishes and return it; None if it is gone or its worker went stale"""
+    while True:
+        job = _jobs.get(job_id)
+        if job is None or job['status'] in FINISHED:
+            return job
+        if job['updated_at'] < time.time() - SCRAPE_JOB_STALE_SECONDS:
+            return None
+        time.sleep(poll)
+
+
+def recent_jobs(limit=20):
+    return _jobs.recent(limit)
+
+
+def job_view(job):
+    """The job as the API shows it, with its status and events URLs"""
+    view = {key: value for key, value in job.items() if key not in ('_id', 'active_key', 'expires_at', 'dedup_key')}
+    view['job_id'] = job['_id']
+    view['status_url'] = f"{JOBS_URL}/{job['_id']}"
+    view['events_url'] = f"{JOBS_URL}/{job['_id']}/events"
+    return view
+
+
+def job_events(job_id, poll=SCRAPE_JOB_EVENT_POLL_SECONDS):
+    """
+    The job as a stream of (event, job view) pairs: one whenever its status
+    or progress changes, ending with the finished job (or a 'missing' event).
+    """
+    last = None
+    while True:
+        job = _jobs.get(job_id)
+        if job is None:
+            yield 'missing', {'job_id': job_id}
+            return
+        marker = (job['status'], job.get('completed'), job.get('attach_count'))
+        if marker != last:
+            last = marker
+            yield job['status'], job_view(job)
+        if job['status'] in FINISHED:
+            return
+        time.sleep(poll)
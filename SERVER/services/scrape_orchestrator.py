@@ -0,0 +1,182 @@
+# services/scrape_orchestrator.py
+"""
+Runs many (platform, category) scrapes concurrently.
+
+Jobs go to a bounded thread pool, and each platform's scraper
+(InternshalaScraper, LinkedInScraper) does the work. Before a job starts it
+takes a token from its host's bucket, and scrapers that crawl several pages
+(those with a `throttle` attribute) take one more per extra page, so however
+many workers there are, a site sees at most SCRAPE_HOST_RATE_PER_MINUTE page
+loads a minute after an initial burst of SCRAPE_HOST_BURST. The browser pools still cap how many
+Chrome sessions run at once.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from models.scrape_state_model import category_key
+from services.internshala_scraper import InternshalaScraper
+from services.linkedin_scraper import LinkedInScraper
+
+SCRAPE_WORKERS = int(os.getenv('SCRAPE_WORKERS', '4'))
+SCRAPE_HOST_RATE_PER_MINUTE = float(os.getenv('SCRAPE_HOST_RATE_PER_MINUTE', '20'))
+SCRAPE_HOST_BURST = int(os.getenv('SCRAPE_HOST_BURST', '3'))
+SCRAPE_RATE_LIMIT_TIMEOUT = float(os.getenv('SCRAPE_RATE_LIMIT_TIMEOUT', '600'))
+
+# Scraper class per platform; each is rate limited per host of its base_url
+PLATFORM_SCRAPERS = {
+    'internshala': InternshalaScraper,
+    'linkedin': LinkedInScraper,
+}
+
+
+class RateLimited(RuntimeError):
+    """Raised when a host's bucket yields no token within the timeout"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, sleeping until it is available. Returns seconds waited."""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else float('inf')
+            if timeout is not None and now + wait - started > timeout:
+                raise RateLimited(f"No request slot within {timeout:g}s")
+            time.sleep(wait)
+
+
+class ScrapeOrchestrator:
+    def __init__(self, scrapers=None, max_workers=SCRAPE_WORKERS,
+                 rate_per_minute=SCRAPE_HOST_RATE_PER_MINUTE, burst=SCRAPE_HOST_BURST):
+        self.max_workers = max(1, max_workers)
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self._scrapers = scrapers or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _scraper(self, platform):
+        with self._lock:
+            if platform not in self._scrapers:
+                scraper = PLATFORM_SCRAPERS[platform]()
+                if hasattr(scraper, 'throttle'):
+                    bucket = self._bucket_locked(self._host(platform, scraper))
+                    scraper.throttle = lambda: bucket.acquire(timeout=SCRAPE_RATE_LIMIT_TIMEOUT)
+                self._scrapers[platform] = scraper
+            return self._scrapers[platform]
+
+    @staticmethod
+    def _host(platform, scraper):
+        """Host the scraper loads pages from (a replay server when its base URL points at one)"""
+        return urlparse(getattr(scraper, 'base_url', '')).netloc or platform
+
+    def listing_categories(self, platform):
+        """Categories the platform already has listings for, in category_key form"""
+        categories = self._scraper(platform).model.collection.distinct('category')
+        return {category_key(category) for category in categories if category}
+
+    def source(self, platform):
+        """Collection the platform's scraper writes to (the rollup / scrape_state source name)"""
+        return self._scraper(platform).model.collection_name
+
+    def _bucket_locked(self, host):
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_minute / 60.0, self.burst)
+        return self._buckets[host]
+
+    def _bucket(self, host):
+        with self._lock:
+            return self._bucket_locked(host)
+
+    def _run_job(self, platform, category, filters, on_result=None):
+        result = {'platform': platform, 'category': category, 'success': False, 'count': 0}
+        started = time.monotonic()
+        try:
+            scraper = self._scraper(platform)
+            result['waited_seconds'] = round(
+                self._bucket(self._host(platform, scraper)).acquire(timeout=SCRAPE_RATE_LIMIT_TIMEOUT), 3
+            )
+            scraped = scraper.scrape_internships({**filters, 'category': category})
+            # LinkedInScraper reports failures in its result instead of raising
+            result.update(success=scraped.get('success', True), count=scraped.get('count', 0),
+                          message=scraped.get('message'), updated=scraped.get('updated', 0),
+                          pages=scraped.get('pages', 1))
+        except Exception as e:
+            result['message'] = str(e)
+        result['seconds'] = round(time.monotonic() - started, 3)
+        if on_result:
+            try:
+                on_result(result)
+            except Exception as e:
+                print(f"[WARNING] Scrape progress callback failed: {str(e)}")
+        return result
+
+    @staticmethod
+    def validate(platforms):
+        """Raise ValueError naming any platform there is no scraper for"""
+        unknown = [platform for platform in platforms if platform not in PLATFORM_SCRAPERS]
+        if unknown:
+            raise ValueError(f"Unknown platform(s): {', '.join(unknown)}")
+
+    @staticmethod
+    def used_filters(platforms, filters):
+        """The filters (besides category) that a scraper of at least one of the platforms reads"""
+        used = {name for platform in platforms for name in getattr(PLATFORM_SCRAPERS[platform], 'FILTERS', ())}
+        return {key: value for key, value in (filters or {}).items() if key in used}
+
+    def run(self, platforms, categories, filters=None, on_result=None):
+        """
+        Scrape every category on every platform. Returns per-job results (in
+        request order) with counts and timings, plus totals. on_result, if
+        given, is called with each job's result as soon as it finishes.
+        """
+        self.validate(platforms)
+        filters = filters or {}
+        jobs = [(platform, category) for platform in platforms for category in categories]
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs) or 1),
+                                thread_name_prefix='scrape') as pool:
+            futures = [pool.submit(self._run_job, platform, category, filters, on_result)
+                       for platform, category in jobs]
+            results = [future.result() for future in futures]
+
+        return {
+            'results': results,
+            'total_count': sum(r['count'] for r in results),
+            'succeeded': sum(1 for r in results if r['success']),
+            'failed': sum(1 for r in results if not r['success']),
+            'seconds': round(time.monotonic() - started, 3),
+        }
+
+
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_orchestrator():
+    """The process-wide orchestrator, so every caller shares its rate limits and scrapers"""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = ScrapeOrchestrator()
+        return _orchestrator
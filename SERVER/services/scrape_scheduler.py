@@ -0,0 +1,325 @@
+# services/scrape_scheduler.py
+"""
+Background scrapes, most valuable first.
+
+Every (platform, category) target has a due time: when it was last scraped
+plus an interval that shrinks with demand (list queries for the category,
+decayed with a SCRAPE_DEMAND_HALF_LIFE_MINUTES half-life) and with yield
+(new listings per run, an exponential moving average), clamped to
+[SCRAPE_MIN_INTERVAL_MINUTES, SCRAPE_MAX_INTERVAL_MINUTES]. Targets sit in a
+heap ordered by due time; the loop starts the due ones, at most
+SCRAPE_SCHEDULER_CONCURRENCY at a time, as scrape jobs (services/scrape_jobs.py):
+they run through the shared ScrapeOrchestrator, so the per-host rate limits
+still apply, and a target someone has just asked /scrape for attaches to
+that job rather than scraping the category twice.
+
+Targets are SCRAPE_SCHEDULER_CATEGORIES on SCRAPE_SCHEDULER_PLATFORMS, plus
+any other category whose decayed demand reaches SCRAPE_MIN_DEMAND, as long
+as it is one the platform already has listings for or one listed in
+SCRAPE_SCHEDULER_ALLOWED_CATEGORIES; arbitrary ?category= strings never
+become targets. A promoted category drops out again once its demand decays
+below the threshold. State lives in scrape_state, so a restart picks up
+where it left off (demand for promoted categories builds up again from new
+queries).
+
+Run it inside the app (SCRAPE_SCHEDULER_ENABLED=true) or on its own:
+
+    python -m services.scrape_scheduler
+"""
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from models.scrape_state_model import ScrapeStateModel, category_key
+from services.scrape_demand import flush_demand
+from services.scrape_jobs import submit_scrape_job, wait_for_job
+from services.scrape_orchestrator import get_orchestrator
+
+SCRAPE_SCHEDULER_ENABLED = os.getenv('SCRAPE_SCHEDULER_ENABLED', 'false').lower() == 'true'
+SCRAPE_SCHEDULER_PLATFORMS = os.getenv('SCRAPE_SCHEDULER_PLATFORMS', 'internshala,linkedin')
+SCRAPE_SCHEDULER_CATEGORIES = os.getenv(
+    'SCRAPE_SCHEDULER_CATEGORIES', 'web-development,data-science,machine-learning,python,marketing,graphic-design'
+)
+SCRAPE_SCHEDULER_CONCURRENCY = int(os.getenv('SCRAPE_SCHEDULER_CONCURRENCY', '2'))
+SCRAPE_SCHEDULER_REFRESH_SECONDS = float(os.getenv('SCRAPE_SCHEDULER_REFRESH_SECONDS', '60'))
+SCRAPE_BASE_INTERVAL_MINUTES = float(os.getenv('SCRAPE_BASE_INTERVAL_MINUTES', '180'))
+SCRAPE_MIN_INTERVAL_MINUTES = float(os.getenv('SCRAPE_MIN_INTERVAL_MINUTES', '15'))
+SCRAPE_MAX_INTERVAL_MINUTES = float(os.getenv('SCRAPE_MAX_INTERVAL_MINUTES', '1440'))
+SCRAPE_DEMAND_HALF_LIFE_MINUTES = float(os.getenv('SCRAPE_DEMAND_HALF_LIFE_MINUTES', '360'))
+SCRAPE_MIN_DEMAND = int(os.getenv('SCRAPE_MIN_DEMAND', '5'))
+SCRAPE_SCHEDULER_ALLOWED_CATEGORIES = os.getenv('SCRAPE_SCHEDULER_ALLOWED_CATEGORIES', '')
+
+# Weight of the latest run in yield_per_run
+YIELD_SMOOTHING = 0.3
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class ScrapeTarget:
+    def __init__(self, platform, category, source, pinned=False):
+        self.platform = platform
+        self.category = category
+        self.source = source
+        # Configured targets are always scheduled; the others only while in demand
+        self.pinned = pinned
+        self.last_scraped_at = 0.0
+        self.yield_per_run = 0.0
+        self.demand = 0.0
+        self.demand_at = None
+        self.queries_seen = None
+        self.retry_at = None
+        self.running = False
+
+    def add_queries(self, total, now, half_life):
+        """Decay demand to `now` and add the queries counted since the last refresh"""
+        new = 0 if self.queries_seen is None else max(0, total - self.queries_seen)
+        self.queries_seen = total
+        elapsed = now - (self.demand_at or now)
+        decay = 0.5 ** (elapsed / half_life) if half_life > 0 else 0.0
+        self.demand = self.demand * decay + new
+        self.demand_at = now
+
+    def interval(self, base, low, high):
+        """Seconds between scrapes: shorter the more it is asked for and the more it yields"""
+        boost = ((1 + self.demand) * (1 + self.yield_per_run)) ** 0.5
+        return min(high, max(low, base / boost))
+
+    def scheduled(self, min_demand):
+        return self.pinned or self.running or self.demand >= min_demand
+
+    def due_at(self, base, low, high):
+        if self.retry_at is not None:
+            return self.retry_at
+        if not self.last_scraped_at:
+            return 0.0
+        return self.last_scraped_at + self.interval(base, low, high)
+
+    def as_dict(self, base, low, high):
+        return {
+            'platform': self.platform,
+            'category': self.category,
+            'last_scraped_at': self.last_scraped_at or None,
+            'due_at': self.due_at(base, low, high),
+            'interval_minutes': round(self.interval(base, low, high) / 60, 1),
+            'demand': round(self.demand, 2),
+            'yield_per_run': round(self.yield_per_run, 2),
+            'running': self.running,
+            'pinned': self.pinned,
+        }
+
+
+class ScrapeScheduler:
+    def __init__(self, orchestrator=None, platforms=None, categories=None, concurrency=SCRAPE_SCHEDULER_CONCURRENCY,
+                 state=None, refresh_seconds=SCRAPE_SCHEDULER_REFRESH_SECONDS,
+                 base_interval=SCRAPE_BASE_INTERVAL_MINUTES * 60, min_interval=SCRAPE_MIN_INTERVAL_MINUTES * 60,
+                 max_interval=SCRAPE_MAX_INTERVAL_MINUTES * 60):
+        self.orchestrator = orchestrator or get_orchestrator()
+        self.platforms = platforms or _split(SCRAPE_SCHEDULER_PLATFORMS)
+        self.categories = [category_key(c) for c in (categories or _split(SCRAPE_SCHEDULER_CATEGORIES))]
+        self.allowed_categories = {category_key(c) for c in _split(SCRAPE_SCHEDULER_ALLOWED_CATEGORIES)}
+        self.min_demand = SCRAPE_MIN_DEMAND
+        self.concurrency = max(1, concurrency)
+        self.state = state or ScrapeStateModel()
+        self.refresh_seconds = refresh_seconds
+        self.intervals = (base_interval, min_interval, max_interval)
+        self.targets = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='scheduled-scrape')
+        self._thread = None
+        self.completed = 0
+        self.failed = 0
+
+    def _target(self, platform, category, pinned=False):
+        key = (platform, category)
+        if key not in self.targets:
+            self.targets[key] = ScrapeTarget(platform, category, self.orchestrator.source(platform), pinned)
+        self.targets[key].pinned = self.targets[key].pinned or pinned
+        return self.targets[key]
+
+    def _promotable(self, platform):
+        """Categories that may become targets on demand: allow-listed or already holding listings"""
+        try:
+            listed = self.orchestrator.listing_categories(platform)
+        except Exception as e:
+            print(f"[WARNING] Could not read {platform} listing categories: {str(e)}")
+            listed = set()
+        return self.allowed_categories | listed
+
+    def refresh(self, now=None):
+        """Pull demand and history from scrape_state, add newly popular categories, rebuild the heap"""
+        now = now or time.time()
+        try:
+            flush_demand(self.state)
+        except Exception as e:
+            print(f"[WARNING] Could not flush scrape demand: {str(e)}")
+        sources = {self.orchestrator.source(platform): platform for platform in self.platforms}
+        states = {(doc['source'], doc['category']): doc for doc in self.state.find_states(sources)}
+        promotable = {platform: self._promotable(platform) for platform in self.platforms}
+
+        with self._lock:
+            for platform in self.platforms:
+                for category in self.categories:
+                    self._target(platform, category, pinned=True)
+            # Track demand for every promotable category; forget the rest
+            for (source, category), doc in states.items():
+                if category in promotable[sources[source]]:
+                    self._target(sources[source], category)
+            for key, target in list(self.targets.items()):
+                if not target.pinned and not target.running and target.category not in promotable[target.platform]:
+                    del self.targets[key]
+
+            for target in self.targets.values():
+                doc = states.get((target.source, target.category), {})
+                last_run = doc.get('last_run') or {}
+                target.last_scraped_at = max(target.last_scraped_at,
+                                             doc.get('last_scraped_at') or last_run.get('finished_at') or 0)
+                if not target.yield_per_run:
+                    target.yield_per_run = doc.get('yield_per_run', last_run.get('count', 0.0))
+                target.add_queries(doc.get('queries', 0), now, SCRAPE_DEMAND_HALF_LIFE_MINUTES * 60)
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        # Promoted targets whose demand has decayed below the threshold drop out here
+        self._heap = [
+            (target.due_at(*self.intervals), next(self._seq), target)
+            for target in self.targets.values() if not target.running and target.scheduled(self.min_demand)
+        ]
+        heapq.heapify(self._heap)
+
+    def dispatch(self, now=None):
+        """Start due targets while the concurrency budget allows; returns the futures"""
+        now = now or time.time()
+        futures = []
+        with self._lock:
+            running = sum(1 for target in self.targets.values() if target.running)
+            while self._heap and running < self.concurrency and self._heap[0][0] <= now:
+                _, _, target = heapq.heappop(self._heap)
+                target.running = True
+                running += 1
+                futures.append(self._executor.submit(self._scrape, target))
+        return futures
+
+    def next_due(self):
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def _scrape(self, target):
+        started = time.time()
+        try:
+            job, _ = submit_scrape_job([target.platform], [target.category])
+            job = wait_for_job(job['_id'])
+            if job is None:
+                result = {'success': False, 'count': 0, 'message': 'Scrape job lost its worker'}
+            elif job.get('result'):
+                result = job['result']['results'][0]
+            else:
+                result = {'success': False, 'count': 0, 'message': job.get('message')}
+        except Exception as e:
+            result = {'success': False, 'count': 0, 'message': str(e)}
+
+        with self._lock:
+            target.running = False
+            if result['success']:
+                self.completed += 1
+                target.retry_at = None
+                target.last_scraped_at = started
+                target.yield_per_run = ((1 - YIELD_SMOOTHING) * target.yield_per_run
+                                        + YIELD_SMOOTHING * result['count'])
+            else:
+                # Try again after the shortest interval instead of a full one
+                self.failed += 1
+                target.retry_at = time.time() + self.intervals[1]
+            if target.scheduled(self.min_demand):
+                heapq.heappush(self._heap, (target.due_at(*self.intervals), next(self._seq), target))
+
+        if result['success']:
+            try:
+                self.state.record_schedule(target.source, target.category, target.last_scraped_at,
+                                           round(target.yield_per_run, 3))
+            except Exception as e:
+                print(f"[WARNING] Could not save schedule for {target.platform}/{target.category}: {str(e)}")
+            print(f"[SUCCESS] Scheduled scrape {target.platform}/{target.category}: {result['count']} new")
+        else:
+            print(f"[WARNING] Scheduled scrape {target.platform}/{target.category} failed: {result.get('message')}")
+        self._wake.set()
+        return result
+
+    def run_forever(self):
+        next_refresh = 0.0
+        while not self._stopped.is_set():
+            now = time.time()
+            if now >= next_refresh:
+                try:
+                    self.refresh(now)
+                except Exception as e:
+                    print(f"[WARNING] Scrape scheduler refresh failed: {str(e)}")
+                next_refresh = now + self.refresh_seconds
+            self.dispatch(now)
+
+            due = self.next_due()
+            wait = next_refresh - time.time()
+            if due is not None:
+                wait = min(wait, due - time.time())
+            self._wake.wait(max(0.5, wait))
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name='scrape-scheduler', daemon=True)
+            self._thread.start()
+            print(f"[SUCCESS] Scrape scheduler started ({len(self.platforms)} platforms, "
+                  f"{self.concurrency} concurrent)")
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            targets = sorted((t.as_dict(*self.intervals) for t in self.targets.values()
+                              if t.scheduled(self.min_demand)),
+                             key=lambda t: t['due_at'])
+        return {'concurrency': self.concurrency, 'completed': self.completed, 'failed': self.failed,
+                'targets': targets}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler():
+    """Start the process-wide scheduler (once)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ScrapeScheduler().start()
+        return _scheduler
+
+
+def scheduler_stats():
+    return _scheduler.stats() if _scheduler else None
+
+
+def main():
+    scheduler = ScrapeScheduler()
+    print(f"[SUCCESS] Scrape scheduler running for {', '.join(scheduler.platforms)}; Ctrl+C to stop")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
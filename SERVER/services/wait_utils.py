@@ -0,0 +1,186 @@
+# services/wait_utils.py
+"""
+Condition waits for the Selenium scrapers, bots and login helpers.
+
+Each helper polls a condition every WAIT_POLL_INTERVAL seconds and returns
+as soon as it holds, so a step costs as long as the page actually takes
+instead of a fixed sleep. A timeout is per step (WAIT_STEP_TIMEOUT unless
+given) and is not an error: the helpers return None (or False) and the
+caller carries on the way it did after a sleep that was too short.
+
+    document_ready      document.readyState is 'complete'
+    network_idle        no fetch/XHR in flight and no new resources for a quiet period
+    element_present     first element matching any of the CSS selectors
+    element_visible     ... that is displayed
+    element_clickable   ... that is displayed and enabled
+    element_gone        an element (or selector) is detached or hidden
+    element_in_view     an element sits inside the viewport (after a smooth scroll)
+    url_contains        the URL contains one of the fragments
+    page_changes        the URL changes, an element goes stale or a window opens
+    page_grows          document height grows (infinite-scroll lists)
+"""
+import os
+import time
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, StaleElementReferenceException, TimeoutException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+WAIT_STEP_TIMEOUT = float(os.getenv('WAIT_STEP_TIMEOUT', '10'))
+WAIT_POLL_INTERVAL = float(os.getenv('WAIT_POLL_INTERVAL', '0.1'))
+WAIT_NETWORK_IDLE_MS = int(os.getenv('WAIT_NETWORK_IDLE_MS', '500'))
+
+# A navigation can detach elements or unload the document mid-poll; the next poll retries
+_IGNORED = (NoSuchElementException, StaleElementReferenceException, JavascriptException)
+
+# Counts fetch/XHR requests in flight (hooks installed once per document) and
+# returns [readyState, requests in flight, resources loaded so far]
+_NETWORK_STATE_JS = """
+    if (!window.__waitPending) {
+        window.__waitPending = {count: 0};
+        var pending = window.__waitPending;
+        var done = function () { pending.count = Math.max(0, pending.count - 1); };
+        if (window.fetch) {
+            var fetch = window.fetch;
+            window.fetch = function () {
+                pending.count++;
+                return fetch.apply(this, arguments).then(
+                    function (response) { done(); return response; },
+                    function (error) { done(); throw error; }
+                );
+            };
+        }
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            pending.count++;
+            this.addEventListener('loadend', done);
+            return send.apply(this, arguments);
+        };
+    }
+    var resources = window.performance && performance.getEntriesByType
+        ? performance.getEntriesByType('resource').length : 0;
+    return [document.readyState, window.__waitPending.count, resources];
+"""
+
+_IN_VIEW_JS = """
+    var rect = arguments[0].getBoundingClientRect();
+    return rect.bottom > 0 && rect.right > 0
+        && rect.top < (window.innerHeight || document.documentElement.clientHeight)
+        && rect.left < (window.innerWidth || document.documentElement.clientWidth);
+"""
+
+
+def wait_for(driver, condition, timeout=None, poll=None):
+    """condition(driver)'s first truthy value, or None once `timeout` seconds pass"""
+    timeout = WAIT_STEP_TIMEOUT if timeout is None else timeout
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll or WAIT_POLL_INTERVAL,
+                             ignored_exceptions=_IGNORED).until(condition)
+    except TimeoutException:
+        return None
+
+
+def _css(selectors):
+    return selectors if isinstance(selectors, str) else ', '.join(selectors)
+
+
+def _stale(element):
+    try:
+        element.is_enabled()
+        return False
+    except StaleElementReferenceException:
+        return True
+
+
+def document_ready(driver, timeout=None):
+    return bool(wait_for(driver, lambda d: d.execute_script('return document.readyState') == 'complete', timeout))
+
+
+def network_idle(driver, idle_ms=None, timeout=None):
+    """
+    True once the document is loaded, no fetch/XHR is in flight and nothing new
+    has loaded for `idle_ms`. Requests started before the first poll are only
+    seen through the resource count, so call it right after the triggering action.
+    """
+    quiet = (WAIT_NETWORK_IDLE_MS if idle_ms is None else idle_ms) / 1000.0
+    state = {'snapshot': None, 'since': time.monotonic()}
+
+    def idle(d):
+        snapshot = d.execute_script(_NETWORK_STATE_JS)
+        now = time.monotonic()
+        if snapshot != state['snapshot']:
+            state['snapshot'], state['since'] = snapshot, now
+        return snapshot[0] == 'complete' and snapshot[1] == 0 and now - state['since'] >= quiet
+
+    return bool(wait_for(driver, idle, timeout))
+
+
+def _first(driver, selectors, accept):
+    for element in driver.find_elements(By.CSS_SELECTOR, _css(selectors)):
+        if accept(element):
+            return element
+    return None
+
+
+def element_present(driver, selectors, timeout=None):
+    return wait_for(driver, lambda d: _first(d, selectors, lambda e: True), timeout)
+
+
+def element_visible(driver, selectors, timeout=None):
+    return wait_for(driver, lambda d: _first(d, selectors, lambda e: e.is_displayed()), timeout)
+
+
+def element_clickable(driver, selectors, timeout=None):
+    return wait_for(driver, lambda d: _first(d, selectors, lambda e: e.is_displayed() and e.is_enabled()), timeout)
+
+
+def element_gone(driver, target, timeout=None):
+    """True once `target` (an element, or CSS selectors) is detached or hidden"""
+    if isinstance(target, (str, list, tuple)):
+        return bool(wait_for(driver, lambda d: _first(d, target, lambda e: e.is_displayed()) is None, timeout))
+
+    def gone(d):
+        try:
+            return not target.is_displayed()
+        except StaleElementReferenceException:
+            return True
+
+    return bool(wait_for(driver, gone, timeout))
+
+
+def element_in_view(driver, element, timeout=None):
+    return bool(wait_for(driver, lambda d: d.execute_script(_IN_VIEW_JS, element), timeout))
+
+
+def url_contains(driver, fragments, timeout=None, poll=None):
+    """The current URL once it contains any of `fragments`, else None"""
+    fragments = [fragments] if isinstance(fragments, str) else fragments
+
+    def matches(d):
+        url = d.current_url
+        return url if any(fragment in url for fragment in fragments) else None
+
+    return wait_for(driver, matches, timeout, poll)
+
+
+def page_changes(driver, old_url=None, element=None, window_count=None, timeout=None):
+    """
+    True once the URL differs from `old_url`, `element` goes stale (the page or
+    list was replaced) or more than `window_count` windows are open.
+    """
+    def changed(d):
+        return ((old_url is not None and d.current_url != old_url)
+                or (element is not None and _stale(element))
+                or (window_count is not None and len(d.window_handles) > window_count))
+
+    return bool(wait_for(driver, changed, timeout))
+
+
+def page_grows(driver, old_height, timeout=None):
+    """The new document height once it exceeds `old_height`, else None"""
+    def grown(d):
+        height = d.execute_script('return document.body.scrollHeight')
+        return height if height > old_height else None
+
+    return wait_for(driver, grown, timeout)
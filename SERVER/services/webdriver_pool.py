@@ -0,0 +1,302 @@
+# services/webdriver_pool.py
+"""
+A bounded pool of warm Chrome sessions for the scrapers.
+
+Starting Chrome costs seconds and hundreds of MB, so a scrape borrows a
+session that is already running and gives it back afterwards:
+
+    with pool.session() as driver:
+        driver.get(url)
+
+Each session is health-checked before it is lent out and recycled (quit and
+replaced on next use) after WEBDRIVER_MAX_USES scrapes or once its memory
+passes WEBDRIVER_MAX_MEMORY_MB. At most WEBDRIVER_POOL_SIZE sessions exist
+per pool; a borrower waits up to WEBDRIVER_ACQUIRE_TIMEOUT seconds for one.
+
+The chromedriver path is resolved once per process: CHROMEDRIVER_PATH, then
+the path cached on disk by an earlier run, then chromedriver on PATH, and
+only then webdriver_manager (which goes to the network). Whatever is found
+is written to WEBDRIVER_PATH_CACHE so the next start works offline. A
+driver that can't start Chrome (typically after Chrome updated itself) is
+dropped from the cache and the path resolved again, once per start.
+"""
+import atexit
+import os
+import shutil
+import threading
+from collections import deque
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from utils.stage_timer import stage
+
+WEBDRIVER_POOL_SIZE = int(os.getenv('WEBDRIVER_POOL_SIZE', '2'))
+WEBDRIVER_MAX_USES = int(os.getenv('WEBDRIVER_MAX_USES', '20'))
+WEBDRIVER_MAX_MEMORY_MB = float(os.getenv('WEBDRIVER_MAX_MEMORY_MB', '1024'))
+WEBDRIVER_ACQUIRE_TIMEOUT = float(os.getenv('WEBDRIVER_ACQUIRE_TIMEOUT', '120'))
+WEBDRIVER_HEADLESS = os.getenv('WEBDRIVER_HEADLESS', 'true').lower() == 'true'
+WEBDRIVER_PATH_CACHE = os.getenv(
+    'WEBDRIVER_PATH_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'internity', 'chromedriver_path')
+)
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+# Paths that failed to start Chrome in this process (e.g. left behind by a Chrome update)
+_failed_paths = set()
+
+
+class PoolExhausted(RuntimeError):
+    """Raised when no browser session frees up within the acquire timeout"""
+
+
+def _read_cached_path():
+    try:
+        with open(WEBDRIVER_PATH_CACHE) as f:
+            path = f.read().strip()
+        return path if path and os.path.isfile(path) and path not in _failed_paths else None
+    except OSError:
+        return None
+
+
+def _write_cached_path(path):
+    try:
+        os.makedirs(os.path.dirname(WEBDRIVER_PATH_CACHE), exist_ok=True)
+        with open(WEBDRIVER_PATH_CACHE, 'w') as f:
+            f.write(path)
+    except OSError as e:
+        print(f"[WARNING] Could not cache chromedriver path: {str(e)}")
+
+
+def resolve_driver_path():
+    """
+    Path of the chromedriver executable, resolved once per process. Returns
+    None when nothing is found, leaving it to Selenium Manager.
+    """
+    global _driver_path
+    if _driver_path:
+        return _driver_path
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+
+        on_path = shutil.which('chromedriver')
+        path = (os.getenv('CHROMEDRIVER_PATH') or _read_cached_path()
+                or (on_path if on_path not in _failed_paths else None))
+        if not path:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+            except Exception as e:
+                print(f"[WARNING] webdriver_manager could not resolve chromedriver: {str(e)}")
+                return None
+            if path in _failed_paths:
+                return None
+        if path != _read_cached_path():
+            _write_cached_path(path)
+        _driver_path = path
+        return path
+
+
+def forget_driver_path(path):
+    """Stop using a chromedriver that could not start Chrome, dropping it from the on-disk cache"""
+    global _driver_path
+    with _driver_path_lock:
+        _failed_paths.add(path)
+        if _driver_path == path:
+            _driver_path = None
+        try:
+            with open(WEBDRIVER_PATH_CACHE) as f:
+                cached = f.read().strip()
+            if cached == path:
+                os.remove(WEBDRIVER_PATH_CACHE)
+        except OSError:
+            pass
+
+
+def _memory_mb(driver):
+    """
+    Resident memory of chromedriver, Chrome and their child processes, in MB.
+    Without psutil (a requirement, but optional here) this falls back to the
+    page's JS heap, far below the RSS, so the limit then trips much later.
+    """
+    try:
+        import psutil
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception:
+        return 0
+    try:
+        heap = driver.execute_script('return performance.memory ? performance.memory.usedJSHeapSize : 0')
+        return (heap or 0) / (1024 * 1024)
+    except Exception:
+        return 0
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class WebDriverPool:
+    """Bounded pool of Chrome sessions sharing one set of options"""
+
+    def __init__(self, name, options_factory, size=WEBDRIVER_POOL_SIZE, max_uses=WEBDRIVER_MAX_USES,
+                 max_memory_mb=WEBDRIVER_MAX_MEMORY_MB, page_load_timeout=None, implicit_wait=0):
+        self.name = name
+        self.options_factory = options_factory
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.page_load_timeout = page_load_timeout
+        self.implicit_wait = implicit_wait
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+
+    def _launch(self, path):
+        options = self.options_factory()
+        if WEBDRIVER_HEADLESS:
+            options.add_argument('--headless=new')
+        service = Service(executable_path=path) if path else Service()
+        return webdriver.Chrome(service=service, options=options)
+
+    def _start(self):
+        path = resolve_driver_path()
+        try:
+            driver = self._launch(path)
+        except Exception as e:
+            if not path or path == os.getenv('CHROMEDRIVER_PATH'):
+                raise
+            # Usually a cached driver that no longer matches an updated Chrome
+            print(f"[WARNING] chromedriver at {path} could not start Chrome "
+                  f"({str(e).splitlines()[0] if str(e) else type(e).__name__}); resolving it again")
+            forget_driver_path(path)
+            driver = self._launch(resolve_driver_path())
+        if self.page_load_timeout:
+            driver.set_page_load_timeout(self.page_load_timeout)
+        driver.implicitly_wait(self.implicit_wait)
+        self.created += 1
+        print(f"[SUCCESS] Started browser session {self.created} for the {self.name} pool")
+        return _Session(driver)
+
+    @staticmethod
+    def _healthy(session):
+        try:
+            return session.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    def _reset(self, session):
+        """Leave a returned session on a blank page with a single window"""
+        driver = session.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get('about:blank')
+
+    def _worn_out(self, session):
+        if self.max_uses and session.uses >= self.max_uses:
+            return True
+        return bool(self.max_memory_mb) and _memory_mb(session.driver) > self.max_memory_mb
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return self._start()
+            if self._healthy(session):
+                return session
+            print(f"[WARNING] Discarding unresponsive browser session from the {self.name} pool")
+            self._quit(session)
+
+    def _checkin(self, session, failed):
+        try:
+            if failed and not self._healthy(session):
+                raise RuntimeError("session no longer responds")
+            if self._worn_out(session):
+                self.recycled += 1
+                raise RuntimeError("session recycled")
+            self._reset(session)
+        except Exception:
+            self._quit(session)
+            return
+        with self._lock:
+            if self._closed:
+                self._quit(session)
+            else:
+                self._idle.append(session)
+
+    @contextmanager
+    def session(self, timeout=WEBDRIVER_ACQUIRE_TIMEOUT):
+        """Borrow a warm driver for the duration of the block"""
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolExhausted(f"No {self.name} browser session free after {timeout:g}s")
+        session, failed = None, False
+        try:
+            with stage('launch'):
+                session = self._checkout()
+            session.uses += 1
+            yield session.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if session is not None:
+                self._checkin(session, failed)
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+        return {'size': self.size, 'idle': idle, 'created': self.created, 'recycled': self.recycled}
+
+    def close(self):
+        """Quit every idle session; sessions in use are quit when returned"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for session in idle:
+            self._quit(session)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, options_factory, **kwargs):
+    """The process-wide pool called `name`, created on first use"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = WebDriverPool(name, options_factory, **kwargs)
+        return pool
+
+
+def pool_stats():
+    with _pools_lock:
+        return {name: pool.stats() for name, pool in _pools.items()}
+
+
+@atexit.register
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,30 @@
+# tests/conftest.py
+"""
+Every test runs against a fresh in-memory engine (database/memory_engine.py),
+so the suite needs no MongoDB server:
+
+    cd SERVER && python -m pytest -q
+"""
+import os
+
+# Before any model connects; an empty Atlas URI keeps .env from picking it
+os.environ['MONGO_URI'] = 'memory://'
+os.environ['MONGO_URI_ATLAS'] = ''
+
+import pytest
+from database import db_connection
+from utils.response_cache import data_versions, response_cache
+
+
+@pytest.fixture(autouse=True)
+def memory_db(monkeypatch):
+    """A new, empty in-memory client per test, with no cached responses or versions"""
+    from services import scrape_jobs
+
+    monkeypatch.setattr(db_connection, '_client', None)
+    monkeypatch.setattr(db_connection, '_resolved_uri', None)
+    monkeypatch.setattr(scrape_jobs, '_indexes_ready', False)
+    response_cache.clear()
+    data_versions._versions.clear()
+    data_versions._checked_at = 0.0
+    yield db_connection.get_mongo_client()
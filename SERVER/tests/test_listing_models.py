@@ -0,0 +1,98 @@
+# tests/test_listing_models.py
+import pytest
+from database.indexes import ensure_indexes
+from models.internshala_model import InternshalaInternshipModel
+from models.linkedinInternships import LinkedInInternshipModel
+
+
+def _linkedin(title, company='Acme', **fields):
+    return {'title': title, 'company': company, 'location': 'Pune', 'category': 'web', 'scraped_at': 1.0, **fields}
+
+
+@pytest.fixture
+def linkedin():
+    ensure_indexes()
+    return LinkedInInternshipModel()
+
+
+def test_upsert_counts_inserted_updated_unchanged(linkedin):
+    first = linkedin.upsert_listings([_linkedin('Backend intern'), _linkedin('Frontend intern')])
+    assert first == {'inserted': 2, 'updated': 0, 'unchanged': 0}
+
+    again = linkedin.upsert_listings([
+        _linkedin('Backend intern'),
+        _linkedin('Frontend intern', stipend='10000'),
+        _linkedin('Data intern'),
+    ])
+    assert again == {'inserted': 1, 'updated': 1, 'unchanged': 1}
+    assert linkedin.collection.count_documents({}) == 3
+    assert linkedin.collection.find_one({'title': 'Frontend intern'})['stipend'] == '10000'
+
+
+def test_upsert_keeps_first_seen_fields(linkedin):
+    linkedin.upsert_listings([_linkedin('Backend intern', scraped_at=1.0)])
+    linkedin.upsert_listings([_linkedin('Backend intern', scraped_at=2.0)])
+    assert linkedin.collection.find_one({'title': 'Backend intern'})['scraped_at'] == 1.0
+
+
+def test_upsert_merges_duplicate_keys_in_a_batch(linkedin):
+    link = 'https://www.linkedin.com/jobs/view/backend-intern-at-acme-4012345678/'
+    written = linkedin.upsert_listings([
+        _linkedin('Backend intern', apply_link=link),
+        _linkedin('Backend Intern (Remote)', apply_link=link + '?refId=abc'),
+    ])
+    assert linkedin.collection.count_documents({}) == 1
+    assert written['inserted'] == 1
+    assert linkedin.collection.find_one()['listing_key'] == 'li:4012345678'
+
+
+@pytest.mark.parametrize('location', [None, '', 'Not specified', '  not specified '])
+def test_listing_key_treats_missing_locations_alike(location):
+    assert LinkedInInternshipModel.listing_key('Intern', 'Acme', location) == \
+        LinkedInInternshipModel.listing_key('Intern', 'Acme', None)
+
+
+def test_backfill_listing_keys_skips_taken_keys(linkedin):
+    linkedin.upsert_listings([_linkedin('Backend intern')])
+    linkedin.collection.insert_many([
+        _linkedin('Backend intern'),
+        {'title': 'Data intern', 'company': 'Acme', 'location': 'Not specified'},
+        {'title': 'Data intern', 'company': 'Acme', 'location': ''},
+    ])
+    assert linkedin.backfill_listing_keys() == {'updated': 1, 'duplicates': 2}
+
+
+def test_insert_listings_counts_only_new_ids():
+    ensure_indexes()
+    model = InternshalaInternshipModel()
+    listings = [{'internship_id': str(i), 'title': f'Intern {i}', 'category': 'web'} for i in range(3)]
+    assert model.insert_listings(listings) == 3
+    assert model.insert_listings(listings[1:] + [{'internship_id': '9', 'title': 'Intern 9'}]) == 1
+    assert model.get_statistics()['total_count'] == 4
+
+
+def test_text_search_falls_back_to_title_match():
+    # No text index has been built
+    model = InternshalaInternshipModel()
+    model.collection.insert_many([
+        {'internship_id': '1', 'title': 'Python Developer (C++)', 'scraped_at': 2.0},
+        {'internship_id': '2', 'title': 'python data intern', 'scraped_at': 1.0},
+        {'internship_id': '3', 'title': 'Marketing intern', 'scraped_at': 3.0},
+    ])
+    documents, total, _, _ = model.find_page_with_total({'$text': {'$search': 'python'}})
+    assert total == 2
+    assert [doc['internship_id'] for doc in documents] == ['1', '2']
+
+    # The term is matched literally, not as a pattern
+    _, total, _, _ = model.find_page_with_total({'$text': {'$search': '(C++)'}})
+    assert total == 1
+    assert [doc['internship_id'] for doc in model.iter_documents({'$text': {'$search': 'python'}})] == ['1', '2']
+
+
+def test_text_search_uses_the_index_once_built():
+    model = InternshalaInternshipModel()
+    model.collection.insert_one({'internship_id': '1', 'title': 'Python developers', 'scraped_at': 1.0})
+    ensure_indexes()
+    # Ranked through the (stemming) index rather than matched in the title
+    documents, total, _, _ = model.find_page_with_total({'$text': {'$search': 'developer'}}, model.LIST_PROJECTION)
+    assert total == 1 and 'score' in documents[0]
@@ -0,0 +1,105 @@
+# tests/test_pagination.py
+import pytest
+from bson import ObjectId
+from werkzeug.datastructures import MultiDict
+from models.base_model import BaseMongoModel
+from utils.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor,
+    decode_cursor, encode_cursor, parse_page_args
+)
+
+
+@pytest.fixture
+def model():
+    model = BaseMongoModel(collection_name='listings')
+    # Ties on scraped_at and listings without one must still page cleanly
+    model.collection.insert_many(
+        [{'title': f'listing {i}', 'category': 'web' if i % 2 else 'data', 'scraped_at': float(i // 3)}
+         for i in range(25)]
+        + [{'title': f'undated {i}', 'category': 'web'} for i in range(4)]
+    )
+    return model
+
+
+def test_cursor_round_trip():
+    _id = ObjectId()
+    assert decode_cursor(encode_cursor({'_id': _id, 'scraped_at': 1700000000.5})) == (1700000000.5, _id)
+    assert decode_cursor(encode_cursor({'_id': _id})) == (None, _id)
+
+
+@pytest.mark.parametrize('token', ['not-a-cursor', encode_cursor({'_id': 1, 'scraped_at': 'yesterday'})])
+def test_foreign_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize('args, per_page', [
+    ({}, DEFAULT_PAGE_SIZE),
+    ({'per_page': '0'}, DEFAULT_PAGE_SIZE),
+    ({'per_page': '-5'}, 1),
+    ({'per_page': '25'}, 25),
+    ({'per_page': '100000'}, MAX_PAGE_SIZE),
+    ({'per_page': 'all'}, DEFAULT_PAGE_SIZE),
+])
+def test_page_size_is_always_bounded(args, per_page):
+    assert parse_page_args(MultiDict(args))['per_page'] == per_page
+
+
+def test_page_args():
+    paging = parse_page_args(MultiDict({'page': '-3', 'cursor': 'abc', 'approximate_total': 'true'}))
+    assert paging == {'per_page': DEFAULT_PAGE_SIZE, 'cursor': 'abc', 'page': 1, 'approximate': True}
+    assert parse_page_args(MultiDict())['page'] is None
+
+
+@pytest.mark.parametrize('filters', [{}, {'category': 'web'}])
+def test_cursor_walk_visits_every_match_once(model, filters):
+    expected = model.collection.count_documents(filters)
+    seen, cursor = [], None
+    while True:
+        documents, _, cursor, _ = model.find_page_with_total(filters, per_page=4, cursor=cursor)
+        assert len(documents) <= 4
+        seen.extend(doc['_id'] for doc in documents)
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == expected
+
+    # Newest first, undated listings last
+    order = [model.collection.find_one({'_id': _id}).get('scraped_at') for _id in seen]
+    dated = [value for value in order if value is not None]
+    assert dated == sorted(dated, reverse=True)
+    assert order[len(dated):] == [None] * (len(order) - len(dated))
+
+
+def test_offset_page_matches_cursor_page(model):
+    _, _, cursor, _ = model.find_page_with_total({'category': 'web'}, per_page=5)
+    by_cursor, _, _, _ = model.find_page_with_total({'category': 'web'}, per_page=5, cursor=cursor)
+    by_page, _, _, _ = model.find_page_with_total({'category': 'web'}, per_page=5, page=2)
+    assert [doc['_id'] for doc in by_cursor] == [doc['_id'] for doc in by_page]
+
+
+def test_last_page_has_no_cursor(model):
+    documents, cursor = model.find_page({}, per_page=100)
+    assert len(documents) == 29 and cursor is None
+
+
+def test_totals(model):
+    documents, total, cursor, estimated = model.find_page_with_total({'category': 'web'}, per_page=3)
+    assert (len(documents), total, estimated) == (3, model.collection.count_documents({'category': 'web'}), False)
+    assert cursor is not None
+
+    # The total is of every match, not of what is left after the cursor
+    _, total_after, _, _ = model.find_page_with_total({'category': 'web'}, per_page=3, cursor=cursor)
+    assert total_after == total
+
+    # Unfiltered totals come from collection metadata
+    _, total, _, estimated = model.find_page_with_total({}, per_page=3)
+    assert (total, estimated) == (29, True)
+
+    _, total, _, estimated = model.find_page_with_total({'category': 'none'}, per_page=3)
+    assert (total, estimated) == (0, False)
+
+
+def test_approximate_total_stops_at_the_limit(monkeypatch, model):
+    monkeypatch.setattr('models.base_model.APPROXIMATE_COUNT_LIMIT', 5)
+    _, total, _, estimated = model.find_page_with_total({'category': 'web'}, per_page=3, approximate=True)
+    assert (total, estimated) == (5, True)
@@ -0,0 +1,66 @@
+# tests/test_response_cache.py
+import pytest
+from flask import Flask, jsonify
+from utils.response_cache import bump_version, cached_response
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    calls = {'list': 0}
+
+    @app.route('/list')
+    @cached_response('listings')
+    def listings():
+        calls['list'] += 1
+        return jsonify({'calls': calls['list']})
+
+    @app.route('/broken')
+    @cached_response('listings')
+    def broken():
+        return jsonify({'success': False}), 500
+
+    client = app.test_client()
+    client.calls = calls
+    return client
+
+
+def test_repeat_request_is_served_from_cache(client):
+    first = client.get('/list?per_page=5')
+    second = client.get('/list?per_page=5')
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert second.get_json() == {'calls': 1}
+    assert first.headers['ETag'] == second.headers['ETag']
+
+    # Another query is another entry
+    assert client.get('/list?per_page=6').headers['X-Cache'] == 'MISS'
+
+
+def test_version_bump_invalidates(client):
+    before = client.get('/list')
+    bump_version('listings')
+    after = client.get('/list')
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.get_json() == {'calls': 2}
+    assert after.headers['ETag'] != before.headers['ETag']
+
+    # Other namespaces are untouched
+    bump_version('other')
+    assert client.get('/list').headers['X-Cache'] == 'HIT'
+
+
+def test_matching_etag_gets_304(client):
+    etag = client.get('/list').headers['ETag']
+    response = client.get('/list', headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.data == b''
+    assert client.calls['list'] == 1
+
+    bump_version('listings')
+    response = client.get('/list', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+
+
+def test_errors_are_not_cached(client):
+    first = client.get('/broken')
+    assert first.status_code == 500 and 'ETag' not in first.headers
+    assert client.get('/broken').headers['X-Cache'] == 'MISS'
@@ -0,0 +1,91 @@
+# tests/test_scrape_jobs.py
+import time
+import pytest
+from models.scrape_job_model import FAILED, QUEUED, RUNNING, SUCCEEDED, ScrapeJobModel
+from services import scrape_jobs
+
+STALE_AFTER = 60
+TTL_HOURS = 1
+
+
+@pytest.fixture
+def jobs():
+    scrape_jobs._ensure_job_indexes()
+    return ScrapeJobModel()
+
+
+def _job(key='k1'):
+    return {'platforms': ['internshala'], 'categories': ['python'], 'filters': {}, 'total': 1, 'dedup_key': key}
+
+
+def test_identical_requests_share_a_job(jobs):
+    job, created = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    same, attached = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    other, other_created = jobs.create_or_attach(_job('k2'), STALE_AFTER, TTL_HOURS)
+    assert (created, attached, other_created) == (True, False, True)
+    assert same['_id'] == job['_id'] and same['attach_count'] == 1
+    assert other['_id'] != job['_id']
+
+
+def test_finished_job_is_not_attached_to(jobs):
+    job, _ = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    assert jobs.start(job['_id'])
+    assert jobs.finish(job['_id'], SUCCEEDED, TTL_HOURS, result={'total_count': 0})
+    again, created = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    assert created and again['_id'] != job['_id']
+
+
+def test_stale_job_is_failed_and_replaced(jobs):
+    job, _ = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    jobs.collection.update_one({'_id': job['_id']}, {'$set': {'updated_at': time.time() - STALE_AFTER - 1}})
+
+    fresh, created = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    assert created and fresh['_id'] != job['_id']
+    assert jobs.get(job['_id'])['status'] == FAILED
+
+    # Its worker can no longer revive or finish it
+    assert not jobs.start(job['_id'])
+    assert not jobs.finish(job['_id'], SUCCEEDED, TTL_HOURS)
+
+
+def test_heartbeat_keeps_a_job_from_going_stale(jobs):
+    job, _ = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    jobs.collection.update_one({'_id': job['_id']}, {'$set': {'updated_at': time.time() - STALE_AFTER - 1}})
+    jobs.touch([job['_id']])
+    same, created = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    assert not created and same['_id'] == job['_id']
+
+
+def test_only_finished_jobs_expire(jobs):
+    job, _ = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    assert 'expires_at' not in jobs.collection.find_one({'_id': job['_id']})
+    jobs.start(job['_id'])
+    assert jobs.get(job['_id'])['status'] == RUNNING
+    assert 'expires_at' not in jobs.collection.find_one({'_id': job['_id']})
+
+    jobs.finish(job['_id'], SUCCEEDED, TTL_HOURS)
+    stored = jobs.collection.find_one({'_id': job['_id']})
+    assert 'expires_at' in stored and 'active_key' not in stored
+
+
+def test_start_only_from_queued(jobs):
+    job, _ = jobs.create_or_attach(_job(), STALE_AFTER, TTL_HOURS)
+    assert jobs.get(job['_id'])['status'] == QUEUED
+    assert jobs.start(job['_id'])
+    assert not jobs.start(job['_id'])
+
+
+def test_submit_builds_the_indexes_first(monkeypatch):
+    monkeypatch.setattr(scrape_jobs, '_executor', _NoExecutor())
+    job, created = scrape_jobs.submit_scrape_job(['internshala'], ['Python'])
+    same, attached = scrape_jobs.submit_scrape_job(['internshala'], ['python'])
+    assert (created, attached) == (True, False) and same['_id'] == job['_id']
+    indexes = ScrapeJobModel().collection.index_information()
+    assert any(spec['key'] == [('active_key', 1)] and spec.get('unique') for spec in indexes.values())
+
+
+class _NoExecutor:
+    """Accepts jobs without running them"""
+
+    def submit(self, *args, **kwargs):
+        return None
@@ -0,0 +1,54 @@
+# utils/fieldsets.py
+"""
+Sparse fieldsets for the listing APIs.
+
+    ?fields=title,company,apply_link    just these fields
+    ?profile=card                       a named set (card, list, detail)
+
+Requested names are checked against the model's FIELDS whitelist and become
+the Mongo projection, so unrequested fields never leave the database.
+_id and scraped_at are always returned: pagination cursors are built from
+them.
+"""
+
+ALWAYS_INCLUDED = ('_id', 'scraped_at')
+
+# Cards render a title, a company and an apply button
+CARD_FIELDS = ('title', 'company', 'apply_link')
+
+
+class InvalidFields(ValueError):
+    """Raised for a field or profile name the endpoint does not offer"""
+
+
+def fieldset(names):
+    """Projection returning `names` plus the always-included fields"""
+    projection = dict.fromkeys(ALWAYS_INCLUDED, 1)
+    projection.update(dict.fromkeys(names, 1))
+    return projection
+
+
+def parse_fieldset_args(args):
+    """Read ?fields= (comma separated, repeatable) and ?profile= from request args"""
+    fields = [name.strip() for value in args.getlist('fields') for name in value.split(',') if name.strip()]
+    return {
+        'fields': fields or None,
+        'profile': (args.get('profile') or '').strip() or None,
+    }
+
+
+def resolve_projection(allowed, profiles, fields=None, profile=None, default=None):
+    """
+    The projection for a request: explicit `fields` win over `profile`,
+    which wins over the `default` profile. Raises InvalidFields for names
+    outside `allowed` or an unknown profile.
+    """
+    if fields:
+        unknown = sorted(set(fields) - set(allowed) - set(ALWAYS_INCLUDED))
+        if unknown:
+            raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(allowed)}")
+        return fieldset(fields)
+    name = profile or default
+    if name not in profiles:
+        raise InvalidFields(f"Unknown profile: {name}. Available: {', '.join(profiles)}")
+    return profiles[name]
@@ -0,0 +1,109 @@
+# utils/pagination.py
+import base64
+import binascii
+import json
+import os
+from bson import ObjectId
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+# With ?approximate_total=1 the count stops after this many matches, so a
+# broad filter on a big collection never pays for an exact count.
+APPROXIMATE_COUNT_LIMIT = int(os.getenv('APPROXIMATE_COUNT_LIMIT', '1000'))
+
+# Relevance-ranked pages are found by reading every result before them, so
+# page * per_page may not go past this many results
+SEARCH_MAX_DEPTH = int(os.getenv('SEARCH_MAX_DEPTH', '1000'))
+
+# Listings are served newest first; _id breaks ties between listings
+# scraped in the same instant so every position in the order is unique.
+LISTING_SORT = [('scraped_at', -1), ('_id', -1)]
+
+# Text search results are ranked by relevance, newest first among equals.
+# Relevance is not a stable position, so search pages by offset, not cursor.
+SEARCH_SORT = {'score': {'$meta': 'textScore'}, 'scraped_at': -1, '_id': -1}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor token we did not issue"""
+
+
+class PageTooDeep(ValueError):
+    """Raised when a search page lies past SEARCH_MAX_DEPTH results"""
+
+
+def encode_cursor(doc):
+    """Opaque token for the position just after `doc` in LISTING_SORT order"""
+    position = {'s': doc.get('scraped_at'), 'i': str(doc['_id'])}
+    raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; returns (scraped_at, _id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        scraped_at, raw_id = position['s'], position['i']
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidCursor("Invalid pagination cursor")
+    if scraped_at is not None and not isinstance(scraped_at, (int, float)):
+        raise InvalidCursor("Invalid pagination cursor")
+    return scraped_at, ObjectId(raw_id) if ObjectId.is_valid(raw_id) else raw_id
+
+
+def keyset_filter(token):
+    """Filter matching everything after the cursor position in LISTING_SORT order"""
+    scraped_at, last_id = decode_cursor(token)
+    if scraped_at is None:
+        return {'scraped_at': None, '_id': {'$lt': last_id}}
+    return {
+        # Each branch is a bounded seek on the (…, scraped_at, _id) indexes.
+        # Undated listings sort last and $lt never matches null, so they get
+        # a branch of their own.
+        '$or': [
+            {'scraped_at': {'$lt': scraped_at}},
+            {'scraped_at': scraped_at, '_id': {'$lt': last_id}},
+            {'scraped_at': None},
+        ],
+    }
+
+
+def encode_combined_cursor(positions):
+    """
+    Token for a page of a merged, multi-collection listing: `positions`
+    maps each source that still has listings to its own cursor token
+    ('' for a source not read from yet). Exhausted sources are left out.
+    """
+    raw = json.dumps(positions, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_combined_cursor(token, sources):
+    """Inverse of encode_combined_cursor, rejecting sources not in `sources`"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        positions = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise InvalidCursor("Invalid pagination cursor")
+    if not isinstance(positions, dict) or not all(
+        name in sources and isinstance(position, str) for name, position in positions.items()
+    ):
+        raise InvalidCursor("Invalid pagination cursor")
+    for position in positions.values():
+        if position:
+            decode_cursor(position)
+    return positions
+
+
+def parse_page_args(args):
+    """Read per_page / cursor / page / approximate_total from request args, clamping the page size"""
+    per_page = args.get('per_page', DEFAULT_PAGE_SIZE, type=int) or DEFAULT_PAGE_SIZE
+    per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+    return {
+        'per_page': per_page,
+        'cursor': args.get('cursor') or None,
+        'page': max(1, args.get('page', 1, type=int) or 1) if 'page' in args else None,
+        'approximate': args.get('approximate_total', '').lower() in ('1', 'true', 'yes'),
+    }
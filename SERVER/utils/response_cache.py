@@ -0,0 +1,215 @@
+# utils/response_cache.py
+"""
+In-process cache of serialized GET responses for the listing endpoints.
+
+Entries are keyed by (namespace, data version, normalized query string) and
+hold the response body bytes, so a hit skips both MongoDB and JSON encoding.
+The cache is bounded by entry count and total bytes (LRU eviction) and each
+entry also has a TTL.
+
+A namespace is a collection name. Writers call bump_version(collection)
+after changing the data (the listing models' inserts and upserts, rollup
+reconciliation, the backfills); every cached response built from the old
+version stops matching at once. Versions are persisted in the
+`cache_versions` collection so a bump made by another process (a standalone
+scraper, another worker, a backfill) is picked up within
+CACHE_VERSION_POLL_SECONDS.
+
+The same key also yields a strong ETag, so a client that sends it back in
+If-None-Match gets a 304 before the view runs: no query, no serialization.
+Keys include the UTC date because listings' days-left values and the
+?max_days_left= window move on at midnight without any write.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, request
+from pymongo import ReturnDocument
+from database.db_connection import get_db_connection
+
+CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '60'))
+CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '512'))
+CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+VERSION_POLL_SECONDS = float(os.getenv('CACHE_VERSION_POLL_SECONDS', '2'))
+VERSIONS_COLLECTION = 'cache_versions'
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU map from cache key to (body, status, mimetype)"""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= now:
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1:]
+
+    def set(self, key, body, status=200, mimetype='application/json', ttl=None):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, body, status, mimetype)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, namespace):
+        """Free every entry built from a namespace (they can no longer match anyway)"""
+        with self._lock:
+            for key in [k for k in self._entries if namespace in k[0]]:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry[1])
+
+
+class DataVersions:
+    """Per-collection data versions, shared between processes through MongoDB"""
+
+    def __init__(self, poll_seconds=VERSION_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._versions = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _collection(self):
+        return get_db_connection()[VERSIONS_COLLECTION]
+
+    def get(self, namespace):
+        now = time.monotonic()
+        if now - self._checked_at >= self.poll_seconds:
+            self._refresh(now)
+        return self._versions.get(namespace, 0)
+
+    def _refresh(self, now):
+        try:
+            remote = {doc['_id']: doc.get('version', 0) for doc in self._collection().find({})}
+        except Exception as e:
+            print(f"[WARNING] Could not read cache versions: {str(e)}")
+            remote = {}
+        with self._lock:
+            self._checked_at = now
+            for namespace, version in remote.items():
+                self._versions[namespace] = version
+
+    def bump(self, namespace):
+        try:
+            doc = self._collection().find_one_and_update(
+                {'_id': namespace}, {'$inc': {'version': 1}},
+                upsert=True, return_document=ReturnDocument.AFTER
+            )
+            version = doc['version']
+        except Exception as e:
+            # Still invalidate this process's cache if MongoDB is unreachable
+            print(f"[WARNING] Could not persist cache version for {namespace}: {str(e)}")
+            version = self._versions.get(namespace, 0) + 1
+        with self._lock:
+            self._versions[namespace] = version
+        return version
+
+
+response_cache = ResponseCache()
+data_versions = DataVersions()
+
+
+def bump_version(namespace):
+    """Call after writing to `namespace` (a collection name) to invalidate its cached responses"""
+    version = data_versions.bump(namespace)
+    response_cache.invalidate(namespace)
+    return version
+
+
+def _normalized_args(args):
+    """Query args as a hashable, order-independent key; empty values are dropped like the routes do"""
+    items = []
+    for name, values in args.lists():
+        values = tuple(sorted(v.strip() for v in values if v.strip()))
+        if values:
+            items.append((name, values))
+    return tuple(sorted(items))
+
+
+def _etag(key):
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+def cached_response(namespace, ttl=None):
+    """
+    Cache a GET view's successful, non-streamed response bytes under
+    `namespace`, or under several when given a tuple (a view reading more
+    than one collection). Responses carry X-Cache: HIT or MISS and an ETag
+    that changes with the namespaces' versions; a matching If-None-Match
+    is answered with 304 Not Modified.
+    """
+    namespaces = tuple(namespace) if isinstance(namespace, (tuple, list)) else (namespace,)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            versions = tuple(data_versions.get(name) for name in namespaces)
+            today = datetime.now(timezone.utc).date().isoformat()
+            key = (namespaces, versions, today, request.path, _normalized_args(request.args))
+            etag = _etag(key)
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            entry = response_cache.get(key) if CACHE_ENABLED else None
+            if entry is not None:
+                body, status, mimetype = entry
+                response = current_app.response_class(body, status=status, mimetype=mimetype)
+                response.set_etag(etag)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                if CACHE_ENABLED and not response.is_streamed:
+                    response_cache.set(key, response.get_data(), response.status_code, response.mimetype, ttl)
+            if CACHE_ENABLED:
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,77 @@
+# utils/serialization.py
+"""
+One JSON encoder for every API response.
+
+Documents come straight from MongoDB, so ObjectId, datetime and Decimal
+(plus BSON Decimal128) are encoded here rather than by rewriting each
+document first: ObjectIds become their hex string, datetimes ISO 8601 and
+decimals numbers. When the optional `orjson` package is installed it does
+the encoding; otherwise the standard library's json module is used, with
+identical output apart from whitespace-free separators in both.
+
+Flask's jsonify() goes through this encoder once create_app() installs
+FastJSONProvider; json_response() is the direct helper.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from bson import Decimal128, ObjectId
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson else 'json'
+
+
+def json_default(value):
+    """Encoding hook for the BSON and stdlib types our documents carry"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal128):
+        value = value.to_decimal()
+    if isinstance(value, Decimal):
+        return float(value) if value.is_finite() else None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson:
+    # Dict keys are not always strings (e.g. grouped statistics)
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj):
+        """Serialize `obj` to compact UTF-8 JSON bytes"""
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+else:
+    _encoder = json.JSONEncoder(default=json_default, separators=(',', ':'), ensure_ascii=False)
+
+    def dumps(obj):
+        """Serialize `obj` to compact UTF-8 JSON bytes"""
+        return _encoder.encode(obj).encode('utf-8')
+
+
+def loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_response(payload, status=200, headers=None):
+    """Flask response with `payload` encoded by dumps()"""
+    return current_app.response_class(dumps(payload), status=status, headers=headers, mimetype='application/json')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Routes jsonify() and app.json through dumps()"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        return json_response(self._prepare_response_obj(args, kwargs))
@@ -0,0 +1,89 @@
+# utils/streaming.py
+import os
+from flask import Response, stream_with_context
+from utils.serialization import dumps
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Documents fetched per round trip while streaming, and documents per chunk
+# written to the socket. Small enough to keep memory flat, large enough that
+# neither the driver nor the WSGI server spends its time on tiny writes.
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '500'))
+STREAM_CHUNK_DOCS = int(os.getenv('STREAM_CHUNK_DOCS', '100'))
+
+
+def wants_ndjson(request):
+    """True if the client asked for newline-delimited JSON"""
+    if request.args.get('format', '').lower() == 'ndjson':
+        return True
+    # Only an explicit Accept entry counts; */* keeps the plain JSON default
+    return any(value == NDJSON_MIMETYPE and quality > 0
+               for value, quality in request.accept_mimetypes)
+
+
+def wants_stream(request):
+    """True if ?stream=1 (or true/yes) was passed"""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def iter_json_chunks(documents, ndjson=False, chunk_docs=STREAM_CHUNK_DOCS):
+    """
+    Serialize an iterable of documents as a stream of byte chunks: one JSON
+    array, or one document per line for NDJSON. Only one chunk of documents
+    is held at a time, and the cursor is closed even if the client goes away.
+    """
+    try:
+        if not ndjson:
+            # Opening bracket goes out before the first batch is fetched
+            yield b'['
+        first = True
+        buffer = []
+        for doc in documents:
+            if ndjson:
+                buffer.append(dumps(doc) + b'\n')
+            else:
+                buffer.append(dumps(doc) if first else b',' + dumps(doc))
+                first = False
+            if len(buffer) >= chunk_docs:
+                yield b''.join(buffer)
+                buffer = []
+        if buffer:
+            yield b''.join(buffer)
+        if not ndjson:
+            yield b']'
+    finally:
+        close = getattr(documents, 'close', None)
+        if close:
+            close()
+
+
+def stream_response(documents, ndjson=False, filename=None):
+    """Flask response that streams `documents` (usually a cursor) as JSON or NDJSON"""
+    response = Response(
+        stream_with_context(iter_json_chunks(documents, ndjson=ndjson)),
+        mimetype=NDJSON_MIMETYPE if ndjson else 'application/json'
+    )
+    if filename:
+        extension = 'ndjson' if ndjson else 'json'
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    # Tell reverse proxies not to buffer the whole body before forwarding it
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _sse_chunks(events):
+    try:
+        for event, payload in events:
+            yield b'event: ' + event.encode('utf-8') + b'\ndata: ' + dumps(payload) + b'\n\n'
+    finally:
+        close = getattr(events, 'close', None)
+        if close:
+            close()
+
+
+def event_stream_response(events):
+    """Server-Sent Events response for an iterable of (event name, JSON payload) pairs"""
+    response = Response(stream_with_context(_sse_chunks(events)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
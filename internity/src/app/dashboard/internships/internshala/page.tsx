@@ -10,6 +10,8 @@ import { InternshalaCredentials } from "../components/internshala-credentials"
 import { PreferencesSectionBase, type PreferencesData } from "../components/preferences-section-base"
 import { toast } from "sonner"
 import { validateHeaderName } from "http"
+import { waitForScrapeJob } from "@/lib/scrape-jobs"
+import { fetchListingPage } from "@/lib/listings"
 
 // Type definition for Internshala internship data
 interface InternshalaInternship {
@@ -27,6 +29,8 @@ interface InternshalaInternship {
 export default function InternshalaInternshipsPage() {
   const [isLoading, setIsLoading] = useState(false)
   const [internships, setInternships] = useState<InternshalaInternship[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [preference, setPreferences] = useState<PreferencesData>()
 
   const startInternshalaScraper = async () => {
@@ -40,22 +44,22 @@ export default function InternshalaInternshipsPage() {
         body: JSON.stringify(preference),
       })
 
-      if (!response.ok) {
-        throw new Error("Scraping failed")
+      // The scrape runs as a background job; wait for it before listing
+      const job = await waitForScrapeJob(response)
+      if (!job.success) {
+        throw new Error(job.message || "Scraping failed")
       }
     } catch (error) {
       console.error("Error scraping LinkedIn internships:", error)
     }
   }
 
-  const fetchInternshalaInternships = async () => {
+  // The first page after a scrape; a cursor appends the page after the ones shown
+  const fetchInternshalaInternships = async (cursor: string | null = null) => {
     try {
-      const res = await fetch("http://127.0.0.1:5000/api/internshala/list", {
-        method: "GET",
-      })
-      const data = await res.json()
-      console.log(data.data)
-      setInternships(data.data || [])
+      const page = await fetchListingPage<InternshalaInternship>("/api/internshala/list", cursor)
+      setInternships((shown) => (cursor ? [...shown, ...page.data] : page.data))
+      setNextCursor(page.nextCursor)
     } catch (error) {
       console.error("Error fetching internships:", error)
     } finally {
@@ -63,6 +67,12 @@ export default function InternshalaInternshipsPage() {
     }
   }
 
+  const handleLoadMore = async () => {
+    setIsLoadingMore(true)
+    await fetchInternshalaInternships(nextCursor)
+    setIsLoadingMore(false)
+  }
+
   // Handler that chains both functions together
   const handleScrape = async () => {
     await startInternshalaScraper()
@@ -167,6 +177,18 @@ export default function InternshalaInternshipsPage() {
               </div>
             </motion.div>
           ))}
+          {nextCursor && (
+            <div className="md:col-span-2 flex justify-center">
+              <Button
+                onClick={handleLoadMore}
+                disabled={isLoadingMore}
+                variant="outline"
+                className="border-[#f1eece]/20 text-[#f1eece] hover:bg-[#f1eece]/10"
+              >
+                {isLoadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </div>
+          )}
         </div>
       ) : (
         <div className="text-center py-12 text-[#f1eece]/50">
@@ -9,6 +9,8 @@ import { LayoutWrapper } from "../components/layout-wrapper"
 import { LinkedInCredentials } from "../components/linkedin-credentials"
 import { PreferencesSectionBase, type PreferencesData } from "../components/preferences-section-base"
 import { toast } from "sonner"
+import { waitForScrapeJob } from "@/lib/scrape-jobs"
+import { fetchListingPage } from "@/lib/listings"
 // Type definition for LinkedIn internship data
 interface LinkedInInternship {
   id: string
@@ -23,6 +25,8 @@ interface LinkedInInternship {
 export default function LinkedInInternshipsPage() {
   const [isLoading, setIsLoading] = useState(false)
   const [internships, setInternships] = useState<LinkedInInternship[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [preference, setPreferences] = useState<PreferencesData>()
 
   // Handle scraping for LinkedIn
@@ -37,21 +41,22 @@ export default function LinkedInInternshipsPage() {
         body: JSON.stringify(preference),
       })
 
-      if (!response.ok) {
-        throw new Error("Scraping failed")
+      // The scrape runs as a background job; wait for it before listing
+      const job = await waitForScrapeJob(response)
+      if (!job.success) {
+        throw new Error(job.message || "Scraping failed")
       }
     } catch (error) {
       console.error("Error scraping LinkedIn internships:", error)
     }
   }
 
-  const fetchLinkedInInternships = async () => {
+  // The first page after a scrape; a cursor appends the page after the ones shown
+  const fetchLinkedInInternships = async (cursor: string | null = null) => {
     try {
-      const res = await fetch("http://127.0.0.1:5000/api/linkedin/list", {
-        method: "GET",
-      })
-      const data = await res.json()
-      setInternships(data.data || [])
+      const page = await fetchListingPage<LinkedInInternship>("/api/linkedin/list", cursor)
+      setInternships((shown) => (cursor ? [...shown, ...page.data] : page.data))
+      setNextCursor(page.nextCursor)
     } catch (error) {
       console.error("Error fetching internships:", error)
     } finally {
@@ -59,6 +64,12 @@ export default function LinkedInInternshipsPage() {
     }
   }
 
+  const handleLoadMore = async () => {
+    setIsLoadingMore(true)
+    await fetchLinkedInInternships(nextCursor)
+    setIsLoadingMore(false)
+  }
+
   // Handler that chains both functions together
   const handleScrape = async () => {
     await startLinkedInScraper()
@@ -152,6 +163,18 @@ export default function LinkedInInternshipsPage() {
               </div>
             </motion.div>
           ))}
+          {nextCursor && (
+            <div className="md:col-span-2 flex justify-center">
+              <Button
+                onClick={handleLoadMore}
+                disabled={isLoadingMore}
+                variant="outline"
+                className="border-[#f1eece]/20 text-[#f1eece] hover:bg-[#f1eece]/10"
+              >
+                {isLoadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </div>
+          )}
         </div>
       ) : (
         <div className="text-center py-12 text-[#f1eece]/50">
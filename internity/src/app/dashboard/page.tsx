@@ -28,6 +28,8 @@ import SmartScraperCredentialsForm from "./components/smart-scraper-credentials-
 import ApplicationProfileForm from "./components/application-profile-form"
 import { useAuth } from "@/app/context/context"
 import { useRouter } from "next/navigation"
+import { waitForScrapeJob } from "@/lib/scrape-jobs"
+import { fetchListingPage } from "@/lib/listings"
 
 export default function Dashboard() {
   const { user, logoutUser, isLoggedIn, AuthorizationToken } = useAuth()
@@ -151,13 +153,10 @@ export default function Dashboard() {
   useEffect(() => {
     const fetchInternships = async () => {
       try {
-        const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000'
-        
-        // Fetch LinkedIn internships
+        // Fetch the first page of LinkedIn internships
         try {
-          const linkedInResponse = await fetch(`${apiUrl}/api/linkedin/list`)
-          const linkedInData = await linkedInResponse.json()
-          if (linkedInData.data && linkedInData.data.length > 0) {
+          const linkedInData = await fetchListingPage('/api/linkedin/list')
+          if (linkedInData.data.length > 0) {
             const transformedLinkedIn = linkedInData.data.map((item: any) => ({
               id: item._id || `linkedin-${Date.now()}-${Math.random()}`,
               title: item.title || 'Internship Position',
@@ -173,11 +172,10 @@ export default function Dashboard() {
           console.error("Error fetching LinkedIn internships:", error)
         }
         
-        // Fetch Internshala internships
+        // Fetch the first page of Internshala internships
         try {
-          const internshalaResponse = await fetch(`${apiUrl}/api/internshala/list`)
-          const internshalaData = await internshalaResponse.json()
-          if (internshalaData.data && internshalaData.data.length > 0) {
+          const internshalaData = await fetchListingPage('/api/internshala/list')
+          if (internshalaData.data.length > 0) {
             const transformedInternshala = internshalaData.data.map((item: any) => ({
               id: item._id || `internshala-${Date.now()}-${Math.random()}`,
               title: item.title || 'Internship Position',
@@ -274,16 +272,15 @@ export default function Dashboard() {
         signal: controller.signal
       })
 
-      if (timeoutId) clearTimeout(timeoutId)
+      const data = await waitForScrapeJob(response, controller.signal)
 
-      const data = await response.json()
+      if (timeoutId) clearTimeout(timeoutId)
 
-      if (response.ok && data.success) {
+      if (data.success) {
         // Fetch the scraped data from the list endpoint
-        const listResponse = await fetch((process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000') + '/api/linkedin/list')
-        const listData = await listResponse.json()
+        const listData = await fetchListingPage('/api/linkedin/list')
 
-        if (listResponse.ok && listData.data) {
+        if (listData.data.length > 0) {
           const transformedData = listData.data.map((item: any) => ({
             id: item._id || `linkedin-${Date.now()}-${Math.random()}`,
             title: item.title || 'Internship Position',
@@ -346,16 +343,15 @@ export default function Dashboard() {
         signal: controller.signal
       })
 
-      if (timeoutId) clearTimeout(timeoutId)
+      const data = await waitForScrapeJob(response, controller.signal)
 
-      const data = await response.json()
+      if (timeoutId) clearTimeout(timeoutId)
 
-      if (response.ok) {
+      if (data.success) {
         // Fetch the scraped data from the list endpoint
-        const listResponse = await fetch((process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000') + '/api/internshala/list')
-        const listData = await listResponse.json()
+        const listData = await fetchListingPage('/api/internshala/list')
 
-        if (listResponse.ok && listData.data && listData.data.length > 0) {
+        if (listData.data.length > 0) {
           const transformedData = listData.data.map((item: any) => ({
             id: item._id || `internshala-${Date.now()}-${Math.random()}`,
             title: item.title || 'Internship Position',
@@ -0,0 +1,28 @@
+const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000'
+
+export const LISTING_PAGE_SIZE = 50
+
+export interface ListingPage<T> {
+  data: T[]
+  nextCursor: string | null
+}
+
+// The /list routes answer one bounded page; pass nextCursor back for the one after it
+export async function fetchListingPage<T = any>(
+  path: string,
+  cursor?: string | null,
+  perPage = LISTING_PAGE_SIZE,
+  signal?: AbortSignal
+): Promise<ListingPage<T>> {
+  const params = new URLSearchParams({ per_page: String(perPage) })
+  if (cursor) {
+    params.set('cursor', cursor)
+  }
+
+  const response = await fetch(`${API_URL}${path}?${params}`, { signal })
+  const body = await response.json()
+  if (!response.ok) {
+    throw new Error(body.message || `Failed to load ${path}`)
+  }
+  return { data: body.data || [], nextCursor: body.next_cursor || null }
+}
@@ -0,0 +1,43 @@
+const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000'
+
+export interface ScrapeJobResult {
+  success: boolean
+  message: string
+  count: number
+}
+
+const sleep = (ms: number, signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(resolve, ms)
+    signal?.addEventListener('abort', () => {
+      clearTimeout(timer)
+      reject(new DOMException('Aborted', 'AbortError'))
+    }, { once: true })
+  })
+
+// The /scrape routes answer 202 with a job; poll its status_url until it finishes
+export async function waitForScrapeJob(
+  response: Response,
+  signal?: AbortSignal,
+  intervalMs = 2000
+): Promise<ScrapeJobResult> {
+  let job = await response.json()
+  if (!response.ok) {
+    return { success: false, message: job.message || 'Failed to start scrape', count: 0 }
+  }
+
+  while (job.status !== 'succeeded' && job.status !== 'failed') {
+    await sleep(intervalMs, signal)
+    const poll = await fetch(API_URL + job.status_url, { signal })
+    job = await poll.json()
+    if (!poll.ok) {
+      return { success: false, message: job.message || 'Scrape job not found', count: 0 }
+    }
+  }
+
+  return {
+    success: job.status === 'succeeded',
+    message: job.message || '',
+    count: job.result?.total_count ?? 0
+  }
+}